@@ -0,0 +1,94 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Benchmark of the per-task dispatch overhead of the
+# feature selectors with and without `memmap=True`.
+#
+# License: BSD 3 clause
+
+"""
+Measure per-candidate dispatch overhead of `FeatureSelector`
+and `ExhaustiveFeatureSelector` with and without `memmap=True`.
+
+A `DummyRegressor` is used so that fitting is essentially free
+and the time per candidate is dominated by pickling X (and, for
+`ExhaustiveFeatureSelector`, the selector itself) to the workers.
+
+Usage::
+
+    python benchmarks/feature_selection_dispatch.py --n_jobs 16 \\
+        --n_samples 200000 --n_features 200
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.dummy import DummyRegressor
+
+from mlxtend.feature_selection import ExhaustiveFeatureSelector
+from mlxtend.feature_selection.generic_selector import FeatureSelector
+from mlxtend.feature_selection.strategy import exhaustive
+
+
+def time_feature_selector(X, y, n_jobs, memmap):
+    strategy = exhaustive(X,
+                          min_features=1,
+                          max_features=1)
+    selector = FeatureSelector(DummyRegressor(),
+                               strategy,
+                               cv=2,
+                               n_jobs=n_jobs,
+                               memmap=memmap)
+    tic = time.perf_counter()
+    selector.fit(X, y)
+    return time.perf_counter() - tic, len(selector.results_)
+
+
+def time_exhaustive_selector(X, y, n_jobs, memmap):
+    selector = ExhaustiveFeatureSelector(DummyRegressor(),
+                                         min_features=1,
+                                         max_features=1,
+                                         scoring='r2',
+                                         cv=2,
+                                         n_jobs=n_jobs,
+                                         print_progress=False,
+                                         memmap=memmap)
+    tic = time.perf_counter()
+    selector.fit(X, y)
+    return time.perf_counter() - tic, len(selector.subsets_)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--n_samples', type=int, default=100000)
+    parser.add_argument('--n_features', type=int, default=100)
+    parser.add_argument('--n_jobs', type=int, default=16)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    X = rng.standard_normal((args.n_samples, args.n_features))
+    y = rng.standard_normal(args.n_samples)
+
+    print('X: %d x %d (%.1f MB), n_jobs=%d' %
+          (X.shape[0], X.shape[1], X.nbytes / 1e6, args.n_jobs))
+    print('%-28s %-8s %12s %16s' % ('selector', 'memmap',
+                                    'wall (s)', 'per task (ms)'))
+
+    for name, bench in [('FeatureSelector', time_feature_selector),
+                        ('ExhaustiveFeatureSelector',
+                         time_exhaustive_selector)]:
+        for memmap in [False, True]:
+            # best of `repeat` runs; the first run also
+            # pays for starting the worker pool
+            best = np.inf
+            for _ in range(args.repeat):
+                wall, n_tasks = bench(X, y, args.n_jobs, memmap)
+                best = min(best, wall)
+            print('%-28s %-8s %12.3f %16.2f' % (name, memmap, best,
+                                                1000 * best / n_tasks))
+
+
+if __name__ == '__main__':
+    main()
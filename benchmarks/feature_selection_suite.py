@@ -0,0 +1,340 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Benchmark suite for the feature selectors over a grid
+# of synthetic problems.
+#
+# License: BSD 3 clause
+
+"""
+Time the feature selectors and strategies on synthetic data.
+
+Every combination of `--n_samples`, `--n_features`,
+`--categorical_share`, `--n_jobs` and `--cv` is run for
+each of the cases in `CASES` (or those named by `--cases`).
+For each run the suite reports the best wall time over
+`--repeat` runs, the peak memory allocated in the parent
+process during one further run (measured with `tracemalloc`,
+so memory used by worker processes is not included) and the
+number of candidates scored per second.
+
+Results can be written to a JSON file with `--output`, which
+also records the git revision, library versions and platform,
+and compared against a previous file with `--compare`, so that
+runs on different commits can be checked against each other.
+
+Usage::
+
+    python benchmarks/feature_selection_suite.py --quick
+
+    python benchmarks/feature_selection_suite.py \\
+        --n_samples 1000 10000 --n_features 20 50 \\
+        --categorical_share 0 0.25 --n_jobs 1 4 --cv 3 5 \\
+        --output after.json --compare before.json
+
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import sklearn
+from sklearn.linear_model import LinearRegression
+
+import mlxtend
+from mlxtend.feature_selection import (ExhaustiveFeatureSelector,
+                                       SequentialFeatureSelector)
+from mlxtend.feature_selection.generic_selector import FeatureSelector
+from mlxtend.feature_selection.strategy import (Stepwise,
+                                                BranchAndBound,
+                                                exhaustive,
+                                                beam_search)
+
+
+def make_data(n_samples,
+              n_features,
+              categorical_share=0,
+              n_levels=5,
+              n_informative=5,
+              random_state=0):
+    """
+    Synthetic regression problem with `n_features` columns,
+    of which a fraction `categorical_share` are categorical with
+    `n_levels` levels (coded 0, ..., n_levels-1) and the rest
+    standard normal. The response depends on the first
+    `n_informative` columns plus standard normal noise.
+
+    Returns `X, y, is_categorical`.
+    """
+    rng = np.random.RandomState(random_state)
+    n_categorical = int(round(categorical_share * n_features))
+    is_categorical = np.zeros(n_features, bool)
+    is_categorical[rng.choice(n_features,
+                              n_categorical,
+                              replace=False)] = True
+
+    X = rng.standard_normal((n_samples, n_features))
+    X[:, is_categorical] = rng.randint(0,
+                                       n_levels,
+                                       (n_samples, n_categorical))
+
+    y = rng.standard_normal(n_samples)
+    for j in range(min(n_informative, n_features)):
+        if is_categorical[j]:
+            effects = rng.standard_normal(n_levels)
+            y += effects[X[:, j].astype(int)]
+        else:
+            y += X[:, j]
+    return X, y, is_categorical
+
+
+# Each case builds an unfitted selector from `X`, the categorical
+# mask, `n_jobs` and `cv`, returning it with a function giving
+# the number of candidates it scored once fit.
+
+def _forward(X, is_categorical, n_jobs, cv):
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=X.shape[1],
+                                   categorical_features=is_categorical)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=cv,
+                               n_jobs=n_jobs)
+    return selector, lambda s: s.n_evaluations_
+
+
+def _backward(X, is_categorical, n_jobs, cv):
+    strategy = Stepwise.first_peak(X,
+                                   direction='backward',
+                                   max_features=X.shape[1],
+                                   initial_features=range(X.shape[1]),
+                                   categorical_features=is_categorical)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=cv,
+                               n_jobs=n_jobs)
+    return selector, lambda s: s.n_evaluations_
+
+
+def _beam(X, is_categorical, n_jobs, cv):
+    strategy = beam_search(X,
+                           beam_width=3,
+                           max_features=X.shape[1],
+                           categorical_features=is_categorical)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=cv,
+                               n_jobs=n_jobs)
+    return selector, lambda s: s.n_evaluations_
+
+
+def _exhaustive(X, is_categorical, n_jobs, cv):
+    strategy = exhaustive(X,
+                          max_features=2,
+                          categorical_features=is_categorical)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=cv,
+                               n_jobs=n_jobs)
+    return selector, lambda s: s.n_evaluations_
+
+
+def _branch_and_bound(X, is_categorical, n_jobs, cv):
+    # training R^2 is needed for the bounds, so `cv` is ignored
+    bnb = BranchAndBound(X,
+                         min_features=2,
+                         max_features=2,
+                         categorical_features=is_categorical)
+    selector = FeatureSelector(LinearRegression(),
+                               bnb.strategy(),
+                               scoring='r2',
+                               cv=None,
+                               n_jobs=n_jobs)
+    return selector, lambda s: s.n_evaluations_
+
+
+def _sfs(X, is_categorical, n_jobs, cv):
+    # categorical columns are used as their integer codes
+    selector = SequentialFeatureSelector(LinearRegression(),
+                                         k_features=min(5, X.shape[1]),
+                                         scoring='r2',
+                                         cv=cv,
+                                         n_jobs=n_jobs)
+    return selector, lambda s: len(s.timings_)
+
+
+def _efs(X, is_categorical, n_jobs, cv):
+    # categorical columns are used as their integer codes
+    selector = ExhaustiveFeatureSelector(LinearRegression(),
+                                         max_features=2,
+                                         scoring='r2',
+                                         cv=cv,
+                                         n_jobs=n_jobs,
+                                         print_progress=False)
+    return selector, lambda s: len(s.subsets_)
+
+
+CASES = {'forward': _forward,
+         'backward': _backward,
+         'beam_search': _beam,
+         'exhaustive': _exhaustive,
+         'branch_and_bound': _branch_and_bound,
+         'sfs': _sfs,
+         'efs': _efs}
+
+
+def run_case(case, X, y, is_categorical, n_jobs, cv, repeat=3):
+    """
+    Run `case` on `(X, y)` returning a dictionary with
+    the best wall time over `repeat` runs, the peak memory
+    in MB of one further run and the candidates per second.
+    """
+    build = CASES[case]
+
+    best = np.inf
+    for _ in range(repeat):
+        selector, n_candidates = build(X, is_categorical, n_jobs, cv)
+        tic = time.perf_counter()
+        selector.fit(X, y)
+        best = min(best, time.perf_counter() - tic)
+    candidates = n_candidates(selector)
+
+    # separate run as tracing slows down allocation
+
+    selector = build(X, is_categorical, n_jobs, cv)[0]
+    tracemalloc.start()
+    try:
+        selector.fit(X, y)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'wall_time': best,
+            'peak_memory_mb': peak / 1e6,
+            'n_candidates': candidates,
+            'candidates_per_second': candidates / best}
+
+
+def environment():
+    """
+    Git revision, versions and platform the suite runs on.
+    """
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                           stderr=subprocess.DEVNULL)
+        revision = revision.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {'revision': revision,
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'mlxtend': mlxtend.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--n_samples', type=int, nargs='+', default=[2000])
+    parser.add_argument('--n_features', type=int, nargs='+',
+                        default=[10, 30])
+    parser.add_argument('--categorical_share', type=float, nargs='+',
+                        default=[0, 0.3])
+    parser.add_argument('--n_jobs', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--cv', type=int, nargs='+', default=[5])
+    parser.add_argument('--cases', nargs='+', default=sorted(CASES),
+                        choices=sorted(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true',
+                        help='one small problem, one repeat')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare',
+                        help='JSON file from an earlier run to compare with')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.n_samples, args.n_features = [500], [8]
+        args.categorical_share, args.n_jobs, args.cv = [0.25], [1], [3]
+        args.repeat = 1
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = dict([(_key(r), r) for r in json.load(f)['results']])
+
+    header = ('%-16s %7s %5s %5s %4s %3s %10s %10s %10s' %
+              ('case', 'n', 'p', 'cat', 'jobs', 'cv',
+               'wall (s)', 'peak (MB)', 'cand/s'))
+    if baseline:
+        header += ' %9s' % 'speedup'
+    print(header)
+
+    results = []
+    grid = itertools.product(args.n_samples,
+                             args.n_features,
+                             args.categorical_share,
+                             args.n_jobs,
+                             args.cv)
+    for n, p, share, n_jobs, cv in grid:
+        X, y, is_categorical = make_data(n,
+                                         p,
+                                         categorical_share=share,
+                                         random_state=args.seed)
+        for case in args.cases:
+            result = {'case': case,
+                      'n_samples': n,
+                      'n_features': p,
+                      'categorical_share': share,
+                      'n_jobs': n_jobs,
+                      'cv': cv}
+            result.update(run_case(case,
+                                   X,
+                                   y,
+                                   is_categorical,
+                                   n_jobs,
+                                   cv,
+                                   repeat=args.repeat))
+            results.append(result)
+
+            line = ('%-16s %7d %5d %5.2f %4d %3d %10.3f %10.1f %10.1f' %
+                    (case, n, p, share, n_jobs, cv,
+                     result['wall_time'],
+                     result['peak_memory_mb'],
+                     result['candidates_per_second']))
+            if baseline:
+                previous = baseline.get(_key(result))
+                if previous is not None:
+                    line += ' %8.2fx' % (previous['wall_time'] /
+                                         result['wall_time'])
+                else:
+                    line += ' %9s' % '-'
+            print(line)
+            sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(),
+                       'results': results}, f, indent=2)
+
+
+# private functions
+
+def _key(result):
+    return tuple([result[name] for name in ['case',
+                                            'n_samples',
+                                            'n_features',
+                                            'categorical_share',
+                                            'n_jobs',
+                                            'cv']])
+
+
+if __name__ == '__main__':
+    main()
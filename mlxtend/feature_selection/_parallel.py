@@ -0,0 +1,39 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Helpers shared by the feature selectors for
+# running candidates on parallel workers
+#
+# License: BSD 3 clause
+
+import os
+
+from joblib import Parallel, dump, load
+
+
+def _parallel_generator(return_as='generator', **kwargs):
+    """
+    `Parallel(**kwargs)` instance returning results as they
+    complete (in the order of the tasks, or in order of
+    completion with `return_as='generator_unordered'`),
+    or as a list once all complete if joblib does
+    not support `return_as`.
+    """
+    try:
+        return Parallel(return_as=return_as, **kwargs)
+    except (TypeError, ValueError):
+        return Parallel(**kwargs)
+
+
+def _memmap_data(temp_folder, *data):
+    """
+    Dump each of `data` to `temp_folder` and
+    load it back memory-mapped (read-only), so
+    that parallel workers receive a reference to
+    the file instead of a pickled copy.
+    """
+    mapped = []
+    for i, D in enumerate(data):
+        filename = os.path.join(temp_folder, 'data_%d.mmap' % i)
+        dump(D, filename)
+        mapped.append(load(filename, mmap_mode='r'))
+    return mapped
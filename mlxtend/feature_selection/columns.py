@@ -3,6 +3,7 @@ from typing import NamedTuple, Any
 from copy import copy
 
 import numpy as np
+from scipy import sparse
 from sklearn.base import clone
 from sklearn.preprocessing import (OneHotEncoder,
                                    OrdinalEncoder)
@@ -15,6 +16,8 @@ class Column(NamedTuple):
     """
     A column extractor with a possible
     encoder (following `sklearn` fit/transform template).
+    `dtype` and `categories` record the dtype of the
+    column and, for a pandas categorical, its categories.
     """
 
     idx: Any
@@ -23,6 +26,8 @@ class Column(NamedTuple):
     is_ordinal: bool = False
     columns: tuple = ()
     encoder: Any = None
+    dtype: Any = None
+    categories: Any = None
 
     def get_columns(self, X, fit=False):
 
@@ -44,9 +49,10 @@ class Column(NamedTuple):
 
         Returns
         -------
-        cols : `np.ndarray`
+        cols : `np.ndarray` or sparse matrix
             Evaluated columns -- if an encoder is used,
-            several columns may be produced.
+            several columns may be produced. Sparse if `X`
+            is sparse or the encoder has sparse output.
 
         names : (str,)
             Column names
@@ -58,7 +64,8 @@ class Column(NamedTuple):
 
         if self.encoder is not None:
             cols = self.encoder.transform(cols)
-        cols = np.asarray(cols)
+        if not sparse.issparse(cols):
+            cols = np.asarray(cols)
 
         names = self.columns
         if hasattr(self.encoder, 'columns_'):
@@ -89,9 +96,72 @@ class Column(NamedTuple):
                 check_is_fitted(self.encoder)
             except NotFittedError:
                 self.encoder.fit(cols)
+        if sparse.issparse(cols):
+            return cols
         return np.asarray(cols)
 
 
+class ColumnStore(object):
+
+    """
+    The columns of a `pd.DataFrame` extracted once
+    into contiguous numpy arrays, so that columns can
+    later be read without pandas indexing.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Data frame to store.
+
+    Attributes
+    ----------
+    columns: pd.Index
+        Column labels of `df`.
+    shape: (int, int)
+        Shape of `df`.
+    data: dict
+        Mapping from column labels to 1-dimensional arrays.
+    dtypes: dict
+        Mapping from column labels to the pandas dtypes.
+    categories: dict
+        Mapping from column labels to the categories of
+        categorical columns (None for other columns).
+    ordered: dict
+        Mapping from column labels to whether a
+        categorical column is ordered.
+    """
+
+    def __init__(self, df):
+
+        self.columns = df.columns
+        self.shape = df.shape
+        self.data = {}
+        self.dtypes = {}
+        self.categories = {}
+        self.ordered = {}
+
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            dtype = series.dtype
+            self.dtypes[col] = dtype
+            if str(dtype) == 'category':
+                self.categories[col] = np.asarray(dtype.categories)
+                self.ordered[col] = bool(dtype.ordered)
+            else:
+                self.categories[col] = None
+                self.ordered[col] = False
+            self.data[col] = np.ascontiguousarray(series.to_numpy())
+
+    def get(self, idx, loc=True):
+        """
+        Column with label `idx` (or position `idx`
+        if `loc` is False).
+        """
+        if not loc:
+            idx = self.columns[idx]
+        return self.data[idx]
+
+
 # private functions
 
 
@@ -100,9 +170,20 @@ def _get_column(idx, X, twodim=False, loc=True):
     Extract column `idx` from `X`,
     optionally making it two-dimensional
     as many sklearn encoders assume
-    two-dimensional input
+    two-dimensional input. Columns of a
+    sparse `X` stay sparse unless `twodim`
+    is True (i.e. they are to be encoded).
     """
-    if isinstance(X, np.ndarray):
+    if sparse.issparse(X):
+        if X.format not in ('csc', 'csr'):
+            X = X.tocsc()
+        col = X[:, [idx]]
+        if twodim:
+            return col.toarray()
+        return col
+    if isinstance(X, ColumnStore):
+        col = X.get(idx, loc=loc)
+    elif isinstance(X, np.ndarray):
         col = X[:, idx]
     elif hasattr(X, 'loc'):
         if loc:
@@ -121,6 +202,7 @@ def _get_column_info(X,
                      columns,
                      is_categorical,
                      is_ordinal,
+                     sparse_output=False,
                      default_encoders={
                          'ordinal': OrdinalEncoder(),
                          'categorical': OneHotEncoder(drop='first',
@@ -135,7 +217,11 @@ def _get_column_info(X,
     of `X`. Keys are `columns`.
 
     Categorical and ordinal columns use the
-    default encoding provided.
+    default encoding provided. If `sparse_output`,
+    categorical columns are one-hot encoded
+    to sparse matrices. If `X` is a `ColumnStore`,
+    ordinal columns are encoded in the order
+    of their categories.
 
     """
 
@@ -146,13 +232,21 @@ def _get_column_info(X,
         else:
             name = str(col)
         Xcol = _get_column(col, X, twodim=True)
+        if isinstance(X, ColumnStore):
+            dtype, categories = X.dtypes[col], X.categories[col]
+        else:
+            dtype, categories = Xcol.dtype, None
         if is_categorical[i]:
             if is_ordinal[i]:
                 encoder = clone(default_encoders['ordinal'])
+                if categories is not None:
+                    encoder.set_params(categories=[categories])
                 encoder.fit(Xcol)
                 columns = ['Ord({0})'.format(col)]
             else:
                 encoder = clone(default_encoders['categorical'])
+                if sparse_output:
+                    encoder.set_params(sparse=True)
                 cols = encoder.fit_transform(Xcol)
                 if hasattr(encoder, 'columns_'):
                     columns_ = encoder.columns_
@@ -166,11 +260,14 @@ def _get_column_info(X,
                                       is_categorical[i],
                                       is_ordinal[i],
                                       tuple(columns),
-                                      encoder)
+                                      encoder,
+                                      dtype,
+                                      categories)
         else:
             column_info[col] = Column(col,
                                       name,
-                                      columns=(name,))
+                                      columns=(name,),
+                                      dtype=dtype)
     return column_info
 
 # extracted from method of BaseHistGradientBoosting from
@@ -231,20 +328,10 @@ def _check_categories(categorical_features, X):
 
     for f_idx in range(n_features):
         if is_categorical[f_idx]:
-            categories = np.array([v for v in
-                                   set(_get_column(f_idx,
-                                                   X,
-                                                   loc=False))])
-            missing = []
-            for c in categories:
-                try:
-                    missing.append(np.isnan(c))
-                except TypeError:  # not a float
-                    missing.append(False)
-            missing = np.array(missing)
-            if missing.any():
-                categories = sorted(categories[~missing])
-
+            categories = _unique_categories(_get_column(f_idx,
+                                                        X,
+                                                        twodim=True,
+                                                        loc=False).ravel())
         else:
             categories = None
         known_categories.append(categories)
@@ -254,18 +341,26 @@ def _check_categories(categorical_features, X):
 
 def _categorical_from_df(df):
     """
-    Find
+    Find the categorical (and among them the ordered)
+    columns of a `pd.DataFrame` or `ColumnStore`.
     """
-    is_categorical = []
-    is_ordinal = []
-    for c in df.columns:
-        try:
-            is_categorical.append(df[c].dtype == 'category')
-            is_ordinal.append(df[c].cat.ordered)
-        except TypeError:
-            is_categorical.append(False)
-            is_ordinal.append(False)
-    is_categorical = np.array(is_categorical)
-    is_ordinal = np.array(is_ordinal)
+    if not isinstance(df, ColumnStore):
+        df = ColumnStore(df)
+    is_categorical = np.array([df.categories[c] is not None
+                               for c in df.columns], bool)
+    is_ordinal = np.array([df.ordered[c] for c in df.columns], bool)
 
     return is_categorical, is_ordinal
+
+def _unique_categories(col):
+    """
+    Unique non-missing values of `col`,
+    sorted if they can be compared.
+    """
+    try:
+        categories = np.unique(col)
+    except TypeError:   # values that cannot be sorted
+        categories = np.array(list(set(col)), dtype=object)
+    missing = np.array([isinstance(c, float) and np.isnan(c)
+                        for c in categories], bool)
+    return categories[~missing]
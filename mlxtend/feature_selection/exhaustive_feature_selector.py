@@ -7,40 +7,66 @@
 # License: BSD 3 clause
 
 
+import time
 import numpy as np
 import scipy as sp
 import scipy.stats
 import sys
-import operator as op
+import shutil
+import tempfile
 from copy import deepcopy
-from itertools import combinations
-from itertools import chain
-from functools import reduce
 from sklearn.metrics import get_scorer
 from sklearn.base import clone
 from sklearn.base import BaseEstimator
 from sklearn.base import MetaEstimatorMixin
 from ..externals.name_estimators import _name_estimators
-from sklearn.model_selection import cross_val_score
-from joblib import Parallel, delayed
-
-
-def _calc_score(selector, X, y, indices, groups=None, **fit_params):
-    if selector.cv:
-        scores = cross_val_score(selector.est_,
-                                 X[:, indices], y,
-                                 groups=groups,
-                                 cv=selector.cv,
-                                 scoring=selector.scorer,
-                                 n_jobs=1,
-                                 pre_dispatch=selector.pre_dispatch,
-                                 fit_params=fit_params)
+from sklearn.model_selection import cross_validate
+from joblib import delayed, effective_n_jobs
+from .subset_rank import n_subsets, subsets_in_range
+from ._parallel import _memmap_data, _parallel_generator
+from .timing import (timed_call,
+                     phase,
+                     add_time,
+                     stamped,
+                     candidate_timing,
+                     timing_summary)
+
+
+def _calc_score(estimator, scorer, cv, pre_dispatch, X, y, indices,
+                groups=None, **fit_params):
+    with phase('build'):
+        X_indices = X[:, indices]
+    if cv:
+        cv_results = cross_validate(estimator,
+                                    X_indices, y,
+                                    groups=groups,
+                                    cv=cv,
+                                    scoring=scorer,
+                                    n_jobs=1,
+                                    pre_dispatch=pre_dispatch,
+                                    fit_params=fit_params)
+        add_time('fit', np.sum(cv_results['fit_time']))
+        add_time('score', np.sum(cv_results['score_time']))
+        scores = cv_results['test_score']
     else:
-        selector.est_.fit(X[:, indices], y, **fit_params)
-        scores = np.array([selector.scorer(selector.est_, X[:, indices], y)])
+        with phase('fit'):
+            estimator.fit(X_indices, y, **fit_params)
+        with phase('score'):
+            scores = np.array([scorer(estimator, X_indices, y)])
     return indices, scores
 
 
+def _best_subset(subsets_dict):
+    # feature indices and average score of the best subset,
+    # (None, -inf) if no subset was evaluated
+    best_idx, max_score = None, float('-inf')
+    for subset in subsets_dict.values():
+        if subset['avg_score'] > max_score:
+            max_score = subset['avg_score']
+            best_idx = subset['feature_idx']
+    return best_idx, max_score
+
+
 def _get_featurenames(subsets_dict, feature_idx, custom_feature_names, X):
     feature_names = None
     if feature_idx is not None:
@@ -115,6 +141,21 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
         if False. Set to False if the estimator doesn't
         implement scikit-learn's set_params and get_params methods.
         In addition, it is required to set cv=0, and n_jobs=1.
+    memmap : bool (default: False)
+        If True, X and y are dumped once to a temporary
+        memory-mapped file for the duration of `fit`. Parallel
+        workers then receive a reference to this shared memory
+        rather than a pickled copy of the data for every subset.
+    rank_range : (int, int) or None (default: None)
+        If not None, only the feature subsets with rank
+        `start <= rank < stop` are evaluated, where subsets are
+        ranked by size and then lexicographically as in the
+        default enumeration (see `subset_rank.rank_subset`).
+        This splits a search into shards that can be run
+        separately and combined with `merge`. An empty range
+        (e.g. that of a finished shard resumed from
+        `next_rank_`) evaluates no subsets, leaving
+        `best_idx_` None.
 
     Attributes
     ----------
@@ -131,7 +172,7 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
     subsets_ : dict
         A dictionary of selected feature subsets during the
         exhaustive selection, where the dictionary keys are
-        the lengths k of these feature subsets. The dictionary
+        the ranks of these feature subsets. The dictionary
         values are dictionaries themselves with the following
         keys: 'feature_idx' (tuple of indices of the feature subset)
               'feature_names' (tuple of feature names of the feat. subset)
@@ -142,6 +183,19 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
         correspond to the column names. Otherwise, the
         feature names are string representation of the feature
         array indices. The 'feature_names' is new in v 0.13.0.
+    next_rank_ : int
+        Rank of the first subset that was not evaluated, for
+        example because of a keyboard interrupt. Fitting again with
+        `rank_range=(next_rank_, stop)` and merging the results
+        resumes the search.
+    timings_ : list
+        A `timing.CandidateTiming` for each subset evaluated,
+        with the seconds spent slicing its columns ('build'),
+        fitting, scoring, on other work and waiting for
+        dispatch and serialisation, and the worker id.
+        See `timing_summary`.
+    search_time_ : float
+        Elapsed seconds of `fit`.
 
     Examples
     -----------
@@ -153,7 +207,9 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
                  print_progress=True, scoring='accuracy',
                  cv=5, n_jobs=1,
                  pre_dispatch='2*n_jobs',
-                 clone_estimator=True):
+                 clone_estimator=True,
+                 memmap=False,
+                 rank_range=None):
         self.estimator = estimator
         self.min_features = min_features
         self.max_features = max_features
@@ -166,6 +222,8 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
         self.named_est = {key: value for key, value in
                           _name_estimators([self.estimator])}
         self.clone_estimator = clone_estimator
+        self.memmap = memmap
+        self.rank_range = rank_range
         if self.clone_estimator:
             self.est_ = clone(self.estimator)
         else:
@@ -208,6 +266,8 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
         self.subsets_ = {}
         self.fitted = False
         self.interrupted_ = False
+        self.timings_ = []
+        start_time = time.time()
         self.best_idx_ = None
         self.best_feature_names_ = None
         self.best_score_ = None
@@ -238,78 +298,83 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
         if self.max_features < self.min_features:
             raise AttributeError('min_features must be <= max_features')
 
-        candidates = chain.from_iterable(
-            combinations(range(X_.shape[1]), r=i) for i in
-            range(self.min_features, self.max_features + 1)
-        )
-
-        def ncr(n, r):
-            """Return the number of combinations of length r from n items.
-
-            Parameters
-            ----------
-            n : {integer}
-            Total number of items
-            r : {integer}
-            Number of items to select from n
-
-            Returns
-            -------
-            Number of combinations, integer
-
-            """
-
-            r = min(r, n-r)
-            if r == 0:
-                return 1
-            numer = reduce(op.mul, range(n, n-r, -1))
-            denom = reduce(op.mul, range(1, r+1))
-            return numer//denom
-
-        all_comb = np.sum([ncr(n=X_.shape[1], r=i)
-                           for i in range(self.min_features,
-                                          self.max_features + 1)])
-
-        n_jobs = min(self.n_jobs, all_comb)
-        parallel = Parallel(n_jobs=n_jobs, pre_dispatch=self.pre_dispatch)
-        work = enumerate(parallel(delayed(_calc_score)
-                                  (self, X_, y, c, groups=groups, **fit_params)
-                                  for c in candidates))
-
+        total = n_subsets(X_.shape[1], self.min_features, self.max_features)
+        if self.rank_range is not None:
+            start, stop = self.rank_range
+            stop = min(stop, total)
+        else:
+            start, stop = 0, total
+        if start < 0 or start > stop:
+            raise ValueError('rank_range must be within [0, %d]' % total)
+
+        candidates = subsets_in_range(X_.shape[1],
+                                      self.min_features,
+                                      self.max_features,
+                                      start,
+                                      stop)
+        all_comb = stop - start
+        self.next_rank_ = start
+
+        n_jobs = max(min(self.n_jobs, all_comb), 1)
+        # results are taken as they complete so that
+        # the time each is received is recorded
+
+        parallel = _parallel_generator(n_jobs=n_jobs,
+                                       pre_dispatch=self.pre_dispatch)
+
+        temp_folder = None
+        if self.memmap:
+            temp_folder = tempfile.mkdtemp(prefix='mlxtend_efs_')
         try:
-            for iteration, (c, cv_scores) in work:
-
-                self.subsets_[iteration] = {'feature_idx': c,
-                                            'cv_scores': cv_scores,
-                                            'avg_score': np.mean(cv_scores)}
-
-                if self.print_progress:
-                    sys.stderr.write('\rFeatures: %d/%d' % (
-                        iteration + 1, all_comb))
-                    sys.stderr.flush()
-
-                if self._TESTING_INTERRUPT_MODE:
-                    self.subsets_, self.best_feature_names_ = \
-                        _get_featurenames(self.subsets_,
-                                          self.best_idx_,
-                                          custom_feature_names,
-                                          X)
-                    raise KeyboardInterrupt
-
-        except KeyboardInterrupt as e:
-            self.interrupted_ = True
-            sys.stderr.write('\nSTOPPING EARLY DUE TO KEYBOARD INTERRUPT...')
-
-        max_score = float('-inf')
-        for c in self.subsets_:
-            if self.subsets_[c]['avg_score'] > max_score:
-                max_score = self.subsets_[c]['avg_score']
-                best_subset = c
-        score = max_score
-        idx = self.subsets_[best_subset]['feature_idx']
-
-        self.best_idx_ = idx
-        self.best_score_ = score
+            if temp_folder is not None:
+                X_, y = _memmap_data(temp_folder, X_, y)
+
+            dispatched = []
+            work = enumerate(parallel(delayed(timed_call)
+                                      (_calc_score,
+                                       self.est_, self.scorer, self.cv,
+                                       self.pre_dispatch, X_, y, c,
+                                       groups=groups, **fit_params)
+                                      for c in stamped(candidates,
+                                                       dispatched)))
+
+            try:
+                for iteration, ((c, cv_scores), task) in work:
+
+                    self.timings_.append(
+                        candidate_timing(c, 0, [task],
+                                         dispatched[iteration],
+                                         time.time()))
+
+                    self.subsets_[start + iteration] = {
+                        'feature_idx': c,
+                        'cv_scores': cv_scores,
+                        'avg_score': np.mean(cv_scores)}
+                    self.next_rank_ = start + iteration + 1
+
+                    if self.print_progress:
+                        sys.stderr.write('\rFeatures: %d/%d' % (
+                            iteration + 1, all_comb))
+                        sys.stderr.flush()
+
+                    if self._TESTING_INTERRUPT_MODE:
+                        self.subsets_, self.best_feature_names_ = \
+                            _get_featurenames(self.subsets_,
+                                              self.best_idx_,
+                                              custom_feature_names,
+                                              X)
+                        raise KeyboardInterrupt
+
+            except KeyboardInterrupt as e:
+                self.interrupted_ = True
+                sys.stderr.write('\nSTOPPING EARLY DUE TO '
+                                 'KEYBOARD INTERRUPT...')
+        finally:
+            if temp_folder is not None:
+                shutil.rmtree(temp_folder, ignore_errors=True)
+
+        self.best_idx_, self.best_score_ = _best_subset(self.subsets_)
+        self.search_time_ = time.time() - start_time
         self.fitted = True
         self.subsets_, self.best_feature_names_ = \
             _get_featurenames(self.subsets_,
@@ -318,6 +383,61 @@ class ExhaustiveFeatureSelector(BaseEstimator, MetaEstimatorMixin):
                               X)
         return self
 
+    def merge(self, *selectors):
+        """Add the subsets evaluated by other fitted selectors.
+
+        Used to combine the shards of a search split
+        with `rank_range` and fit separately on the same data.
+
+        Parameters
+        ----------
+        selectors : ExhaustiveFeatureSelector
+            Fitted selectors whose `subsets_` are added.
+
+        Returns
+        -------
+        self : object
+
+        """
+        self._check_fitted()
+        for selector in selectors:
+            selector._check_fitted()
+            self.subsets_.update(selector.subsets_)
+            self.interrupted_ = self.interrupted_ or selector.interrupted_
+            self.timings_ = self.timings_ + selector.timings_
+            self.search_time_ += selector.search_time_
+
+        self.best_idx_, self.best_score_ = _best_subset(self.subsets_)
+        self.best_feature_names_ = None
+        for subset in self.subsets_.values():
+            if subset['feature_idx'] == self.best_idx_:
+                self.best_feature_names_ = subset['feature_names']
+                break
+        return self
+
+    def timing_summary(self, percentiles=(50, 90, 99)):
+        """Summarize where the time of the search was spent.
+
+        Parameters
+        ----------
+        percentiles : sequence of float (default: (50, 90, 99))
+            Percentiles of the per-subset times to report.
+
+        Returns
+        -------
+        summary : dict
+            Totals and percentiles of `timings_` for each
+            phase, the number of subsets each worker ran
+            and the parallel efficiency
+            (see `timing.timing_summary`).
+
+        """
+        self._check_fitted()
+        return timing_summary(self.timings_,
+                              self.search_time_,
+                              effective_n_jobs(self.n_jobs),
+                              percentiles)
+
     def transform(self, X):
         """Return the best selected features from X.
 
@@ -11,18 +11,38 @@
 # Derives from sequential_feature_selector
 # but allows custom model search
 
+import os
 import types
 import sys
-from copy import deepcopy
+import time
+import threading
+import shutil
+import tempfile
+import pickle
+import copy
+from inspect import signature
+from collections import OrderedDict
+from itertools import islice
 
 import numpy as np
 import scipy as sp
 
 from sklearn.metrics import get_scorer
-from sklearn.base import (clone, MetaEstimatorMixin)
-from sklearn.model_selection import cross_val_score
-from joblib import Parallel, delayed
-
+from sklearn.base import (clone, MetaEstimatorMixin, is_classifier)
+from sklearn.model_selection import cross_validate, check_cv
+from sklearn.utils import _safe_indexing
+from sklearn.utils.validation import _num_samples
+from joblib import Parallel, delayed, dump, load, effective_n_jobs
+
+from .results import ResultsStore
+from ._parallel import _memmap_data, _parallel_generator
+from .information_criteria import ICScorer, get_ic_scorer
+from .timing import (timed_call,
+                     phase,
+                     add_time,
+                     candidate_timing,
+                     timing_summary,
+                     TaskTiming)
 from ..externals.name_estimators import _name_estimators
 from ..utils.base_compostion import _BaseXComposition
 
@@ -54,6 +74,10 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         sklearn's signature ``scorer(estimator, X, y)``; see
         http://scikit-learn.org/stable/modules/generated/sklearn.metrics.make_scorer.html
         for more information.
+        The information criteria 'neg_aic', 'neg_bic' and
+        'neg_mallows_cp' (see `information_criteria.ICScorer`)
+        are also available, meant for use with cv=None so that
+        each candidate is fit once.
     cv: int (default: 5)
         Integer or iterable yielding train, test splits. If cv is an integer
         and `estimator` is a classifier (or y consists of integer class
@@ -79,16 +103,210 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         if False. Set to False if the estimator doesn't
         implement scikit-learn's set_params and get_params methods.
         In addition, it is required to set cv=0, and n_jobs=1.
+    memmap: bool (default: False)
+        If True, X and y are dumped once to a temporary
+        memory-mapped file for the duration of `fit`. Parallel
+        workers then receive a reference to this shared memory
+        rather than a pickled copy of the data for every candidate.
+    engine: object or None (default: None)
+        Optional scoring backend used instead of refitting
+        `estimator` for each candidate, such as
+        `least_squares.IncrementalLeastSquares`. It must have
+        methods `setup(estimator, scoring, X, y, splits,
+        build_submodel, **fit_params)` and
+        `score_batch(cur_state, candidates)`, the latter
+        returning a list of `(state, scores)`. Candidates
+        are then scored in the main process and `n_jobs`
+        is ignored.
+    cache_scores: bool (default: False)
+        If True, scores are memoized by the set of columns
+        in a state so that states proposed again later
+        in the search (e.g. dropped and then re-added with
+        `direction='both'`) are not scored twice.
+    max_cache_size: int or None (default: None)
+        If not None, bound on the number of cached states,
+        least recently used states being evicted first.
+    checkpoint_file: str or None (default: None)
+        If not None, the state of the search (path, results,
+        current and best states, iteration, CV splits, the
+        strategy and the global numpy random state) is saved
+        to this file after every iteration so that
+        a later call to `fit(..., resume_from=checkpoint_file)`
+        can continue the search. The strategy must be picklable.
+    checkpoint_every: int or None (default: None)
+        If not None, the search state is also saved after
+        every `checkpoint_every` scored candidates within an
+        iteration, so candidates scored before an interruption
+        are not scored again on resuming.
+    parallel_unit: str (default: 'candidate')
+        Unit of work dispatched to the `n_jobs` workers.
+        With 'candidate' each task fits a candidate on all of the
+        cross-validation folds; with 'fold' each task fits a single
+        (candidate, fold) pair and the per-fold scores are
+        reassembled afterwards, which keeps workers busy when a
+        batch has fewer candidates than `n_jobs`. 'fold' has
+        no effect if cv is None, False or 0. Candidates warm
+        started with `warm_start` are always dispatched by fold.
+        'fold' is not supported with `multi_target=True`.
+    racing: bool (default: False)
+        If True, the candidates of each batch are scored
+        fold by fold, and after `racing_min_folds` folds any
+        candidate whose mean score plus `racing_z` standard errors
+        is below either the score of the current best state or
+        the mean minus `racing_z` standard errors of another
+        candidate is abandoned. The candidate with the best
+        partial mean is never abandoned. Abandoned candidates
+        are omitted from `results_` (and recorded in `pruned_`),
+        so postprocessing never sees them: the one standard
+        error rule of `strategy.Stepwise.first_peak` with
+        `parsimonious=True` and the choice among states of
+        a given size by `strategy.Stepwise.fixed_size` only
+        consider the candidates scored on every fold. An
+        abandoned candidate counts as one evaluation in
+        `n_evaluations_` and `max_evaluations`, however few
+        folds it was scored on. Has no
+        effect if cv is None, False or 0, or if an `engine` is used.
+    racing_min_folds: int (default: 2)
+        Number of folds every candidate is scored on
+        before any can be abandoned. Must be at least 2.
+    racing_z: float (default: 2.)
+        Width, in standard errors of the partial mean,
+        of the bounds used to abandon candidates.
+    callback: callable or None (default: None)
+        If not None, called as
+        `callback(state, iteration, scores, n_done, n_total)` as soon
+        as each candidate of a batch has been scored (in order
+        of completion when joblib supports it), where `n_done` of
+        the `n_total` candidates of the batch are complete. If it
+        returns True the search is stopped: the candidates already
+        scored in the batch are kept and `stopped_` is set.
+        See `progress.ProgressReporter`.
+    warm_start: bool (default: False)
+        If True, each candidate is fit on each fold starting
+        from the coefficients fitted on that fold for the current
+        state, with zeros for added columns. This applies to
+        mlxtend estimators whose `fit` takes `init_params`
+        (e.g. `LogisticRegression`, `SoftmaxRegression`), starting
+        from `w_` and `b_`, and to scikit-learn estimators with a
+        `warm_start` parameter, starting from `coef_` and
+        `intercept_`. Other estimators (including those with
+        a `warm_start` parameter but no `coef_` or
+        `intercept_` once fit, such as ensembles and neural
+        networks, after the initial state), strategies whose
+        `build_submodel` has no `column_index`, an `engine`
+        and `racing` are fit as usual. Fewer epochs
+        (or iterations to reach `tol`) are then usually needed.
+        As the starting values differ by fold, warm started
+        candidates are always dispatched as one task per
+        (candidate, fold) pair, as with `parallel_unit='fold'`,
+        whatever `parallel_unit` is.
+    max_time: float or None (default: None)
+        If not None, budget in seconds for `fit`. Once it
+        is spent no further candidates are dispatched: those
+        already scored are kept, `interrupted_` is set and
+        the best state found so far is selected.
+    max_evaluations: int or None (default: None)
+        If not None, budget on the number of candidates scored
+        (not counting those found in the cache or a checkpoint),
+        handled as `max_time`. The initial state is always scored.
+        Candidates are counted as they are dispatched, so with
+        `racing` those later abandoned count in full.
+    speculative: bool (default: False)
+        If True, once every candidate of a step has been
+        dispatched and `speculative_min_fraction` of them are
+        scored, workers left idle by the remaining candidates
+        score the candidates of the next step proposed from the
+        best candidate so far. These scores are used by the next
+        step if it proposes the same states, and discarded
+        otherwise. Only used with strategies whose candidates
+        depend on the current state alone (`strategy.Stepwise`
+        but not `strategy.BeamSearch`), with
+        `parallel_unit='candidate'`, a `pre_dispatch` other than
+        'all' and a joblib version returning results as they
+        complete, and without an `engine`, `racing`, `warm_start`
+        or `checkpoint_every`. Speculative candidates count
+        towards `n_evaluations_` and `max_evaluations`.
+    speculative_min_fraction: float (default: 0.5)
+        Fraction of the candidates of a step that must be
+        scored before the best of them is used to propose
+        speculative candidates. Must be in (0, 1].
+    multi_target: bool (default: False)
+        If True, `fit` runs a separate search for each target,
+        i.e. each column of a 2-D `y` or each array of a list `y`
+        (otherwise a 2-D `y` is passed as is to a multi-output
+        `estimator`). The searches share the encoded design
+        and the cross-validation folds (those of the first
+        target) and advance in lockstep: each iteration scores
+        the union of the candidates of the unfinished targets,
+        so a state proposed for several targets is built and
+        dispatched once and fit to each of them. The results
+        are then lists with one entry per target and
+        `selectors_` holds a fitted selector for each target.
+        Not supported with an `engine`, `racing`, `warm_start`,
+        `speculative`, `cache_scores`, `checkpoint_file`, a
+        `callback`, `parallel_unit='fold'` or 'neg_mallows_cp'
+        scoring.
 
     Attributes
     ----------
     results_: dict
-        A dictionary of selected feature subsets during the
+        A dictionary of feature subsets scored during the
         selection, where the dictionary keys are
-        the states of these feature selector. The dictionary
-        values are dictionaries themselves with the following
-        keys: 'scores' (list individual cross-validation scores)
-              'avg_score' (average cross-validation score)
+        the states of these feature selector and the
+        values are the average cross-validation scores.
+        With the strategies in `strategy` this is a read-only
+        `results.ResultsView` of `results_store_`.
+    results_store_: ResultsStore
+        Every `(state, iteration, scores)` scored,
+        stored as packed bitmasks over the columns with
+        arrays of scores and iterations.
+    cv_splits_: list or None
+        The (train, test) indices used to score every
+        candidate, or None if no cross-validation is used.
+    cache_hits_: int
+        Number of candidates whose scores were found in
+        the cache (always 0 unless `cache_scores` is True).
+    cache_misses_: int
+        Number of candidates looked up in the cache that
+        had to be scored.
+    stopped_: bool
+        True if the search was stopped by `callback`.
+    interrupted_: bool
+        True if the search was interrupted by a
+        `KeyboardInterrupt` or stopped on exhausting
+        `max_time` or `max_evaluations`.
+    n_evaluations_: int
+        Number of candidates scored, including those
+        abandoned by `racing`.
+    n_speculative_: int
+        Number of candidates scored speculatively
+        (always 0 unless `speculative` is True).
+    n_speculative_used_: int
+        Number of speculatively scored candidates
+        whose scores were used by the next step.
+    timings_: list
+        A `timing.CandidateTiming` for each candidate scored
+        (in order of completion), with the seconds spent
+        building its submodel, fitting, scoring, on other work
+        in its tasks and waiting (queueing and serialisation),
+        and the ids of the workers that ran it. With an
+        `engine` the time of each batch is split evenly among
+        its candidates as 'other'. See `timing_summary`.
+    search_time_: float
+        Elapsed seconds of `fit`.
+    pruned_: list
+        With `racing=True`, a list of
+        `(state, iteration, n_folds, scores)` for each
+        candidate abandoned after being scored on its
+        first `n_folds` folds.
+    selectors_: list or None
+        With `multi_target=True`, a fitted `FeatureSelector`
+        for each target (with its own `results_`,
+        `results_store_`, `path_` and `selected_state_`,
+        and usable for `transform`), else None.
+        `n_evaluations_` and `timings_` are those
+        of the joint search, with each state scored
+        for several targets counted once.
 
     Notes
     -----
@@ -110,7 +328,24 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
                  n_jobs=1,
                  pre_dispatch='2*n_jobs',
                  clone_estimator=True,
-                 fixed_features=None):
+                 fixed_features=None,
+                 memmap=False,
+                 engine=None,
+                 cache_scores=False,
+                 max_cache_size=None,
+                 checkpoint_file=None,
+                 checkpoint_every=None,
+                 parallel_unit='candidate',
+                 racing=False,
+                 racing_min_folds=2,
+                 racing_z=2.,
+                 callback=None,
+                 warm_start=False,
+                 max_time=None,
+                 max_evaluations=None,
+                 speculative=False,
+                 speculative_min_fraction=0.5,
+                 multi_target=False):
 
         self.estimator = estimator
         self.strategy = strategy
@@ -128,6 +363,31 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         self.n_jobs = n_jobs
         self.verbose = verbose
         self.clone_estimator = clone_estimator
+        self.memmap = memmap
+        self.engine = engine
+        self.cache_scores = cache_scores
+        self.max_cache_size = max_cache_size
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_every = checkpoint_every
+        if parallel_unit not in ['candidate', 'fold']:
+            raise ValueError("parallel_unit must be 'candidate' or 'fold'")
+        self.parallel_unit = parallel_unit
+        if racing_min_folds < 2:
+            raise ValueError('racing_min_folds must be at least 2')
+        self.racing = racing
+        self.racing_min_folds = racing_min_folds
+        self.racing_z = racing_z
+        self.callback = callback
+        self.warm_start = warm_start
+        if max_evaluations is not None and max_evaluations < 1:
+            raise ValueError('max_evaluations must be at least 1')
+        self.max_time = max_time
+        self.max_evaluations = max_evaluations
+        if not 0 < speculative_min_fraction <= 1:
+            raise ValueError('speculative_min_fraction must be in (0, 1]')
+        self.speculative = speculative
+        self.speculative_min_fraction = speculative_min_fraction
+        self.multi_target = multi_target
 
         if self.clone_estimator:
             self.est_ = clone(self.estimator)
@@ -144,7 +404,7 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
                 raise AttributeError('Estimator must '
                                      'be a Classifier or Regressor.')
         if isinstance(scoring, str):
-            self.scorer = get_scorer(scoring)
+            self.scorer = get_ic_scorer(scoring) or get_scorer(scoring)
         else:
             self.scorer = scoring
 
@@ -179,7 +439,7 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         self._set_params('estimator', 'named_estimators', **params)
         return self
 
-    def fit(self, X, y, groups=None, **fit_params):
+    def fit(self, X, y, groups=None, resume_from=None, **fit_params):
         """Perform feature selection and learn model from training data.
 
         Parameters
@@ -193,9 +453,17 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
             Target values.
             New in v 0.13.0: pandas DataFrames are now also accepted as
             argument for y.
+            With `multi_target=True`, an array-like of shape
+            [n_samples, n_targets] or a list of `n_targets`
+            array-likes of shape [n_samples].
         groups: array-like, with shape (n_samples,), optional
             Group labels for the samples used while splitting the dataset into
             train/test set. Passed to the fit method of the cross-validator.
+        resume_from: str or None (default: None)
+            Checkpoint file written by a previous call to `fit`
+            with `checkpoint_file` set, from which the search is
+            continued without re-scoring completed candidates.
+            `X`, `y` and `fit_params` should be those of that call.
         fit_params: various, optional
             Additional parameters that are being passed to the estimator.
             For example, `sample_weights=weights`.
@@ -208,9 +476,26 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
 
         # reset from a potential previous fit run
         self.interrupted_ = False
+        self.stopped_ = False
         self.finished_ = False
-
-        results_ = []
+        self.n_evaluations_ = 0
+        self.n_speculative_ = self.n_speculative_used_ = 0
+        self._speculated = {}
+        self.timings_ = []
+        self._dispatched = {}
+        self._start_time = time.time()
+        self._budget_active = False
+        if self.cache_scores:
+            self._cache = _ScoreCache(self.max_cache_size)
+        else:
+            self._cache = None
+        self._resumed = {}
+        self._incumbent = None
+        self.pruned_ = []
+        self._warm_coefs = {}
+        self._batch_coefs = {}
+        self._warm_linear = True
+        self.selectors_ = None
 
         # unpack the strategy
         
@@ -220,63 +505,223 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
          check_finished,
          postprocess) = self.strategy
 
-        # fit initial model
-
-        _state, _scores = _calc_score(self.estimator,
-                                      self.scorer,
-                                      build_submodel,
-                                      X,
-                                      y,
-                                      initial_state,
-                                      groups=groups,
-                                      cv=self.cv,
-                                      pre_dispatch=self.pre_dispatch,
-                                      **fit_params)
-
-        # keep a running track of the best state
-
-        iteration = 0
-        self.path_ = [deepcopy((_state, iteration, _scores))]
-        cur = best = (_state, iteration, _scores)
-
-        self.update_results_check(results_,
-                                  self.path_,
-                                  cur,
-                                  [(_state, iteration, _scores)],
-                                  check_finished)
-        iteration += 1
-        try:
-            while not self.finished_:
+        # with several targets the folds are split on the first
 
-                batch_results = self._batch(iteration,
-                                            cur[0],
-                                            candidate_states(cur[0]),
+        if self.multi_target:
+            self._check_multi_target(resume_from)
+            y = _split_targets(y)
+            y_split = y[0]
+        else:
+            y_split = y
+
+        resume = None
+        if resume_from is not None:
+            resume = load(resume_from)
+            (candidate_states,
+             check_finished) = pickle.loads(resume['strategy'])
+            np.random.set_state(resume['random_state'])
+            if self._cache is not None and resume['cache'] is not None:
+                self._cache.scores = resume['cache']
+            self._resumed = dict([(frozenset(state), scores) for
+                                  state, scores in resume['partial']])
+
+        # candidates of the next step can be proposed
+        # speculatively if they depend on the state alone
+
+        self._propose = None
+        proposer = getattr(candidate_states, '__self__', None)
+        if (self.speculative and
+            self.pre_dispatch not in [None, 'all'] and
+            getattr(proposer, 'speculative', False)):
+            self._propose = candidate_states
+
+        # if the strategy can encode all columns up front
+        # candidates are gathered from this design rather
+        # than re-encoding X for each submodel
+
+        if hasattr(build_submodel, 'build_design'):
+            X, build_submodel = build_submodel.build_design(X)
+
+        # Mallows' Cp needs the error variance of the full model
+
+        if isinstance(self.scorer, ICScorer) and self.scorer.criterion == 'cp':
+            if hasattr(build_submodel, 'column_index'):
+                X_full = build_submodel(X, tuple(build_submodel.column_index))
+            else:
+                X_full = X
+            self.scorer = self.scorer.estimate_sigma2(clone(self.est_),
+                                                      X_full,
+                                                      y,
+                                                      **fit_params)
+
+        # the same folds are used for every candidate
+
+        if resume is not None:
+            self.cv_splits_ = resume['cv_splits']
+        elif self.cv:
+            cv = check_cv(self.cv, y_split, classifier=is_classifier(self.est_))
+            self.cv_splits_ = list(cv.split(X, y_split, groups))
+        else:
+            self.cv_splits_ = None
+
+        if self.engine is not None:
+            self.engine.setup(self.est_,
+                              self.scoring,
+                              X,
+                              y,
+                              self.cv_splits_,
+                              build_submodel,
+                              **fit_params)
+
+        # each target searches with its own copy of
+        # the strategy as the strategy may keep state
+
+        if self.multi_target:
+            strategies = [(candidate_states, check_finished, postprocess)]
+            strategies.extend([copy.deepcopy(strategies[0])
+                               for _ in y[1:]])
+
+        def search(X, y):
+            if self.multi_target:
+                return self._search_targets(initial_state,
+                                            strategies,
                                             build_submodel,
                                             X,
                                             y,
                                             groups=groups,
                                             **fit_params)
-                iteration += 1
-                cur, best_, self.finished_ = self.update_results_check(results_,
-                                                                       self.path_,
-                                                                       best,
-                                                                       batch_results,
-                                                                       check_finished)
-                if best_:
-                    best = best_
-                self.path_.append(deepcopy(cur))
-
-                if self._TESTING_INTERRUPT_MODE:
-                    raise KeyboardInterrupt
-        except KeyboardInterrupt:
-            self.interrupted_ = True
-            sys.stderr.write('\nSTOPPING EARLY DUE TO KEYBOARD INTERRUPT...')
+            return self._search(initial_state,
+                                candidate_states,
+                                build_submodel,
+                                check_finished,
+                                X,
+                                y,
+                                groups=groups,
+                                resume=resume,
+                                **fit_params)
+
+        if self.memmap:
+            temp_folder = tempfile.mkdtemp(prefix='mlxtend_selector_')
+            try:
+                X, y = _memmap_data(temp_folder, X, y)
+                results_ = search(X, y)
+            finally:
+                shutil.rmtree(temp_folder, ignore_errors=True)
+        else:
+            results_ = search(X, y)
+
+        if self.multi_target:
+            self.selectors_ = [self._target_selector(store, path, finished,
+                                                     strategy[2])
+                               for (store, path, finished), strategy in
+                               zip(results_, strategies)]
+            for attr in ['results_store_',
+                         'selected_state_',
+                         'results_',
+                         'path_']:
+                setattr(self, attr, [getattr(selector, attr)
+                                     for selector in self.selectors_])
+            self.finished_ = all([selector.finished_
+                                  for selector in self.selectors_])
+        else:
+            self.results_store_ = results_
+            self.selected_state_, self.results_ = postprocess(results_)
+        self.search_time_ = time.time() - self._start_time
 
-        self.selected_state_, self.results_ = postprocess(results_)
+        if self._cache is not None:
+            self.cache_hits_ = self._cache.hits
+            self.cache_misses_ = self._cache.misses
+        else:
+            self.cache_hits_ = self.cache_misses_ = 0
 
         self.fitted = True
         return self
 
+    def merge(self, *selectors):
+        """Add the results of other fitted selectors to this one.
+
+        Typically used to combine the shards of an exhaustive
+        search split by `rank_range` (see `strategy.exhaustive`)
+        and fit separately with the same `X`, `y` and `cv`.
+        Resuming a shard by rank (`next_rank_`) is only offered
+        by `ExhaustiveFeatureSelector`; here an interrupted shard
+        is resumed from its `checkpoint_file`.
+
+        Parameters
+        ----------
+        selectors: FeatureSelector
+            Fitted selectors whose results are added. The best
+            state is then chosen among all results with the
+            postprocessing of `self.strategy`. The initial state,
+            scored again by each shard, is only kept (and counted
+            in `n_evaluations_`) once.
+
+        Returns
+        -------
+        self: object
+
+        """
+        self._check_fitted()
+        self._check_single_target('merge')
+        store = self.results_store_
+        initial = set([frozenset(store.state(row)) for row in
+                       np.nonzero(store.iterations == 0)[0]])
+        for selector in selectors:
+            selector._check_fitted()
+
+            # leave out initial states already scored
+
+            other = selector.results_store_
+            repeated = [row for row in np.nonzero(other.iterations == 0)[0]
+                        if frozenset(other.state(row)) in initial]
+            if repeated:
+                other = other.take(np.setdiff1d(np.arange(len(other)),
+                                                repeated))
+            store.extend(other)
+            timings = [timing for timing in selector.timings_
+                       if not (timing.iteration == 0 and
+                               frozenset(timing.state) in initial)]
+
+            self.interrupted_ = self.interrupted_ or selector.interrupted_
+            self.n_evaluations_ += selector.n_evaluations_ - len(repeated)
+            self.n_speculative_ += selector.n_speculative_
+            self.n_speculative_used_ += selector.n_speculative_used_
+            self.timings_ = self.timings_ + timings
+            self.search_time_ += selector.search_time_
+
+        postprocess = self.strategy.postprocess
+        self.selected_state_, self.results_ = postprocess(store)
+        return self
+
+    def timing_summary(self, percentiles=(50, 90, 99)):
+        """Summarize where the time of the search was spent.
+
+        Parameters
+        ----------
+        percentiles: sequence of float (default: (50, 90, 99))
+            Percentiles of the per-candidate times to report.
+
+        Returns
+        -------
+        summary: dict
+            Totals and percentiles of `timings_` for each
+            phase, the number of candidates each worker ran
+            and the parallel efficiency, i.e. the time spent
+            scoring candidates over `search_time_` times
+            the number of workers
+            (see `timing.timing_summary`).
+
+        """
+        self._check_fitted()
+        if self.engine is not None:
+            n_workers = 1
+        else:
+            n_workers = effective_n_jobs(self.n_jobs)
+        return timing_summary(self.timings_,
+                              self.search_time_,
+                              n_workers,
+                              percentiles)
+
     def transform(self, X):
         """Reduce X to its most important features.
 
@@ -294,6 +739,7 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
 
         """
         self._check_fitted()
+        self._check_single_target('transform')
         build_submodel = self.strategy.build_submodel
         return build_submodel(X, self.selected_state_)
 
@@ -341,11 +787,8 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
 
         Returns
         ----------
-        Dictionary with items where each dictionary value is a list
-        with the number of iterations (number of feature subsets) as
-        its length. The dictionary keys corresponding to these lists
-        are as follows:
-            'state': tuple of the indices of the feature subset
+        Dictionary with the states scored as keys and
+        dictionaries as values with the following keys:
             'scores': list with individual CV scores
             'avg_score': of CV average scores
             'std_dev': standard deviation of the CV score average
@@ -354,25 +797,386 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
 
         """
         self._check_fitted()
-        fdict = deepcopy(self.results_)
+        self._check_single_target('get_metric_dict')
 
         def _calc_confidence(ary, confidence=0.95):
             std_err = sp.stats.sem(ary)
             bound = std_err * sp.stats.t._ppf((1 + confidence) / 2.0, len(ary))
             return bound, std_err
 
-        for k in fdict:
-            std_dev = np.std(self.results_[k]['scores'])
-            bound, std_err = self._calc_confidence(
-                self.results_[k]['scores'],
-                confidence=confidence_interval)
-            fdict[k]['ci_bound'] = bound
-            fdict[k]['std_dev'] = std_dev
-            fdict[k]['std_err'] = std_err
+        store = self.results_store_
+        fdict = {}
+        for state, row in store.view().rows.items():
+            scores = store[row][2]
+            bound, std_err = _calc_confidence(scores,
+                                              confidence=confidence_interval)
+            fdict[state] = {'scores': scores,
+                            'avg_score': store.avg_scores[row],
+                            'ci_bound': bound,
+                            'std_dev': np.std(scores),
+                            'std_err': std_err}
         return fdict
 
     # private methods
 
+    def _search(self,
+                initial_state,
+                candidate_states,
+                build_submodel,
+                check_finished,
+                X,
+                y,
+                groups=None,
+                resume=None,
+                **fit_params):
+        """
+        Run the strategy loop from `initial_state`
+        (or from the checkpoint `resume`)
+        until `check_finished` reports the search is over,
+        returning the list of all results.
+        """
+
+        if resume is not None:
+
+            results_ = resume['results']
+            self.path_ = resume['path']
+            iteration = resume['iteration']
+            cur, best = resume['cur'], resume['best']
+            self.finished_ = resume['finished']
+            self.pruned_ = resume['pruned']
+
+        else:
+
+            results_ = ResultsStore(getattr(build_submodel,
+                                            'column_index',
+                                            None))
+
+            # fit initial model
+
+            iteration = 0
+            batch_results = self._batch(iteration,
+                                        None,
+                                        [initial_state],
+                                        build_submodel,
+                                        X,
+                                        y,
+                                        groups=groups,
+                                        **fit_params)
+
+            # keep a running track of the best state
+
+            self.path_ = []
+            cur, best, _ = self._search_step(iteration,
+                                             results_,
+                                             self.path_,
+                                             None,
+                                             batch_results,
+                                             check_finished)
+            iteration += 1
+
+        self._search_state = {'results': results_,
+                              'path': self.path_,
+                              'pruned': self.pruned_}
+        try:
+            while True:
+
+                self._update_checkpoint(iteration,
+                                        cur,
+                                        best,
+                                        candidate_states,
+                                        check_finished)
+
+                if self._search_over(self.finished_):
+                    break
+
+                self._incumbent = best
+                batch_results = self._batch(iteration,
+                                            cur[0],
+                                            candidate_states(cur[0]),
+                                            build_submodel,
+                                            X,
+                                            y,
+                                            groups=groups,
+                                            **fit_params)
+                cur, best, self.finished_ = self._search_step(iteration,
+                                                              results_,
+                                                              self.path_,
+                                                              best,
+                                                              batch_results,
+                                                              check_finished)
+                iteration += 1
+
+                if self._TESTING_INTERRUPT_MODE:
+                    raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            self.interrupted_ = True
+            sys.stderr.write('\nSTOPPING EARLY DUE TO KEYBOARD INTERRUPT...')
+
+        return results_
+
+    def _search_targets(self,
+                        initial_state,
+                        strategies,
+                        build_submodel,
+                        X,
+                        targets,
+                        groups=None,
+                        **fit_params):
+        """
+        Run a search from `initial_state` for each of `targets`
+        in lockstep, with the `(candidate_states, check_finished,
+        postprocess)` of the corresponding entry of `strategies`.
+        Each iteration scores the union of the candidates of the
+        unfinished targets, each state once for all targets
+        proposing it, returning a list of
+        `(results, path, finished)` for each target.
+        """
+
+        n_targets = len(targets)
+        column_index = getattr(build_submodel, 'column_index', None)
+        results = [ResultsStore(column_index) for _ in targets]
+        paths = [[] for _ in targets]
+        cur = [None] * n_targets
+        best = [None] * n_targets
+        finished = [False] * n_targets
+        proposed = [[initial_state] for _ in targets]
+        iteration = 0
+
+        try:
+            while True:
+
+                active = [t for t in range(n_targets) if not finished[t]]
+                if iteration > 0:
+                    if self._search_over(not active):
+                        break
+                    for t in active:
+                        proposed[t] = list(strategies[t][0](cur[t][0]))
+
+                # targets proposing each state
+
+                states, owners = [], {}
+                for t in active:
+                    for state in proposed[t]:
+                        key = frozenset(state)
+                        if key not in owners:
+                            owners[key] = []
+                            states.append(state)
+                        owners[key].append(t)
+
+                self._budget_active = iteration > 0
+                scored = {}
+                work = self._score_targets(states,
+                                           [owners[frozenset(state)]
+                                            for state in states],
+                                           build_submodel,
+                                           X,
+                                           targets,
+                                           groups=groups,
+                                           **fit_params)
+                for i, state, state_scores, tasks in work:
+                    self._record_timing(state, iteration, i, tasks)
+                    key = frozenset(state)
+                    scored[key] = dict(zip(owners[key], state_scores))
+
+                # results of each target in the order proposed
+
+                for t in active:
+                    batch_results = [(state,
+                                      iteration,
+                                      scored[frozenset(state)][t])
+                                     for state in proposed[t]
+                                     if frozenset(state) in scored]
+                    (cur[t],
+                     best[t],
+                     finished[t]) = self._search_step(iteration,
+                                                      results[t],
+                                                      paths[t],
+                                                      best[t],
+                                                      batch_results,
+                                                      strategies[t][1])
+                iteration += 1
+
+                # as in `_search`, after the first step
+
+                if self._TESTING_INTERRUPT_MODE and iteration > 1:
+                    raise KeyboardInterrupt
+
+        except KeyboardInterrupt:
+            self.interrupted_ = True
+            sys.stderr.write('\nSTOPPING EARLY DUE TO KEYBOARD INTERRUPT...')
+
+        return list(zip(results, paths, finished))
+
+    def _search_step(self,
+                     iteration,
+                     results,
+                     path,
+                     best,
+                     batch_results,
+                     check_finished):
+        """
+        Add `batch_results`, the results of `iteration` of a
+        search, to `results` and `path`, returning the current
+        and best states and whether the search is finished.
+        At iteration 0 `batch_results` holds the initial state,
+        which becomes the current and best state. If
+        `check_finished` keeps the current state (returning
+        `path[-1]`, e.g. to draw more candidates from it),
+        no new entry is added to `path`.
+        """
+
+        if iteration == 0:
+            [cur] = batch_results
+            path.append(cur)
+            self.update_results_check(results,
+                                      path,
+                                      cur,
+                                      batch_results,
+                                      check_finished)
+            return cur, cur, False
+
+        cur, best_, finished = self.update_results_check(results,
+                                                         path,
+                                                         best,
+                                                         batch_results,
+                                                         check_finished)
+        if best_:
+            best = best_
+        if cur is not path[-1]:
+            path.append(cur)
+        return cur, best, finished
+
+    def _search_over(self, finished):
+        """
+        Whether a search stops before its next iteration:
+        once `finished`, stopped by the `callback`, interrupted
+        or out of budget (which marks it interrupted).
+        """
+        if finished or self.stopped_ or self.interrupted_:
+            return True
+        if self._budget_spent():
+            self.interrupted_ = True
+            return True
+        return False
+
+    def _score_targets(self,
+                       states,
+                       owners,
+                       build_submodel,
+                       X,
+                       targets,
+                       groups=None,
+                       **fit_params):
+        """
+        Score each of `states` for the targets indexed by
+        the corresponding entry of `owners`, building its submodel
+        once, returning an iterator of `(index, state, scores, tasks)`
+        as `_score_states` with `scores` a list over these targets.
+        """
+
+        self._dispatched = {}
+        parallel = self._parallel()
+        work = parallel(delayed(_calc_indexed)
+                        (i,
+                         _calc_target_scores,
+                         self.estimator,
+                         self.scorer,
+                         build_submodel,
+                         X,
+                         [targets[t] for t in owners[i]],
+                         state,
+                         groups=groups,
+                         cv=self.cv_splits_,
+                         pre_dispatch=self.pre_dispatch,
+                         **fit_params)
+                        for i, state in self._dispatch(states))
+        return ((i, state, state_scores, [task])
+                for i, (state, state_scores), task in work)
+
+    def _target_selector(self, results, path, finished, postprocess):
+        """
+        Copy of this selector fitted with
+        the results of the search for one target.
+        """
+        selector = copy.copy(self)
+        selector.multi_target = False
+        selector.selectors_ = None
+        selector.results_store_ = results
+        selector.selected_state_, selector.results_ = postprocess(results)
+        selector.path_ = path
+        selector.finished_ = finished
+        selector.fitted = True
+        return selector
+
+    def _check_multi_target(self, resume_from):
+        unsupported = [name for name in ['engine',
+                                         'racing',
+                                         'warm_start',
+                                         'speculative',
+                                         'cache_scores',
+                                         'checkpoint_file',
+                                         'callback']
+                       if getattr(self, name)]
+        if self.parallel_unit == 'fold':
+            unsupported.append("parallel_unit='fold'")
+        if resume_from is not None:
+            unsupported.append('resume_from')
+        if isinstance(self.scorer, ICScorer) and self.scorer.criterion == 'cp':
+            unsupported.append("scoring='neg_mallows_cp'")
+        if unsupported:
+            raise ValueError('multi_target=True is not supported with %s'
+                             % ', '.join(unsupported))
+
+    def _check_single_target(self, method):
+        if self.multi_target:
+            raise ValueError('with multi_target=True use the %s method '
+                             'of the selectors in selectors_' % method)
+
+    def _update_checkpoint(self,
+                           iteration,
+                           cur,
+                           best,
+                           candidate_states,
+                           check_finished):
+        """
+        Record the state of the search at the start of
+        an iteration and write it to `self.checkpoint_file`.
+        """
+
+        if self.checkpoint_file is None:
+            return
+
+        self._search_state.update(iteration=iteration,
+                                  cur=cur,
+                                  best=best,
+                                  finished=self.finished_,
+                                  strategy=pickle.dumps((candidate_states,
+                                                         check_finished)),
+                                  random_state=np.random.get_state())
+        self._write_checkpoint([])
+
+    def _write_checkpoint(self, partial):
+        """
+        Write the search state, along with the `(state, scores)`
+        pairs in `partial` already scored in the current
+        iteration, to `self.checkpoint_file`.
+        """
+
+        checkpoint = dict(self._search_state)
+        checkpoint['partial'] = partial
+        checkpoint['cv_splits'] = self.cv_splits_
+        if self._cache is not None:
+            checkpoint['cache'] = self._cache.scores
+        else:
+            checkpoint['cache'] = None
+
+        # write to a temporary file first so an interruption
+        # never leaves a truncated checkpoint
+
+        tmp_file = self.checkpoint_file + '.tmp'
+        dump(checkpoint, tmp_file)
+        os.replace(tmp_file, self.checkpoint_file)
+
     def _batch(self,
                iteration,
                cur_state,
@@ -382,33 +1186,558 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
                y,
                groups=None,
                **fit_params):
+        """
+        Score `candidates`, returning a list of
+        `(state, iteration, scores)`, or a `ResultsStore`
+        if they are streamed (see `_streamed`).
+        """
 
-        results = []
+        if candidates is None:
+            return []
+
+        self._batch_coefs = {}
+
+        # the initial state is scored whatever the budget
+
+        self._budget_active = iteration > 0
+
+        if self._streamed(candidates):
+
+            # score a chunk at a time, so neither the candidates
+            # nor their results are ever held as a list
+
+            self._progress = [0, len(candidates)]
+            results = ResultsStore(getattr(build_submodel,
+                                           'column_index',
+                                           None))
+            candidates = iter(candidates)
+            chunk_size = _CHUNK_SIZE * effective_n_jobs(self.n_jobs)
+            while not (self.stopped_ or self.interrupted_):
+                chunk = list(islice(candidates, chunk_size))
+                if not chunk:
+                    break
+                results.extend(self._score_batch(iteration,
+                                                 cur_state,
+                                                 chunk,
+                                                 build_submodel,
+                                                 X,
+                                                 y,
+                                                 groups=groups,
+                                                 **fit_params))
+        else:
+            candidates = list(candidates)
+            self._progress = [0, len(candidates)]
+            results = self._score_batch(iteration,
+                                        cur_state,
+                                        candidates,
+                                        build_submodel,
+                                        X,
+                                        y,
+                                        groups=groups,
+                                        **fit_params)
 
-        if candidates is not None:
+        # coefficients of this batch warm start the next
 
-            parallel = Parallel(n_jobs=self.n_jobs,
-                                verbose=self.verbose,
-                                pre_dispatch=self.pre_dispatch)
+        self._warm_coefs = self._batch_coefs
 
-            work = parallel(delayed(_calc_score)
-                            (self.estimator,
-                             self.scorer,
-                             build_submodel,
-                             X,
-                             y,
-                             state,
-                             groups=groups,
-                             cv=self.cv,
-                             pre_dispatch=self.pre_dispatch,
-                             **fit_params)
-                            for state in candidates)
+        return results
 
-            for state, scores in work:
-                results.append((state, iteration, scores))
+    def _streamed(self, candidates):
+        """
+        Whether `candidates` should be scored a chunk
+        at a time: they are a lazy iterable with a length
+        (such as `strategy.MinMaxCandidates.candidate_states`)
+        and partial checkpoints (which need the whole batch)
+        are not written.
+        """
+        return (not isinstance(candidates, (list, tuple)) and
+                hasattr(candidates, '__len__') and
+                not (self.checkpoint_file is not None and
+                     self.checkpoint_every))
+
+    def _score_batch(self,
+                     iteration,
+                     cur_state,
+                     candidates,
+                     build_submodel,
+                     X,
+                     y,
+                     groups=None,
+                     **fit_params):
+        """
+        Score the list `candidates`, returning a list of
+        `(state, iteration, scores)` for those scored.
+        """
+
+        results = []
+        scores = [None] * len(candidates)
+
+        try:
+
+            # look up states that have already been scored
+
+            todo = []
+            for i, state in enumerate(candidates):
+                key = frozenset(state)
+                if key in self._resumed:
+                    scores[i] = self._resumed.pop(key)
+                elif key in self._speculated:
+                    scores[i] = self._speculated.pop(key)
+                    self.n_speculative_used_ += 1
+                    if self._cache is not None:
+                        self._cache.set(state, scores[i])
+                elif self._cache is not None:
+                    scores[i] = self._cache.get(state)
+                if scores[i] is None:
+                    todo.append(i)
+                else:
+                    self._report(state, iteration, scores[i])
+
+            # speculative scores not proposed by this step are discarded
+
+            self._speculated = {}
+
+            if (self.racing and self.cv_splits_ and
+                self.engine is None and iteration > 0):
+
+                known = [state_scores for state_scores in scores
+                         if state_scores is not None]
+                todo = [todo[j] for j, _ in
+                        self._dispatch([candidates[i] for i in todo])]
+                work = self._race_states(iteration,
+                                         [candidates[i] for i in todo],
+                                         known,
+                                         build_submodel,
+                                         X,
+                                         y,
+                                         **fit_params)
+                for j, (i, (state, state_scores, tasks)) in enumerate(zip(todo, work)):
+                    self._record_timing(state, iteration, j, tasks)
+                    scores[i] = state_scores
+                    if self._cache is not None and state_scores is not None:
+                        self._cache.set(state, state_scores)
+                    if state_scores is not None:
+                        self._report(state, iteration, state_scores)
+                todo = []
+
+            if self.checkpoint_file is not None and self.checkpoint_every:
+                chunk_size = self.checkpoint_every
+            else:
+                chunk_size = max(len(todo), 1)
+
+            speculation = None
+            if (self._propose is not None and iteration > 0 and
+                todo and chunk_size >= len(todo)):
+                speculation = _Speculation(self._propose,
+                                           candidates,
+                                           [(state, state_scores) for
+                                            state, state_scores in
+                                            zip(candidates, scores)
+                                            if state_scores is not None],
+                                           len(todo),
+                                           self.speculative_min_fraction)
+
+            for start in range(0, len(todo), chunk_size):
+                chunk = todo[start:start + chunk_size]
+                work = self._score_states(cur_state,
+                                          [candidates[i] for i in chunk],
+                                          build_submodel,
+                                          X,
+                                          y,
+                                          groups=groups,
+                                          speculation=speculation,
+                                          iteration=iteration,
+                                          **fit_params)
+
+                for j, state, state_scores, tasks in work:
+                    self._record_timing(state, iteration, j, tasks)
+                    i = chunk[j]
+                    scores[i] = state_scores
+                    if self._cache is not None:
+                        self._cache.set(state, state_scores)
+                    self._report(state, iteration, state_scores)
+
+                if chunk_size < len(todo) and iteration > 0:
+                    self._write_checkpoint([(candidates[i], scores[i])
+                                            for i in range(len(candidates))
+                                            if scores[i] is not None])
+
+        except _StopSearch:
+            self.stopped_ = True
+
+        # abandoned candidates are left out of the results
+
+        for state, state_scores in zip(candidates, scores):
+            if state_scores is not None:
+                results.append((state, iteration, state_scores))
 
         return results
 
+    def _score_states(self,
+                      cur_state,
+                      states,
+                      build_submodel,
+                      X,
+                      y,
+                      groups=None,
+                      speculation=None,
+                      iteration=0,
+                      **fit_params):
+        """
+        Score `states`, returning an iterator of
+        `(index, state, scores, tasks)` in order of completion,
+        where `index` is the position of `state` in `states`
+        and `tasks` the `TaskTiming` of its tasks.
+        If `speculation` is not None, candidates of the
+        step after `iteration` are also scored
+        (see `_speculate`).
+        """
+
+        self._dispatched = {}
+        if not states:
+            return []
+
+        if self.engine is not None:
+            states = [state for _, state in self._dispatch(states)]
+            if not states:
+                return []
+            start = time.time()
+            work = self.engine.score_batch(cur_state, states)
+            share = (time.time() - start) / len(states)
+            worker = (os.getpid(), threading.get_ident())
+            return [(i, state, state_scores,
+                     [TaskTiming(worker,
+                                 start + i * share,
+                                 start + (i + 1) * share,
+                                 {})])
+                    for i, (state, state_scores) in enumerate(work)]
+
+        parallel = self._parallel()
+
+        warm_spec = self._warm_spec(build_submodel)
+        if warm_spec is not None:
+
+            # one task per (state, fold) started from the
+            # coefficients of `cur_state` on the same fold
+
+            splits = self.cv_splits_
+            if not splits:
+                rows = np.arange(_num_samples(y))
+                splits = [(rows, rows)]
+            parent = self._warm_coefs.get(frozenset(cur_state or ()))
+            column_index = build_submodel.column_index
+            inits = [[None] * len(splits) if parent is None else
+                     [_child_coefs(cur_state,
+                                   coefs,
+                                   state,
+                                   column_index,
+                                   warm_spec[2]) for coefs in parent]
+                     for state in states]
+
+            work = _collect_folds(states,
+                                  len(splits),
+                                  parallel(delayed(_calc_indexed)
+                                           ((i, k),
+                                            _calc_warm_fold_score,
+                                            self.estimator,
+                                            self.scorer,
+                                            build_submodel,
+                                            X,
+                                            y,
+                                            state,
+                                            train,
+                                            test,
+                                            inits[i][k],
+                                            warm_spec,
+                                            **fit_params)
+                                           for i, state in self._dispatch(states)
+                                           for k, (train, test) in
+                                           enumerate(splits)),
+                                  as_array=False)
+            return self._keep_coefs(work)
+
+        if self.parallel_unit == 'fold' and self.cv_splits_:
+
+            # one task per (state, fold), regrouped by state
+
+            return _collect_folds(states,
+                                  len(self.cv_splits_),
+                                  parallel(delayed(_calc_indexed)
+                                           ((i, k),
+                                            _calc_fold_score,
+                                            self.estimator,
+                                            self.scorer,
+                                            build_submodel,
+                                            X,
+                                            y,
+                                            state,
+                                            train,
+                                            test,
+                                            **fit_params)
+                                           for i, state in self._dispatch(states)
+                                           for k, (train, test) in
+                                           enumerate(self.cv_splits_)))
+
+        def calc(i, state):
+            return delayed(_calc_indexed)(i,
+                                          _calc_score,
+                                          self.estimator,
+                                          self.scorer,
+                                          build_submodel,
+                                          X,
+                                          y,
+                                          state,
+                                          groups=groups,
+                                          cv=self.cv_splits_,
+                                          pre_dispatch=self.pre_dispatch,
+                                          **fit_params)
+
+        if speculation is not None:
+            parallel = self._parallel(batch_size=1)
+            if getattr(parallel, 'return_generator', False):
+                return self._speculate(parallel,
+                                       speculation,
+                                       states,
+                                       calc,
+                                       iteration)
+
+        work = parallel(calc(i, state) for i, state in self._dispatch(states))
+        return ((i, state, state_scores, [task])
+                for i, (state, state_scores), task in work)
+
+    def _speculate(self,
+                   parallel,
+                   speculation,
+                   states,
+                   calc,
+                   iteration):
+        """
+        Score `states` as in `_score_states` and, once all
+        are dispatched, the candidates proposed by `speculation`
+        on workers that would otherwise be idle, storing their
+        scores in `self._speculated` for the next step.
+
+        Tasks are taken from the generator as workers free up,
+        so while no candidate can be proposed the free worker
+        sleeps briefly and asks again.
+        """
+
+        n_states = len(states)
+
+        def tasks():
+            for i, state in self._dispatch(states):
+                yield calc(i, state)
+            if self.interrupted_:
+                return
+            for state in speculation.proposals():
+                if state is None:
+                    yield delayed(_calc_indexed)(-1, time.sleep, 0.01)
+                elif self._budget_spent():
+                    return
+                else:
+                    i = n_states + self.n_speculative_
+                    self.n_speculative_ += 1
+                    self.n_evaluations_ += 1
+                    self._dispatched[i] = time.time()
+                    yield calc(i, state)
+
+        for i, result, task in parallel(tasks()):
+            if i < 0:
+                continue
+            state, state_scores = result
+            if i < n_states:
+                speculation.receive(state, state_scores)
+                yield i, state, state_scores, [task]
+            else:
+                self._record_timing(state, iteration + 1, i, [task])
+                self._speculated[frozenset(state)] = state_scores
+
+    def _dispatch(self, states):
+        """
+        Enumerate `states` as they are dispatched for
+        scoring, counting them in `n_evaluations_`, and
+        stop (setting `interrupted_`) once `max_time` or
+        `max_evaluations` is exhausted.
+        """
+        for i, state in enumerate(states):
+            if self._budget_active and self._budget_spent():
+                self.interrupted_ = True
+                return
+            self.n_evaluations_ += 1
+            self._dispatched[i] = time.time()
+            yield i, state
+
+    def _budget_spent(self):
+        """
+        Whether `max_time` or `max_evaluations` is exhausted.
+        """
+        if (self.max_evaluations is not None and
+            self.n_evaluations_ >= self.max_evaluations):
+            return True
+        return (self.max_time is not None and
+                time.time() - self._start_time >= self.max_time)
+
+    def _warm_spec(self, build_submodel):
+        """
+        `(coef_attr, intercept_attr, feature_axis, mlxtend)`
+        describing how to warm start `self.estimator`,
+        or None if candidates are fit from scratch, as they
+        are once a fitted estimator turned out to have no
+        such coefficients (e.g. a random forest).
+        """
+        if not self.warm_start or not hasattr(build_submodel, 'column_index'):
+            return None
+        if not self._warm_linear:
+            return None
+        if 'init_params' in signature(self.estimator.fit).parameters:
+            return ('w_', 'b_', 0, True)
+        if 'warm_start' in self.estimator.get_params():
+            return ('coef_', 'intercept_', -1, False)
+        return None
+
+    def _keep_coefs(self, work):
+        """
+        Store the per-fold coefficients in `work` for
+        use as starting values in the next batch,
+        passing on `(index, state, scores, tasks)`.
+        Without coefficients, later batches are fit
+        from scratch.
+        """
+        for i, state, fold_results, tasks in work:
+            scores = np.array([score for score, _ in fold_results])
+            coefs = [coefs for _, coefs in fold_results]
+            if any([c is None for c in coefs]):
+                self._warm_linear = False
+            else:
+                self._batch_coefs[frozenset(state)] = coefs
+            yield i, state, scores, tasks
+
+    def _record_timing(self, state, iteration, index, tasks):
+        """
+        Add the `CandidateTiming` of `state`, the
+        `index`-th state dispatched by `_dispatch`.
+        """
+        received = time.time()
+        self.timings_.append(candidate_timing(state,
+                                              iteration,
+                                              tasks,
+                                              self._dispatched.get(index,
+                                                                   received),
+                                              received))
+
+    def _parallel(self, batch_size='auto'):
+        """
+        `Parallel` instance returning results as
+        they complete, if supported by joblib.
+        """
+        return _parallel_generator('generator_unordered',
+                                   n_jobs=self.n_jobs,
+                                   verbose=self.verbose,
+                                   pre_dispatch=self.pre_dispatch,
+                                   batch_size=batch_size)
+
+    def _report(self, state, iteration, scores):
+        """
+        Pass a scored candidate to `self.callback`,
+        stopping the search if it returns True.
+        """
+        self._progress[0] += 1
+        if self.callback is not None:
+            if self.callback(state,
+                             iteration,
+                             scores,
+                             self._progress[0],
+                             self._progress[1]):
+                raise _StopSearch
+
+    def _race_states(self,
+                     iteration,
+                     states,
+                     known,
+                     build_submodel,
+                     X,
+                     y,
+                     **fit_params):
+        """
+        Score `states` one fold at a time, abandoning those
+        that cannot beat the current best state or the
+        other candidates. `known` are the scores of
+        candidates in the batch that were already scored.
+
+        Returns a list of `(state, scores, tasks)` in the
+        same order as `states`, with `scores` None for the
+        abandoned states and `tasks` the `TaskTiming`
+        of the folds scored.
+        """
+
+        n_folds = len(self.cv_splits_)
+        z = self.racing_z
+        parallel = Parallel(n_jobs=self.n_jobs,
+                            verbose=self.verbose,
+                            pre_dispatch=self.pre_dispatch)
+
+        reference = -np.inf
+        if self._incumbent is not None and self._incumbent[2] is not None:
+            reference = np.nanmean(self._incumbent[2])
+        for state_scores in known:
+            reference = max(reference, np.nanmean(state_scores))
+
+        fold_scores = [[] for _ in states]
+        fold_tasks = [[] for _ in states]
+        alive = list(range(len(states)))
+        n_done = 0
+
+        while alive and n_done < n_folds:
+
+            n_next = max(n_done + 1, self.racing_min_folds)
+            folds = list(range(n_done, min(n_next, n_folds)))
+            new_scores = iter(parallel(delayed(_calc_indexed)
+                                       ((i, k),
+                                        _calc_fold_score,
+                                        self.estimator,
+                                        self.scorer,
+                                        build_submodel,
+                                        X,
+                                        y,
+                                        states[i],
+                                        *self.cv_splits_[k],
+                                        **fit_params)
+                                       for i in alive
+                                       for k in folds))
+            for i in alive:
+                for k in folds:
+                    _, score, task = next(new_scores)
+                    fold_scores[i].append(score)
+                    fold_tasks[i].append(task)
+            n_done = folds[-1] + 1
+
+            if n_done == n_folds:
+                break
+
+            # bound each partial mean by z standard errors
+
+            partial = np.array([fold_scores[i] for i in alive])
+            means = np.nanmean(partial, 1)
+            se = np.nanstd(partial, 1, ddof=1) / np.sqrt(n_done)
+            bound = np.nanmax(np.append(means - z * se, reference))
+
+            keep = means + z * se >= bound
+            keep[np.argmax(np.where(np.isnan(means), -np.inf, means))] = True
+
+            for i, keep_i in zip(alive, keep):
+                if not keep_i:
+                    self.pruned_.append((states[i],
+                                         iteration,
+                                         n_done,
+                                         np.array(fold_scores[i])))
+            alive = [i for i, keep_i in zip(alive, keep) if keep_i]
+
+        alive = set(alive)
+        return [(state,
+                 np.array(fold_scores[i]) if i in alive else None,
+                 fold_tasks[i])
+                for i, state in enumerate(states)]
+
     def _check_fitted(self):
         if not self.fitted:
             raise AttributeError('{} has not been fitted yet.'.format(self.__class__))
@@ -462,7 +1791,7 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
 
         """
 
-        finished = batch_results == []
+        finished = len(batch_results) == 0
 
         if not finished:
 
@@ -486,8 +1815,104 @@ class FeatureSelector(_BaseXComposition, MetaEstimatorMixin):
                     True)
 
 
+class _ScoreCache(object):
+
+    """
+    Scores of states already evaluated in a run,
+    keyed by the (unordered) set of columns in the
+    state, optionally bounded with LRU eviction.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, state):
+        key = frozenset(state)
+        if key in self.scores:
+            self.hits += 1
+            self.scores.move_to_end(key)
+            return self.scores[key]
+        self.misses += 1
+
+    def set(self, state, scores):
+        key = frozenset(state)
+        self.scores[key] = scores
+        self.scores.move_to_end(key)
+        if self.max_size is not None:
+            while len(self.scores) > self.max_size:
+                self.scores.popitem(last=False)
+
+class _Speculation(object):
+
+    """
+    Best candidate of a step among the results received
+    so far, and the candidates of the next step proposed
+    from it by `candidate_states`.
+    """
+
+    def __init__(self,
+                 candidate_states,
+                 states,
+                 known,
+                 n_todo,
+                 min_fraction):
+        self.candidate_states = candidate_states
+        self.n_todo = n_todo
+        self.n_needed = max(int(np.ceil(min_fraction * n_todo)), 1)
+        self.n_received = 0
+        self.leader = None
+        self.best = -np.inf
+        self.proposed = set([frozenset(state) for state in states])
+        for state, scores in known:
+            self._update(state, scores)
+
+    def receive(self, state, scores):
+        self.n_received += 1
+        self._update(state, scores)
+
+    def proposals(self):
+        """
+        Yield candidates of the next step from the current
+        leader, each once, or None while there is nothing to
+        propose, until every candidate of the step is received.
+        """
+        leader, pending = None, []
+        while self.n_received < self.n_todo:
+            if self.n_received < self.n_needed:
+                yield None
+                continue
+            if self.leader is not leader:
+                leader = self.leader
+                pending = list(self.candidate_states(leader))
+            while pending and frozenset(pending[0]) in self.proposed:
+                pending.pop(0)
+            if not pending:
+                yield None
+                continue
+            state = pending.pop(0)
+            self.proposed.add(frozenset(state))
+            yield state
+
+    def _update(self, state, scores):
+        score = np.nanmean(scores)
+        if self.leader is None or score > self.best:
+            self.leader, self.best = state, score
+
+class _StopSearch(Exception):
+    """
+    Raised when `callback` asks to stop the search.
+    """
+
+
 # private functions
 
+# candidates of a stream scored at a time by each worker
+
+_CHUNK_SIZE = 256
+
 def _calc_score(estimator,
                 scorer,
                 build_submodel,
@@ -499,24 +1924,253 @@ def _calc_score(estimator,
                 pre_dispatch='2*n_jobs',
                 **fit_params):
     
-    X_state = build_submodel(X, state)
+    with phase('build'):
+        X_state = build_submodel(X, state)
+    return state, _score_submodel(estimator,
+                                  scorer,
+                                  X_state,
+                                  y,
+                                  groups=groups,
+                                  cv=cv,
+                                  pre_dispatch=pre_dispatch,
+                                  **fit_params)
+
+
+def _calc_target_scores(estimator,
+                        scorer,
+                        build_submodel,
+                        X,
+                        targets,
+                        state,
+                        groups=None,
+                        cv=None,
+                        pre_dispatch='2*n_jobs',
+                        **fit_params):
+    """
+    Build the submodel for `state` once
+    and score it for each of `targets`.
+    """
+
+    with phase('build'):
+        X_state = build_submodel(X, state)
+    return state, [_score_submodel(estimator,
+                                   scorer,
+                                   X_state,
+                                   y,
+                                   groups=groups,
+                                   cv=cv,
+                                   pre_dispatch=pre_dispatch,
+                                   **fit_params)
+                   for y in targets]
+
+
+def _score_submodel(estimator,
+                    scorer,
+                    X_state,
+                    y,
+                    groups=None,
+                    cv=None,
+                    pre_dispatch='2*n_jobs',
+                    **fit_params):
+    """
+    Scores of `estimator` on the submodel `X_state`,
+    one per fold of `cv` or one on the training
+    data if `cv` is None.
+    """
 
     if cv:
-        scores = cross_val_score(estimator,
-                                 X_state,
-                                 y,
-                                 groups=groups,
-                                 cv=cv,
-                                 scoring=scorer,
-                                 n_jobs=1,
-                                 pre_dispatch=pre_dispatch,
-                                 fit_params=fit_params)
+        cv_results = cross_validate(estimator,
+                                    X_state,
+                                    y,
+                                    groups=groups,
+                                    cv=cv,
+                                    scoring=scorer,
+                                    n_jobs=1,
+                                    pre_dispatch=pre_dispatch,
+                                    fit_params=fit_params)
+        add_time('fit', np.sum(cv_results['fit_time']))
+        add_time('score', np.sum(cv_results['score_time']))
+        scores = cv_results['test_score']
     else:
-        estimator.fit(X_state,
-                      y,
+        with phase('fit'):
+            estimator.fit(X_state,
+                          y,
+                          **fit_params)
+        with phase('score'):
+            scores = np.array([scorer(estimator,
+                                      X_state,
+                                      y)])
+    return scores
+
+
+def _calc_fold_score(estimator,
+                     scorer,
+                     build_submodel,
+                     X,
+                     y,
+                     state,
+                     train,
+                     test,
+                     **fit_params):
+    """
+    Fit a clone of `estimator` on the `train` rows of
+    the submodel for `state` and score it on the `test` rows.
+    """
+
+    with phase('build'):
+        X_state = build_submodel(X, state)
+    n_samples = _num_samples(X_state)
+    fit_params = dict([(k, _index_param(v, n_samples, train))
+                       for k, v in fit_params.items()])
+
+    estimator = clone(estimator)
+    X_train, y_train = _safe_indexing(X_state, train), _safe_indexing(y, train)
+    with phase('fit'):
+        estimator.fit(X_train,
+                      y_train,
                       **fit_params)
-        scores = np.array([scorer(estimator,
-                                  X_state,
-                                  y)])
-    return state, scores
+    X_test, y_test = _safe_indexing(X_state, test), _safe_indexing(y, test)
+    with phase('score'):
+        return scorer(estimator,
+                      X_test,
+                      y_test)
+
+def _index_param(value, n_samples, indices):
+    """
+    Restrict a sample-aligned fit parameter (one with
+    `n_samples` entries, e.g. `sample_weight`) to `indices`,
+    leaving other fit parameters unchanged.
+    """
+    if _num_samples_or_none(value) == n_samples:
+        return _safe_indexing(value, indices)
+    return value
+
+def _num_samples_or_none(value):
+    try:
+        return _num_samples(value)
+    except TypeError:
+        return None
+
+def _split_targets(y):
+    """
+    List of the targets in `y`: the entries of a list
+    or the columns of a 2-D array-like.
+    """
+    if isinstance(y, (list, tuple)):
+        return [np.asarray(target) for target in y]
+    y = np.asarray(y)
+    if y.ndim != 2:
+        raise ValueError('with multi_target=True y should be 2-D '
+                         'or a list of targets')
+    return [np.ascontiguousarray(y[:, t]) for t in range(y.shape[1])]
+
+def _calc_indexed(index, func, *args, **kwargs):
+    """
+    Return `index` with the result of `func` and its
+    `TaskTiming`, so that results arriving out of order
+    can be matched up.
+    """
+    result, task = timed_call(func, *args, **kwargs)
+    return index, result, task
+
+def _collect_folds(states, n_folds, work, as_array=True):
+    """
+    Regroup `((index, fold), score, task)` results into
+    `(index, state, scores, tasks)` as soon as all folds
+    of a state are complete, with `scores` an array if
+    `as_array` and otherwise the list of fold results
+    (e.g. the `(score, coefs)` of `_calc_warm_fold_score`).
+    """
+    fold_scores = {}
+    fold_tasks = {}
+    for (i, k), score, task in work:
+        fold_scores.setdefault(i, [None] * n_folds)[k] = score
+        fold_tasks.setdefault(i, []).append(task)
+        if all([score is not None for score in fold_scores[i]]):
+            scores = fold_scores.pop(i)
+            if as_array:
+                scores = np.array(scores)
+            yield i, states[i], scores, fold_tasks.pop(i)
+
+def _calc_warm_fold_score(estimator,
+                          scorer,
+                          build_submodel,
+                          X,
+                          y,
+                          state,
+                          train,
+                          test,
+                          init,
+                          warm_spec,
+                          **fit_params):
+    """
+    As `_calc_fold_score` but starting from the
+    coefficients `init` (if not None) and returning
+    `(score, (coef, intercept))` of the fitted estimator,
+    or `(score, None)` if it has no such coefficients.
+    """
+
+    coef_attr, intercept_attr, _, mlxtend = warm_spec
+
+    with phase('build'):
+        X_state = build_submodel(X, state)
+    n_samples = _num_samples(X_state)
+    fit_params = dict([(k, _index_param(v, n_samples, train))
+                       for k, v in fit_params.items()])
+
+    estimator = clone(estimator)
+    if init is not None:
+        coef, intercept = init
+        setattr(estimator, coef_attr, coef.copy())
+        setattr(estimator, intercept_attr, np.array(intercept, copy=True))
+        if mlxtend:
+            estimator.cost_ = []
+            if getattr(estimator, 'n_classes', 0) is None:
+                estimator.n_classes = coef.shape[1]
+            fit_params['init_params'] = False
+        else:
+            estimator.set_params(warm_start=True)
+
+    X_train, y_train = _safe_indexing(X_state, train), _safe_indexing(y, train)
+    with phase('fit'):
+        estimator.fit(X_train,
+                      y_train,
+                      **fit_params)
+    X_test, y_test = _safe_indexing(X_state, test), _safe_indexing(y, test)
+    with phase('score'):
+        score = scorer(estimator,
+                       X_test,
+                       y_test)
+    if not (hasattr(estimator, coef_attr) and
+            hasattr(estimator, intercept_attr)):
+        return score, None
+    return score, (np.array(getattr(estimator, coef_attr)),
+                   np.array(getattr(estimator, intercept_attr)))
+
+def _child_coefs(parent_state, parent_coefs, state, column_index, axis):
+    """
+    Starting coefficients for `state` from those of
+    `parent_state`: the parent's coefficients for columns
+    in both and zeros for the other columns of `state`.
+    """
+
+    if not state or parent_coefs is None:
+        return None
 
+    coef, intercept = parent_coefs
+    coef = np.moveaxis(coef, axis, 0)
+
+    blocks = {}
+    start = 0
+    for col in (parent_state or ()):
+        width = len(column_index[col])
+        blocks[col] = coef[start:start + width]
+        start += width
+
+    child = []
+    for col in state:
+        if col in blocks:
+            child.append(blocks[col])
+        else:
+            child.append(np.zeros((len(column_index[col]),) + coef.shape[1:]))
+    return np.moveaxis(np.concatenate(child), 0, axis), intercept
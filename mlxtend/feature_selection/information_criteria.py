@@ -0,0 +1,154 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Information criterion scorers for feature selection
+#
+# License: BSD 3 clause
+
+import copy
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import log_loss
+
+
+class ICScorer(object):
+
+    """
+    Scorer computing the negative of an information criterion
+    for a model fit to the data it is scored on, for use with
+    `FeatureSelector(scoring=..., cv=None)`: each candidate
+    is then fit once rather than once per fold.
+
+    The log-likelihood is that of a multinomial model for
+    estimators with `predict_proba` and of a Gaussian model
+    otherwise. Degrees of freedom are the number of columns of
+    the model matrix, whatever their fitted coefficients (so a
+    categorical `Column` counts one per column of its encoding),
+    plus one for an intercept, times the number of outputs. The
+    single column of zeros the strategies in `strategy`
+    use as the model matrix of the empty model counts none.
+
+    Parameters
+    ----------
+    criterion: str
+        One of 'aic', 'bic' or 'cp' (Mallows' Cp).
+    sigma2: float or None (default: None)
+        Error variance used by 'cp'. If None, it is
+        estimated from the model with all columns
+        when `FeatureSelector` is fit.
+
+    Attributes
+    ----------
+    sigma2_: float or None
+        Error variance used by 'cp'.
+
+    """
+
+    def __init__(self, criterion, sigma2=None):
+        if criterion not in ['aic', 'bic', 'cp']:
+            raise ValueError("criterion must be one of "
+                             "'aic', 'bic' or 'cp'")
+        self.criterion = criterion
+        self.sigma2 = sigma2
+        self.sigma2_ = sigma2
+
+    def __call__(self, estimator, X, y):
+
+        n = X.shape[0]
+        df = _degrees_of_freedom(estimator, X)
+
+        if self.criterion == 'cp':
+            if self.sigma2_ is None:
+                raise ValueError("sigma2 is needed for Mallows' Cp")
+            rss = _rss(estimator, X, y)
+            return -(rss / self.sigma2_ - n + 2 * df)
+
+        loglik = _loglik(estimator, X, y)
+        if self.criterion == 'aic':
+            penalty = 2 * df
+        else:
+            penalty = np.log(n) * df
+        return -(-2 * loglik + penalty)
+
+    def __repr__(self):
+        return 'ICScorer(%r, sigma2=%r)' % (self.criterion, self.sigma2)
+
+    def estimate_sigma2(self, estimator, X, y, **fit_params):
+        """
+        Copy of this scorer with `sigma2_` set (if `sigma2`
+        is None) to the residual variance of `estimator` fit
+        to `X` (typically all columns). This scorer is left
+        unchanged, as it may be shared between selectors.
+        """
+        scorer = copy.copy(self)
+        if self.sigma2 is not None:
+            scorer.sigma2_ = self.sigma2
+            return scorer
+        estimator.fit(X, y, **fit_params)
+        n = X.shape[0]
+        df = _degrees_of_freedom(estimator, X)
+        if n <= df:
+            raise ValueError('cannot estimate sigma2 with %d samples and '
+                             '%d degrees of freedom' % (n, df))
+        scorer.sigma2_ = _rss(estimator, X, y) / (n - df)
+        return scorer
+
+
+IC_SCORERS = {'neg_aic': 'aic',
+              'neg_bic': 'bic',
+              'neg_mallows_cp': 'cp'}
+
+
+def get_ic_scorer(scoring):
+    """
+    `ICScorer` for the names in `IC_SCORERS`
+    ('neg_aic', 'neg_bic', 'neg_mallows_cp'), else None.
+    """
+    if scoring in IC_SCORERS:
+        return ICScorer(IC_SCORERS[scoring])
+    return None
+
+
+# private functions
+
+def _degrees_of_freedom(estimator, X):
+
+    n_columns = X.shape[1]
+    if n_columns == 1:
+        if sparse.issparse(X):
+            empty = X.count_nonzero() == 0
+        else:
+            empty = not np.any(np.asarray(X) != 0)
+        if empty:
+            n_columns = 0
+
+    if hasattr(estimator, 'fit_intercept'):
+        intercept = int(bool(estimator.fit_intercept))
+    else:
+        intercept = int(hasattr(estimator, 'b_'))
+
+    if getattr(estimator, 'coef_', None) is not None:
+        coef = np.asarray(estimator.coef_)
+        n_outputs = coef.shape[0] if coef.ndim == 2 else 1
+    elif getattr(estimator, 'w_', None) is not None:
+        coef = np.asarray(estimator.w_)
+        n_outputs = coef.shape[1] if coef.ndim == 2 else 1
+    else:
+        n_outputs = 1
+
+    return (n_columns + intercept) * n_outputs
+
+
+def _rss(estimator, X, y):
+    resid = np.asarray(y, float) - np.asarray(estimator.predict(X), float)
+    return np.sum(resid**2)
+
+
+def _loglik(estimator, X, y):
+    if hasattr(estimator, 'predict_proba'):
+        proba = estimator.predict_proba(X)
+        labels = getattr(estimator, 'classes_', np.arange(proba.shape[1]))
+        return -log_loss(y, proba, labels=labels, normalize=False)
+    n = X.shape[0]
+    rss = _rss(estimator, X, y)
+    return -n / 2 * (np.log(2 * np.pi * rss / n) + 1)
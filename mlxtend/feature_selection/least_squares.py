@@ -0,0 +1,552 @@
+# Jonathan Taylor 2021
+# mlxtend Machine Learning Library Extensions
+#
+# Scoring backends for least squares feature selection
+# Author: Jonathan Taylor <jonathan.taylor@stanford.edu>
+#
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import solve_triangular
+from sklearn.linear_model import LinearRegression, Ridge
+
+
+class IncrementalLeastSquares(object):
+
+    """
+    Scoring backend for `FeatureSelector` that scores
+    candidates differing from the current state by one
+    `Column` through updates of per-fold QR factors
+    of the current state instead of refitting.
+
+    Adding a column costs O(n*p) per fold rather than
+    the O(n*p^2) of a refit. Scores agree with those of
+    `cross_val_score` for `LinearRegression` with the
+    'r2' or 'neg_mean_squared_error' scorers.
+
+    Parameters
+    ----------
+    tol: float (default: 1e-10)
+        Relative tolerance used to detect rank deficient
+        designs. Candidates whose design is (numerically)
+        rank deficient are refit with `np.linalg.lstsq`.
+
+    Notes
+    -----
+    Candidates that are neither a single addition to
+    nor a single deletion from the current state
+    are scored from scratch.
+
+    """
+
+    def __init__(self, tol=1e-10):
+        self.tol = tol
+
+    def setup(self,
+              estimator,
+              scoring,
+              X,
+              y,
+              splits,
+              build_submodel,
+              **fit_params):
+        """
+        Prepare to score candidates for one call to `fit`.
+
+        Parameters
+        ----------
+        estimator: LinearRegression
+            Estimator whose cross-validated scores
+            are to be reproduced.
+        scoring: str or None
+            One of 'r2' (the default if None)
+            or 'neg_mean_squared_error'.
+        X: array-like
+            Data passed to `build_submodel`.
+        y: array-like, shape = [n_samples]
+            Target values.
+        splits: list or None
+            List of (train, test) indices. If None,
+            models are fit and scored on all samples.
+        build_submodel: callable
+            Callable taking two arguments `(X, state)`
+            that returns model matrix represented by `state`.
+        fit_params: various
+            Not supported, present for a uniform interface.
+
+        Returns
+        -------
+        self: object
+
+        """
+
+        _check_least_squares(estimator, scoring, fit_params)
+        self.fit_intercept_ = estimator.get_params()['fit_intercept']
+        self.scoring_ = scoring or 'r2'
+
+        self.X_ = X
+        self.y_ = np.asarray(y, float)
+        n = self.y_.shape[0]
+        if splits is None:
+            splits = [(np.arange(n), np.arange(n))]
+        self.splits_ = splits
+        self.build_submodel_ = build_submodel
+
+        self._blocks = {}
+        self._current = (None, None)
+        return self
+
+    def score_batch(self, cur_state, candidates):
+        """
+        Score a batch of candidates.
+
+        Parameters
+        ----------
+        cur_state: tuple or None
+            Current state of the search.
+        candidates: iterable
+            States to score.
+
+        Returns
+        -------
+        results: list
+            List of `(state, scores)` with one score per fold.
+        """
+
+        results = []
+        factors = None
+        if cur_state is not None:
+            factors = self._factors(cur_state)
+
+        for state in candidates:
+            scores = None
+            if factors is not None:
+                added = [c for c in state if c not in cur_state]
+                dropped = [c for c in cur_state if c not in state]
+                if len(added) == 1 and not dropped:
+                    scores = self._score_forward(factors, added[0])
+                elif len(dropped) == 1 and not added:
+                    scores = self._score_backward(cur_state,
+                                                  factors,
+                                                  dropped[0])
+            if scores is None:
+                scores = self._score_direct(state)
+            results.append((state, scores))
+        return results
+
+    # private methods
+
+    def _block(self, col):
+        if col not in self._blocks:
+            block = self.build_submodel_(self.X_, (col,))
+            if sparse.issparse(block):
+                block = block.toarray()
+            self._blocks[col] = np.asarray(block, float)
+        return self._blocks[col]
+
+    def _design(self, state):
+        n = self.y_.shape[0]
+        blocks = [self._block(col) for col in state]
+        if self.fit_intercept_:
+            blocks.insert(0, np.ones((n, 1)))
+        if blocks:
+            return np.column_stack(blocks)
+        return np.zeros((n, 0))
+
+    def _factors(self, state):
+        """
+        QR factors of the design of `state` for each fold,
+        or None if any of them is rank deficient.
+        """
+        if self._current[0] != state:
+            Z = self._design(state)
+            factors = []
+            for train, test in self.splits_:
+                factor = _qr_fit(Z[train],
+                                 Z[test],
+                                 self.y_[train],
+                                 self.tol)
+                if factor is None:
+                    factors = None
+                    break
+                factors.append(factor)
+            self._current = (state, factors)
+        return self._current[1]
+
+    def _score_forward(self, factors, col):
+        B = self._block(col)
+        scores = []
+        for (train, test), F in zip(self.splits_, factors):
+            B_tr, B_te = B[train], B[test]
+            C = F.Q.T.dot(B_tr)
+            B_perp = B_tr - F.Q.dot(C)
+            sv = np.linalg.svd(B_perp, compute_uv=False)
+            scale = max(np.linalg.norm(B_tr), 1)
+            if sv.shape[0] < B.shape[1] or sv.min() <= self.tol * scale:
+                return None
+            gamma = np.linalg.lstsq(B_perp, F.resid, rcond=None)[0]
+            A = F.Rinv.dot(C)
+            pred = F.pred + (B_te - F.Z_te.dot(A)).dot(gamma)
+            scores.append(_score(self.scoring_, self.y_[test], pred))
+        return np.array(scores)
+
+    def _score_backward(self, cur_state, factors, col):
+        # position of `col` in the design of `cur_state`
+        start = int(self.fit_intercept_)
+        for c in cur_state:
+            if c == col:
+                break
+            start += self._block(c).shape[1]
+        drop = np.arange(start, start + self._block(col).shape[1])
+
+        scores = []
+        for (train, test), F in zip(self.splits_, factors):
+            keep = np.ones(F.beta.shape[0], bool)
+            keep[drop] = False
+            beta = (F.beta[keep] -
+                    F.Ginv[keep][:, drop].dot(
+                        np.linalg.solve(F.Ginv[drop][:, drop],
+                                        F.beta[drop])))
+            pred = F.Z_te[:, keep].dot(beta)
+            scores.append(_score(self.scoring_, self.y_[test], pred))
+        return np.array(scores)
+
+    def _score_direct(self, state):
+        Z = self._design(state)
+        scores = []
+        for train, test in self.splits_:
+            if Z.shape[1] > 0:
+                beta = np.linalg.lstsq(Z[train],
+                                       self.y_[train],
+                                       rcond=None)[0]
+                pred = Z[test].dot(beta)
+            else:
+                pred = np.zeros(len(test))
+            scores.append(_score(self.scoring_, self.y_[test], pred))
+        return np.array(scores)
+
+
+class GramLeastSquares(object):
+
+    """
+    Scoring backend for `FeatureSelector` that scores
+    subsets from per-fold sufficient statistics
+    (centered X^TX, X^Ty and y^Ty on the training
+    and test rows), computed once in `setup`.
+
+    Subsets are solved in vectorised batches grouped by
+    the number of design columns, so no estimator is refit.
+    This makes exhaustive search over 25-30 features tractable.
+    Scores agree with those of `cross_val_score` for
+    `LinearRegression` or `Ridge` with the
+    'r2' or 'neg_mean_squared_error' scorers.
+
+    Parameters
+    ----------
+    batch_size: int (default: 4096)
+        Number of subsets solved together.
+
+    Notes
+    -----
+    Requires a strategy whose `build_submodel` is a `DesignStore`
+    so that all columns of the design are known in `setup`.
+
+    """
+
+    def __init__(self, batch_size=4096):
+        self.batch_size = batch_size
+
+    def setup(self,
+              estimator,
+              scoring,
+              X,
+              y,
+              splits,
+              build_submodel,
+              **fit_params):
+        """
+        Compute per-fold sufficient statistics.
+
+        Parameters
+        ----------
+        estimator: LinearRegression or Ridge
+            Estimator whose cross-validated scores
+            are to be reproduced.
+        scoring: str or None
+            One of 'r2' (the default if None)
+            or 'neg_mean_squared_error'.
+        X: np.ndarray
+            Encoded design built by `DesignStore.build_design`.
+        y: array-like, shape = [n_samples]
+            Target values.
+        splits: list or None
+            List of (train, test) indices. If None,
+            models are fit and scored on all samples.
+        build_submodel: DesignGather
+            Callable gathering submodels from `X`.
+        fit_params: various
+            Not supported, present for a uniform interface.
+
+        Returns
+        -------
+        self: object
+
+        """
+
+        _check_least_squares(estimator,
+                             scoring,
+                             fit_params,
+                             allowed=(LinearRegression, Ridge))
+        params = estimator.get_params()
+        self.fit_intercept_ = params['fit_intercept']
+        self.alpha_ = params.get('alpha', 0)
+        if np.asarray(self.alpha_).ndim > 0:
+            raise ValueError('alpha must be a scalar')
+        self.scoring_ = scoring or 'r2'
+
+        if not hasattr(build_submodel, 'column_index'):
+            raise ValueError('GramLeastSquares requires a strategy '
+                             'with a DesignStore as build_submodel')
+        self.column_index_ = build_submodel.column_index
+
+        if sparse.issparse(X):
+            D = sparse.csr_matrix(X, dtype=float)
+        else:
+            D = np.asarray(X, float)
+        y = np.asarray(y, float)
+        n = y.shape[0]
+        if splits is None:
+            splits = [(np.arange(n), np.arange(n))]
+
+        self.stats_ = [_fold_stats(D[train],
+                                   y[train],
+                                   D[test],
+                                   y[test],
+                                   self.fit_intercept_)
+                       for train, test in splits]
+        return self
+
+    def score_batch(self, cur_state, candidates):
+        """
+        Score a batch of candidates.
+
+        Parameters
+        ----------
+        cur_state: ignored
+        candidates: iterable
+            States to score.
+
+        Returns
+        -------
+        results: list
+            List of `(state, scores)` with one score per fold.
+        """
+
+        results = []
+        chunk = []
+        for state in candidates:
+            chunk.append(state)
+            if len(chunk) == self.batch_size:
+                results.extend(self._score_chunk(chunk))
+                chunk = []
+        if chunk:
+            results.extend(self._score_chunk(chunk))
+        return results
+
+    # private methods
+
+    def _score_chunk(self, states):
+
+        # group the states by their number of design columns
+
+        idx = [np.concatenate([self.column_index_[col] for col in state])
+               if state else np.zeros(0, np.intp) for state in states]
+        widths = np.array([i.shape[0] for i in idx])
+        scores = np.empty((len(states), len(self.stats_)))
+
+        for width in np.unique(widths):
+            which = np.nonzero(widths == width)[0]
+            cols = np.array([idx[j] for j in which],
+                            np.intp).reshape((which.shape[0], width))
+            for f, S in enumerate(self.stats_):
+                scores[which, f] = _score_subsets(S,
+                                                  cols,
+                                                  self.alpha_,
+                                                  self.scoring_)
+        return [(state, scores[i]) for i, state in enumerate(states)]
+
+
+class _FoldStats(NamedTuple):
+
+    """
+    Sufficient statistics of one fold. Training
+    quantities are centered at the training means
+    (if fitting an intercept), and so are the test rows.
+    """
+
+    XTX: np.ndarray
+    XTy: np.ndarray
+    WTW: np.ndarray
+    WTv: np.ndarray
+    vTv: float
+    SST: float
+    n_test: int
+
+
+class _QRFit(NamedTuple):
+
+    """
+    Least squares fit on one training fold
+    along with the QR factors used for updates.
+    """
+
+    Q: np.ndarray
+    Rinv: np.ndarray
+    Ginv: np.ndarray
+    beta: np.ndarray
+    resid: np.ndarray
+    Z_te: np.ndarray
+    pred: np.ndarray
+
+
+# private functions
+
+def _qr_fit(Z_tr, Z_te, y_tr, tol):
+    q = Z_tr.shape[1]
+    if q == 0:
+        return _QRFit(np.zeros((Z_tr.shape[0], 0)),
+                      np.zeros((0, 0)),
+                      np.zeros((0, 0)),
+                      np.zeros(0),
+                      y_tr.copy(),
+                      Z_te,
+                      np.zeros(Z_te.shape[0]))
+    if q > Z_tr.shape[0]:
+        return None
+    Q, R = np.linalg.qr(Z_tr)
+    diag = np.fabs(np.diag(R))
+    if diag.min() <= tol * diag.max():
+        return None
+    Rinv = solve_triangular(R, np.identity(q))
+    Qty = Q.T.dot(y_tr)
+    beta = Rinv.dot(Qty)
+    return _QRFit(Q,
+                  Rinv,
+                  Rinv.dot(Rinv.T),
+                  beta,
+                  y_tr - Q.dot(Qty),
+                  Z_te,
+                  Z_te.dot(beta))
+
+
+def _fold_stats(X_tr, y_tr, X_te, y_te, fit_intercept):
+    if sparse.issparse(X_tr):
+        return _sparse_fold_stats(X_tr, y_tr, X_te, y_te, fit_intercept)
+    if fit_intercept:
+        X_mean, y_mean = X_tr.mean(0), y_tr.mean()
+        X_tr, y_tr = X_tr - X_mean, y_tr - y_mean
+        X_te, y_te_c = X_te - X_mean, y_te - y_mean
+    else:
+        y_te_c = y_te
+    return _FoldStats(X_tr.T.dot(X_tr),
+                      X_tr.T.dot(y_tr),
+                      X_te.T.dot(X_te),
+                      X_te.T.dot(y_te_c),
+                      (y_te_c**2).sum(),
+                      ((y_te - y_te.mean())**2).sum(),
+                      y_te.shape[0])
+
+
+def _sparse_fold_stats(X_tr, y_tr, X_te, y_te, fit_intercept):
+    """
+    `_fold_stats` for a sparse design: the products are
+    computed on the sparse matrices and centering is
+    applied to them as rank one corrections, so the
+    design is never densified.
+    """
+    XTX_tr = X_tr.T.dot(X_tr).toarray()
+    XTy_tr = X_tr.T.dot(y_tr)
+    XTX_te = X_te.T.dot(X_te).toarray()
+    if fit_intercept:
+        n_tr, n_te = X_tr.shape[0], X_te.shape[0]
+        X_mean = np.asarray(X_tr.mean(0)).ravel()
+        y_mean = y_tr.mean()
+        sum_te = np.asarray(X_te.sum(0)).ravel()
+        y_te_c = y_te - y_mean
+        XTX_tr -= n_tr * np.outer(X_mean, X_mean)
+        XTy_tr = XTy_tr - n_tr * X_mean * y_mean
+        XTX_te += (n_te * np.outer(X_mean, X_mean) -
+                   np.outer(sum_te, X_mean) -
+                   np.outer(X_mean, sum_te))
+        XTy_te = X_te.T.dot(y_te_c) - X_mean * y_te_c.sum()
+    else:
+        y_te_c = y_te
+        XTy_te = X_te.T.dot(y_te)
+    return _FoldStats(XTX_tr,
+                      XTy_tr,
+                      XTX_te,
+                      XTy_te,
+                      (y_te_c**2).sum(),
+                      ((y_te - y_te.mean())**2).sum(),
+                      y_te.shape[0])
+
+
+def _score_subsets(S, cols, alpha, scoring):
+    """
+    Scores on one fold for the subsets of design
+    columns given by rows of `cols`.
+    """
+    B, k = cols.shape
+    if k == 0:
+        SSE = np.full(B, S.vTv)
+    else:
+        G = S.XTX[cols[:, :, None], cols[:, None, :]]
+        if alpha:
+            G = G + alpha * np.identity(k)
+        b = S.XTy[cols]
+        try:
+            beta = np.linalg.solve(G, b[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            # minimum norm solutions as `np.linalg.lstsq`
+            beta = np.einsum('bij,bj->bi', np.linalg.pinv(G), b)
+        WTW = S.WTW[cols[:, :, None], cols[:, None, :]]
+        SSE = (S.vTv - 2 * (beta * S.WTv[cols]).sum(1) +
+               np.einsum('bi,bij,bj->b', beta, WTW, beta))
+    return _score_from_SSE(scoring, SSE, S.SST, S.n_test)
+
+
+def _score(scoring, y, pred):
+    resid = y - pred
+    return _score_from_SSE(scoring,
+                           np.array([(resid**2).sum()]),
+                           ((y - y.mean())**2).sum(),
+                           y.shape[0])[0]
+
+
+def _score_from_SSE(scoring, SSE, SST, n):
+    if scoring == 'neg_mean_squared_error':
+        return -SSE / n
+    # r2 -- follows `sklearn.metrics.r2_score` for constant `y`
+    if SST == 0:
+        return np.where(SSE == 0, 1., 0.)
+    return 1 - SSE / SST
+
+
+def _check_least_squares(estimator,
+                         scoring,
+                         fit_params,
+                         allowed=(LinearRegression,)):
+    if not isinstance(estimator, allowed):
+        raise ValueError('least squares scoring requires one of %s '
+                         'as estimator, got %s' %
+                         (str([a.__name__ for a in allowed]),
+                          str(estimator)))
+    if scoring not in [None, 'r2', 'neg_mean_squared_error']:
+        raise ValueError("least squares scoring supports scoring "
+                         "'r2' or 'neg_mean_squared_error', got %s" %
+                         str(scoring))
+    if fit_params:
+        raise ValueError('least squares scoring does not support '
+                         'fit_params, got %s' % str(list(fit_params)))
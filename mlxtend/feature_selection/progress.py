@@ -0,0 +1,101 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Progress reporting for FeatureSelector
+#
+# License: BSD 3 clause
+
+import sys
+import time
+
+import numpy as np
+
+
+class ProgressReporter(object):
+
+    """
+    Callback for `FeatureSelector` that writes the progress
+    of each batch, the best score seen so far and an
+    estimate of the time left in the current batch.
+
+    Parameters
+    ----------
+    stderr : bool (default: True)
+        Prints output to sys.stderr if True; uses sys.stdout otherwise.
+    every : int (default: 1)
+        Write a line every `every` completed candidates
+        (and always at the end of a batch).
+
+    Attributes
+    ----------
+    best_state : object
+        State with the best average score reported so far.
+    best_score : float
+        Best average score reported so far.
+    n_reported : int
+        Total number of candidates reported.
+    start_time : float
+        The system's time in seconds when the first candidate completed.
+
+    Examples
+    --------
+    >>> reporter = ProgressReporter()
+    >>> selector = FeatureSelector(estimator,
+    ...                            strategy,
+    ...                            callback=reporter)
+    >>> selector.fit(X, y)
+    Iteration 2: 7/7 | best 0.5313 | 3 sec elapsed | ETA 0 sec
+
+    """
+
+    def __init__(self, stderr=True, every=1):
+        if stderr:
+            self.stream = sys.stderr
+        else:
+            self.stream = sys.stdout
+        self.every = every
+
+        self.best_state = None
+        self.best_score = -np.inf
+        self.n_reported = 0
+        self.start_time = None
+        self._batch_start = None
+
+    def __call__(self, state, iteration, scores, n_done, n_total):
+
+        now = time.time()
+        if self.start_time is None:
+            self.start_time = now
+        if n_done == 1 or self._batch_start is None:
+            self._batch_start = now
+
+        self.n_reported += 1
+        avg_score = np.nanmean(scores)
+        if avg_score > self.best_score:
+            self.best_state = state
+            self.best_score = avg_score
+
+        if n_done % self.every == 0 or n_done == n_total:
+
+            # time per candidate within the current batch
+            # gives the estimate of the time remaining
+
+            elapsed = now - self.start_time
+            if n_done > 1:
+                rate = (now - self._batch_start) / (n_done - 1)
+            else:
+                rate = 0
+            eta = rate * (n_total - n_done)
+
+            self.stream.write('\rIteration %d: %d/%d | best %.4f | '
+                              '%d sec elapsed | ETA %d sec' %
+                              (iteration,
+                               n_done,
+                               n_total,
+                               self.best_score,
+                               elapsed,
+                               eta))
+            if n_done == n_total:
+                self.stream.write('\n')
+            self.stream.flush()
+
+        return False
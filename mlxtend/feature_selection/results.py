@@ -0,0 +1,379 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Compact storage of the states scored by FeatureSelector
+#
+# License: BSD 3 clause
+
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class ResultsStore(object):
+
+    """
+    Columnar store of `(state, iteration, scores)` results.
+
+    Each state is stored as a packed bitmask over the column
+    identifiers, alongside a float matrix of scores and arrays
+    of iterations and state sizes, rather than as a list
+    of Python tuples. Iterating over the store yields the
+    original `(state, iteration, scores)` tuples.
+
+    Parameters
+    ----------
+    columns: sequence or None (default: None)
+        Column identifiers that may appear in states, in the
+        order states list them. Identifiers not given here are
+        added as they are first seen.
+
+    Attributes
+    ----------
+    columns: list
+        Column identifiers, in bit order.
+    """
+
+    def __init__(self, columns=None):
+
+        self.columns = []
+        self._bit = {}
+        for col in (columns if columns is not None else []):
+            self._add_column(col)
+
+        self._n = 0
+        self._masks = np.zeros((0, self._n_bytes()), np.uint8)
+        self._scores = np.zeros((0, 0), float)
+        self._n_scores = np.zeros(0, np.intp)
+        self._avg_scores = np.zeros(0, float)
+        self._iterations = np.zeros(0, np.intp)
+        self._sizes = np.zeros(0, np.intp)
+
+        # states whose tuple is not their columns in bit
+        # order (or that repeat a column) are kept as is
+
+        self._irregular = {}
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        for row in range(self._n):
+            yield self[row]
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._n
+        if not 0 <= row < self._n:
+            raise IndexError('row %d out of range' % row)
+        return (self.state(row),
+                int(self._iterations[row]),
+                self._scores[row, :self._n_scores[row]].copy())
+
+    def append(self, result):
+        """
+        Add a single `(state, iteration, scores)`.
+        """
+        self.extend([result])
+
+    def extend(self, results):
+        """
+        Add an iterable of `(state, iteration, scores)`,
+        or the results of another `ResultsStore`.
+        """
+
+        if isinstance(results, ResultsStore):
+            for start in range(0, len(results), _CHUNK_SIZE):
+                stop = min(start + _CHUNK_SIZE, len(results))
+                self.extend(zip(results.states(start, stop),
+                                results.iterations[start:stop],
+                                [results[row][2] for row in
+                                 range(start, stop)]))
+            return
+
+        results = list(results)
+        if not results:
+            return
+
+        for state, _, _ in results:
+            for col in state:
+                if col not in self._bit:
+                    self._add_column(col)
+
+        n_new = len(results)
+        width = max([np.size(scores) for _, _, scores in results])
+        self._reserve(self._n + n_new, width)
+
+        bits = np.zeros((n_new, len(self.columns)), bool)
+        for i, (state, iteration, scores) in enumerate(results):
+            row = self._n + i
+            idx = [self._bit[col] for col in state]
+            bits[i, idx] = True
+            if not isinstance(state, tuple) or idx != sorted(set(idx)):
+                self._irregular[row] = state
+            scores = np.ravel(np.asarray(scores, float))
+            self._scores[row, :scores.shape[0]] = scores
+            self._n_scores[row] = scores.shape[0]
+            self._avg_scores[row] = _row_nanmean(scores[None, :])[0]
+            self._iterations[row] = iteration
+            self._sizes[row] = len(idx)
+
+        self._masks[self._n:self._n + n_new] = np.packbits(bits, axis=1)
+        self._n += n_new
+
+    def take(self, rows):
+        """
+        New store holding the results in `rows`.
+        """
+
+        rows = np.asarray(rows, np.intp)
+        taken = ResultsStore(self.columns)
+        n = rows.shape[0]
+        taken._reserve(n, self._scores.shape[1])
+        taken._masks[:n] = self._masks[rows]
+        taken._scores[:n] = self._scores[rows]
+        for name in ['_n_scores', '_avg_scores', '_iterations', '_sizes']:
+            getattr(taken, name)[:n] = getattr(self, name)[rows]
+        taken._irregular = dict([(i, self._irregular[row])
+                                 for i, row in enumerate(rows.tolist())
+                                 if row in self._irregular])
+        taken._n = n
+        return taken
+
+    def state(self, row):
+        """
+        The state stored in `row`.
+        """
+        if row in self._irregular:
+            return self._irregular[row]
+        bits = np.unpackbits(self._masks[row])[:len(self.columns)]
+        return tuple([self.columns[i] for i in np.nonzero(bits)[0]])
+
+    def states(self, start=0, stop=None):
+        """
+        The states stored in rows `start` to `stop`,
+        unpacking their bitmasks together.
+        """
+
+        stop = self._n if stop is None else min(stop, self._n)
+        if stop <= start:
+            return []
+
+        bits = np.unpackbits(self._masks[start:stop],
+                             axis=1)[:, :len(self.columns)]
+        columns = np.empty(len(self.columns), object)
+        for i, col in enumerate(self.columns):
+            columns[i] = col
+        names = columns[np.nonzero(bits)[1]].tolist()
+        ends = np.cumsum(bits.sum(1)).tolist()
+
+        states, begin = [], 0
+        for end in ends:
+            states.append(tuple(names[begin:end]))
+            begin = end
+        for row, state in self._irregular.items():
+            if start <= row < stop:
+                states[row - start] = state
+        return states
+
+    @property
+    def masks(self):
+        """
+        Packed bitmasks of the states, one row per result.
+        """
+        return self._masks[:self._n]
+
+    @property
+    def scores(self):
+        """
+        Scores of each result, padded with NaN to equal length.
+        """
+        return self._scores[:self._n]
+
+    @property
+    def n_scores(self):
+        """
+        Number of scores of each result.
+        """
+        return self._n_scores[:self._n]
+
+    @property
+    def iterations(self):
+        return self._iterations[:self._n]
+
+    @property
+    def sizes(self):
+        """
+        Number of columns in each state.
+        """
+        return self._sizes[:self._n]
+
+    @property
+    def avg_scores(self):
+        """
+        Average score of each result, ignoring NaN.
+        """
+        return self._avg_scores[:self._n]
+
+    def view(self):
+        """
+        Mapping from each state (as a tuple) to
+        its average score, keeping the last result
+        for states scored more than once.
+        """
+        return ResultsView(self)
+
+    # private methods
+
+    def _n_bytes(self):
+        return (len(self.columns) + 7) // 8
+
+    def _add_column(self, col):
+        self._bit[col] = len(self.columns)
+        self.columns.append(col)
+        if hasattr(self, '_masks') and self._masks.shape[1] < self._n_bytes():
+            masks = np.zeros((self._masks.shape[0], self._n_bytes()), np.uint8)
+            masks[:, :self._masks.shape[1]] = self._masks
+            self._masks = masks
+
+    def _reserve(self, n, width):
+        """
+        Grow the arrays (by doubling) to hold `n` rows
+        of at least `width` scores.
+        """
+
+        capacity = self._masks.shape[0]
+        if n > capacity:
+            capacity = max(n, 2 * capacity, 16)
+        width = max(width, self._scores.shape[1])
+
+        if capacity > self._masks.shape[0] or width > self._scores.shape[1]:
+            masks = np.zeros((capacity, self._n_bytes()), np.uint8)
+            masks[:self._n] = self._masks[:self._n]
+            scores = np.full((capacity, width), np.nan)
+            scores[:self._n, :self._scores.shape[1]] = self._scores[:self._n]
+            self._masks, self._scores = masks, scores
+            for name in ['_n_scores', '_avg_scores', '_iterations', '_sizes']:
+                old = getattr(self, name)
+                new = np.zeros(capacity, old.dtype)
+                new[:self._n] = old[:self._n]
+                setattr(self, name, new)
+
+
+class ResultsView(Mapping):
+
+    """
+    Read-only mapping from state tuples to average scores,
+    backed by a `ResultsStore`. The index from states to rows
+    is only built when the view is first used.
+
+    Parameters
+    ----------
+    store: ResultsStore
+        Store of results.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._rows = None
+        self._n_indexed = 0
+
+    def __getitem__(self, state):
+        return self.store.avg_scores[self.rows[tuple(state)]]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    @property
+    def rows(self):
+        """
+        Dictionary from state tuples to
+        the last row of the store holding them.
+        """
+        if self._rows is None:
+            self._rows = {}
+            self._n_indexed = 0
+        n = len(self.store)
+        if n > self._n_indexed:
+            self._rows.update(zip(self.store.states(self._n_indexed, n),
+                                  range(self._n_indexed, n)))
+            self._n_indexed = n
+        return self._rows
+
+    def scores(self, state):
+        """
+        All scores of `state`.
+        """
+        return self.store[self.rows[tuple(state)]][2]
+
+
+def best_row(results):
+    """
+    Row of the result with the best average score
+    (the first, in case of ties) or None if there
+    are no results with a score.
+    """
+    if np.all(np.isnan(results.avg_scores)):
+        return None
+    avg_scores = np.where(np.isnan(results.avg_scores), -np.inf,
+                          results.avg_scores)
+    return int(np.argmax(avg_scores))
+
+
+def best_row_1sd(results):
+    """
+    Row of the result selected by the one standard
+    error rule: among the results with fewer columns than
+    the best result whose average score plus one standard
+    error reaches the best score, pick the best scoring of
+    the smallest ones. Falls back to the best result.
+    """
+
+    best = best_row(results)
+    if best is None:
+        return None
+
+    avg_scores = results.avg_scores
+    n_valid = np.sum(~np.isnan(results.scores), 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        limits = avg_scores + (_row_nanstd(results.scores) /
+                               np.sqrt(results.n_scores))
+    sizes = results.sizes
+
+    eligible = ((sizes < sizes[best]) &
+                (limits >= avg_scores[best]) &
+                (n_valid > 0))
+    if not np.any(eligible):
+        return best
+
+    shortest = eligible & (sizes == sizes[eligible].min())
+    return int(np.argmax(np.where(shortest, avg_scores, -np.inf)))
+
+
+# private functions
+
+# rows copied at a time from one store to another
+
+_CHUNK_SIZE = 4096
+
+
+def _row_nanmean(scores):
+    count = np.sum(~np.isnan(scores), 1)
+    total = np.nansum(scores, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def _row_nanstd(scores):
+    mean = _row_nanmean(scores)
+    count = np.sum(~np.isnan(scores), 1)
+    resid = np.nansum((scores - mean[:, None])**2, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0,
+                        np.sqrt(resid / np.maximum(count, 1)),
+                        np.nan)
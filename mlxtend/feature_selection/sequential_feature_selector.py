@@ -7,6 +7,7 @@
 # License: BSD 3 clause
 
 import datetime
+import time
 import types
 import numpy as np
 import scipy as sp
@@ -19,23 +20,35 @@ from sklearn.base import clone
 from sklearn.base import MetaEstimatorMixin
 from ..externals.name_estimators import _name_estimators
 from ..utils.base_compostion import _BaseXComposition
-from sklearn.model_selection import cross_val_score
-from joblib import Parallel, delayed
+from sklearn.model_selection import cross_validate
+from joblib import delayed, effective_n_jobs
+from ._parallel import _parallel_generator
+from .timing import (timed_call,
+                     phase,
+                     add_time,
+                     stamped,
+                     candidate_timing,
+                     timing_summary)
 
 
 def _calc_score(selector, X, y, indices, groups=None, **fit_params):
     if selector.cv:
-        scores = cross_val_score(selector.est_,
-                                 X, y,
-                                 groups=groups,
-                                 cv=selector.cv,
-                                 scoring=selector.scorer,
-                                 n_jobs=1,
-                                 pre_dispatch=selector.pre_dispatch,
-                                 fit_params=fit_params)
+        cv_results = cross_validate(selector.est_,
+                                    X, y,
+                                    groups=groups,
+                                    cv=selector.cv,
+                                    scoring=selector.scorer,
+                                    n_jobs=1,
+                                    pre_dispatch=selector.pre_dispatch,
+                                    fit_params=fit_params)
+        add_time('fit', np.sum(cv_results['fit_time']))
+        add_time('score', np.sum(cv_results['score_time']))
+        scores = cv_results['test_score']
     else:
-        selector.est_.fit(X, y, **fit_params)
-        scores = np.array([selector.scorer(selector.est_, X, y)])
+        with phase('fit'):
+            selector.est_.fit(X, y, **fit_params)
+        with phase('score'):
+            scores = np.array([selector.scorer(selector.est_, X, y)])
     return indices, scores
 
 
@@ -167,6 +180,15 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         correspond to the column names. Otherwise, the
         feature names are string representation of the feature
         array indices. The 'feature_names' is new in v 0.13.0.
+    timings_ : list
+        A `timing.CandidateTiming` for each feature subset
+        evaluated, with the seconds spent fitting, scoring,
+        on other work and waiting for dispatch and
+        serialisation (which includes slicing the columns
+        of the subset), the worker id and the step
+        of the selection. See `timing_summary`.
+    search_time_ : float
+        Elapsed seconds of `fit`.
 
     Examples
     -----------
@@ -310,6 +332,9 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         self.subsets_ = {}
         self.fitted = False
         self.interrupted_ = False
+        self.timings_ = []
+        self._step = 0
+        start_time = time.time()
         self.k_feature_idx_ = None
         self.k_feature_names_ = None
         self.k_score_ = None
@@ -399,8 +424,9 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
             if self.fixed_features is not None:
                 k_idx = self.fixed_features_
                 k = len(k_idx)
-                k_idx, k_score = _calc_score(self, X_[:, k_idx], y, k_idx,
-                                             groups=groups, **fit_params)
+                k_idx, k_score = self._timed_score(X_[:, k_idx], y, k_idx,
+                                                   groups=groups,
+                                                   **fit_params)
                 self.subsets_[k] = {
                     'feature_idx': k_idx,
                     'cv_scores': k_score,
@@ -415,8 +441,8 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
                 k_to_select = min_k
             k_idx = tuple(orig_set)
             k = len(k_idx)
-            k_idx, k_score = _calc_score(self, X_[:, k_idx], y, k_idx,
-                                         groups=groups, **fit_params)
+            k_idx, k_score = self._timed_score(X_[:, k_idx], y, k_idx,
+                                               groups=groups, **fit_params)
             self.subsets_[k] = {
                 'feature_idx': k_idx,
                 'cv_scores': k_score,
@@ -581,6 +607,7 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
 
         self.k_feature_idx_ = k_idx
         self.k_score_ = k_score
+        self.search_time_ = time.time() - start_time
         self.fitted = True
         self.subsets_, self.k_feature_names_ = \
             _get_featurenames(self.subsets_,
@@ -599,14 +626,21 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
         if remaining:
             features = len(remaining)
             n_jobs = min(self.n_jobs, features)
-            parallel = Parallel(n_jobs=n_jobs, verbose=self.verbose,
-                                pre_dispatch=self.pre_dispatch)
-            work = parallel(delayed(_calc_score)
-                            (self, X[:, tuple(subset | {feature})], y,
-                             tuple(subset | {feature}),
+            parallel = _parallel_generator(n_jobs=n_jobs,
+                                           verbose=self.verbose,
+                                           pre_dispatch=self.pre_dispatch)
+            self._step += 1
+            dispatched = []
+            candidates = [tuple(subset | {feature}) for feature in remaining
+                          if feature != ignore_feature]
+            work = parallel(delayed(timed_call)
+                            (_calc_score,
+                             self, X[:, new_subset], y,
+                             new_subset,
                              groups=groups, **fit_params)
-                            for feature in remaining
-                            if feature != ignore_feature)
+                            for new_subset in stamped(candidates,
+                                                      dispatched))
+            work = self._record_timings(work, candidates, dispatched)
 
             for new_subset, cv_scores in work:
                 all_avg_scores.append(np.nanmean(cv_scores))
@@ -629,13 +663,19 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
             all_subsets = []
             features = n
             n_jobs = min(self.n_jobs, features)
-            parallel = Parallel(n_jobs=n_jobs, verbose=self.verbose,
-                                pre_dispatch=self.pre_dispatch)
-            work = parallel(delayed(_calc_score)(self, X[:, p], y, p,
-                                                 groups=groups, **fit_params)
-                            for p in combinations(feature_set, r=n - 1)
-                            if not fixed_feature or
-                            fixed_feature.issubset(set(p)))
+            parallel = _parallel_generator(n_jobs=n_jobs,
+                                           verbose=self.verbose,
+                                           pre_dispatch=self.pre_dispatch)
+            self._step += 1
+            dispatched = []
+            candidates = [p for p in combinations(feature_set, r=n - 1)
+                          if not fixed_feature or
+                          fixed_feature.issubset(set(p))]
+            work = parallel(delayed(timed_call)(_calc_score,
+                                                self, X[:, p], y, p,
+                                                groups=groups, **fit_params)
+                            for p in stamped(candidates, dispatched))
+            work = self._record_timings(work, candidates, dispatched)
 
             for p, cv_scores in work:
 
@@ -649,6 +689,57 @@ class SequentialFeatureSelector(_BaseXComposition, MetaEstimatorMixin):
                    all_cv_scores[best])
         return res
 
+    def _timed_score(self, X, y, indices, groups=None, **fit_params):
+        """
+        `_calc_score` in the main process, adding its
+        timing to `timings_`.
+        """
+        dispatched = [time.time()]
+        work = [timed_call(_calc_score, self, X, y, indices,
+                           groups=groups, **fit_params)]
+        return list(self._record_timings(work, [indices], dispatched))[0]
+
+    def _record_timings(self, work, candidates, dispatched):
+        """
+        Pass on the results of `timed_call(_calc_score, ...)`
+        in `work`, adding their timings to `timings_`.
+        `dispatched` holds the dispatch time of each of
+        `candidates`, looked up by the subset each result
+        returns, so `work` may yield results in any order.
+        """
+        position = dict([(tuple(c), j) for j, c in enumerate(candidates)])
+        for result, task in work:
+            j = position[tuple(result[0])]
+            self.timings_.append(candidate_timing(result[0],
+                                                  self._step,
+                                                  [task],
+                                                  dispatched[j],
+                                                  time.time()))
+            yield result
+
+    def timing_summary(self, percentiles=(50, 90, 99)):
+        """Summarize where the time of the search was spent.
+
+        Parameters
+        ----------
+        percentiles : sequence of float (default: (50, 90, 99))
+            Percentiles of the per-subset times to report.
+
+        Returns
+        -------
+        summary : dict
+            Totals and percentiles of `timings_` for each
+            phase, the number of subsets each worker ran
+            and the parallel efficiency
+            (see `timing.timing_summary`).
+
+        """
+        self._check_fitted()
+        return timing_summary(self.timings_,
+                              self.search_time_,
+                              effective_n_jobs(self.n_jobs),
+                              percentiles)
+
     def transform(self, X):
         """Reduce X to its most important features.
 
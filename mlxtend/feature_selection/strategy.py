@@ -6,14 +6,23 @@
 # 
 
 from typing import NamedTuple, Any, Callable
+from numbers import Integral
 from itertools import chain, combinations
 from functools import partial
+from heapq import heappush, heappop, merge
+from bisect import bisect_left
+from math import comb
 
 import numpy as np
+from scipy import sparse
+from scipy.stats import f as f_dist, chi2 as chi2_dist
 from sklearn.utils import check_random_state
 
+from .results import ResultsStore, best_row
+from .subset_rank import n_subsets, subsets_in_range
 from .columns import (_get_column_info,
                      Column,
+                     ColumnStore,
                      _categorical_from_df,
                      _check_categories)
 
@@ -42,7 +51,128 @@ class Strategy(NamedTuple):
     check_finished: Callable
     postprocess: Callable
 
-      
+
+class DesignStore(object):
+
+    """
+    Callable `build_submodel` that can encode every
+    column of `X` once into a column-major design matrix
+    from which submodels are gathered by index.
+
+    Parameters
+    ----------
+    column_info: dict
+        Mapping from column identifiers to `Column` instances.
+    column_map: dict
+        Mapping from column identifiers to the range of
+        columns of the encoded design they occupy.
+    sparse_design: bool (default: False)
+        If True, model matrices are always built
+        as `scipy.sparse` CSC matrices.
+    """
+
+    def __init__(self,
+                 column_info,
+                 column_map,
+                 sparse_design=False):
+
+        self.column_info = column_info
+        self.column_map = column_map
+        self.sparse_design = sparse_design
+        self.column_index = {col: np.asarray(column_map[col], np.intp)
+                             for col in column_map}
+
+    def __call__(self, X, cols):
+        """
+        Build the model matrix for `cols`
+        by encoding the corresponding columns of `X`.
+        """
+        return _build_submodel(self.column_info,
+                               X,
+                               cols,
+                               self.sparse_design)
+
+    def build_design(self, X):
+        """
+        Encode all columns of `X` once. A `pd.DataFrame`
+        is first read into a `ColumnStore`, so encoding
+        does no pandas indexing.
+
+        Parameters
+        ----------
+        X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+            Training vectors.
+
+        Returns
+        -------
+        design: np.ndarray or sparse matrix
+            Fortran ordered array (a CSC matrix if
+            `self.sparse_design` or any encoded column
+            is sparse) holding the encoded
+            columns laid out as in `self.column_map`.
+        gather: DesignGather
+            Callable taking two arguments `(design, state)`
+            returning the submodel for `state`
+            as a single column gather from `design`.
+        """
+
+        if sparse.issparse(X):
+            X = X.tocsc()
+        elif hasattr(X, 'loc'):
+            X = ColumnStore(X)
+        blocks = [self.column_info[col].get_columns(X, fit=True)[0]
+                  for col in self.column_info]
+        design = _stack_columns(blocks, self.sparse_design)
+        if not sparse.issparse(design):
+            design = np.asfortranarray(design)
+        ncol = sum([len(self.column_index[col]) for col in self.column_index])
+        if design.shape[1] != ncol:
+            raise ValueError('encoded design has %d columns, expecting %d '
+                             'from column_map' % (design.shape[1], ncol))
+        return design, DesignGather(self.column_index)
+
+
+class DesignGather(object):
+
+    """
+    Callable taking two arguments `(design, state)`
+    that gathers the submodel for `state` from the
+    design built by `DesignStore.build_design`.
+
+    Parameters
+    ----------
+    column_index: dict
+        Mapping from column identifiers to their
+        column indices in the encoded design.
+    """
+
+    def __init__(self, column_index):
+        self.column_index = column_index
+
+    def __call__(self, design, cols):
+        return _gather_submodel(self.column_index, design, cols)
+
+
+class _Enumeration(object):
+
+    """
+    Candidates produced lazily by `make()` each time they
+    are iterated over, along with their number `n`, so that
+    `FeatureSelector` can score them a chunk at a time
+    without building the list of all candidates.
+    """
+
+    def __init__(self, make, n):
+        self.make = make
+        self.n = n
+
+    def __iter__(self):
+        return iter(self.make())
+
+    def __len__(self):
+        return self.n
+
+
 class MinMaxCandidates(object):
 
     def __init__(self,
@@ -51,7 +181,10 @@ class MinMaxCandidates(object):
                  max_features=1,
                  fixed_features=None,
                  custom_feature_names=None,
-                 categorical_features=None):
+                 categorical_features=None,
+                 rank_range=None,
+                 sparse_design=None,
+                 candidate_features=None):
         """
         Parameters
         ----------
@@ -84,10 +217,26 @@ class MinMaxCandidates(object):
             For each categorical feature, there must be at most `max_bins` unique
             categories, and each categorical value must be in [0, max_bins -1].
 
+        rank_range: (int, int) or None (default: None)
+            If not None, only the candidates with rank
+            `start <= rank < stop` in the full enumeration are
+            produced (see `n_candidates`), so that an exhaustive
+            search can be split into shards.
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
+
         """
 
         if hasattr(X, 'loc'):
-            X_ = X.values
+            # read the data frame once into a column store
+            X = X_ = ColumnStore(X)
             is_categorical, is_ordinal = _categorical_from_df(X)
             self.columns = X.columns
         else:
@@ -117,6 +266,10 @@ class MinMaxCandidates(object):
             raise AttributeError('min_features must be <= max_features')
 
         self.min_features, self.max_features = min_features, max_features
+        self.rank_range = rank_range
+        if sparse_design is None:
+            sparse_design = sparse.issparse(X)
+        self.sparse_design = sparse_design
 
         # make a mapping from the column info to columns in
         # implied design matrix
@@ -124,38 +277,74 @@ class MinMaxCandidates(object):
         self.column_info_ = _get_column_info(X,
                                              self.columns,
                                              is_categorical,
-                                             is_ordinal)
-        self.column_map_ = {}
-        idx = 0
-        for col in self.columns:
-            l = self.column_info_[col].columns
-            self.column_map_[col] = range(idx, idx +
-                                          len(l))
-            idx += len(l)
+                                             is_ordinal,
+                                             sparse_output=sparse_design)
         if (custom_feature_names is not None
                 and len(custom_feature_names) != nfeatures):
             raise ValueError('If custom_feature_names is not None, '
                              'the number of elements in custom_feature_names '
-                             'must equal %d the number of columns in X.' % idx)
+                             'must equal %d the number of columns in X.' % nfeatures)
         if custom_feature_names is not None:
             # recompute the Column info using custom_feature_names
             for i, col in enumerate(self.columns):
                 cur_col = self.column_info_[col]
                 new_name = custom_feature_names[i]
                 old_name = cur_col.name
-                self.column_info_[col] = Column(col,
-                                                new_name,
-                                                col.is_categorical,
-                                                col.is_ordinal,
-                                                tuple([n.replace(old_name,
-                                                                 new_name) for n in col.columns]),
-                                                col.encoder)
+                self.column_info_[col] = cur_col._replace(
+                    name=new_name,
+                    columns=tuple([n.replace(old_name,
+                                             new_name) for n in cur_col.columns]))
+
+        for name, features in [('fixed_features', fixed_features),
+                               ('candidate_features', candidate_features)]:
+            unknown = [f for f in (features if features is not None else [])
+                       if f not in self.column_info_]
+            if unknown:
+                raise ValueError('%s %s are not columns of X' % (name, str(unknown)))
 
         if fixed_features is not None:
             self.fixed_features = set([self.column_info_[f].idx for f in fixed_features])
         else:
             self.fixed_features = set([])
-            
+
+        # drop the columns that are neither candidates nor fixed
+
+        if candidate_features is not None:
+            keep = set([self.column_info_[f].idx for f in candidate_features])
+            keep |= self.fixed_features
+            self.columns = self.columns[np.array([col in keep for col in
+                                                  self.columns], bool)]
+            self.column_info_ = dict([(col, self.column_info_[col])
+                                      for col in self.columns])
+
+        self.column_map_ = {}
+        idx = 0
+        for col in self.columns:
+            l = self.column_info_[col].columns
+            self.column_map_[col] = range(idx, idx +
+                                          len(l))
+            idx += len(l)
+
+        # internally states are integer bitsets, bit i standing
+        # for the i-th column in sorted order so that decoding
+        # a bitset gives the sorted tuples used as states
+
+        try:
+            self._sorted_columns = sorted(self.columns)
+        except TypeError:
+            self._sorted_columns = list(self.columns)
+        self._rank = dict([(col, i) for i, col in
+                           enumerate(self._sorted_columns)])
+        self._column_bits = [(col, 1 << self._rank[col])
+                             for col in self.columns]
+        self._fixed_mask = self._encode(self.fixed_features)
+        self._position = dict([(col, i) for i, col in
+                               enumerate(self.columns)])
+        self._fixed_columns = [col for col in self.columns
+                               if col in self.fixed_features]
+        self._free_columns = [col for col in self.columns
+                              if col not in self.fixed_features]
+
     def candidate_states(self, state):
         """
         Produce candidates for fitting.
@@ -167,8 +356,9 @@ class MinMaxCandidates(object):
 
         Returns
         -------
-        candidates: iterator
-            A generator of (indices, label) where indices
+        candidates: iterable
+            A lazy iterable, with a length, of (indices, label)
+            where indices
             are columns of X and label is a name for the 
             given model. The iterator cycles through
             all combinations of columns of nfeature total
@@ -181,14 +371,42 @@ class MinMaxCandidates(object):
 
         """
 
-        def chain_(i):
-            return (c for c in combinations(self.columns, r=i)
-                    if self.fixed_features.issubset(c))
+        fixed = self._fixed_columns
+
+        if self.rank_range is not None:
+            free = self._free_columns
+            min_free, max_free = self._free_sizes()
+            start, stop = self.rank_range
+            stop = min(stop, self.n_candidates())
+            return _Enumeration(
+                lambda: (tuple(merge(fixed,
+                                     [free[i] for i in c],
+                                     key=self._position.__getitem__))
+                         for c in subsets_in_range(len(free),
+                                                   min_free,
+                                                   max_free,
+                                                   start,
+                                                   stop)),
+                max(stop - start, 0))
+
+        # combinations of the free columns merged with
+        # the fixed ones rather than filtering combinations
+        # of all columns
 
-        candidates = chain.from_iterable(chain_(i) for i in
-                                         range(self.min_features,
-                                               self.max_features+1))
-        return candidates
+        def chain_(i):
+            if i < len(fixed):
+                return iter([])
+            if not fixed:
+                return combinations(self.columns, r=i)
+            return (tuple(merge(fixed, c, key=self._position.__getitem__))
+                    for c in combinations(self._free_columns,
+                                          r=i - len(fixed)))
+
+        return _Enumeration(
+            lambda: chain.from_iterable(chain_(i) for i in
+                                        range(self.min_features,
+                                              self.max_features+1)),
+            self.n_candidates())
         
     def check_finished(self,
                        results,
@@ -211,9 +429,50 @@ class MinMaxCandidates(object):
 
         return new_best, True
 
+    def n_candidates(self):
+        """
+        Number of candidates in the full enumeration
+        (ignoring `rank_range`).
+        """
+        min_free, max_free = self._free_sizes()
+        if max_free < min_free:
+            return 0
+        return n_subsets(len(self._free_columns), min_free, max_free)
+
+    def _free_sizes(self):
+        """
+        Range of the number of non-fixed columns in candidates.
+        """
+        n_fixed = len(self._fixed_columns)
+        return (max(self.min_features - n_fixed, 0),
+                self.max_features - n_fixed)
+
+    def _encode(self, state):
+        """
+        Integer bitset of the columns in `state`.
+        """
+        mask = 0
+        for col in state:
+            mask |= 1 << self._rank[col]
+        return mask
+
+    def _insert(self, cols, ranks, col):
+        """
+        Sorted tuple of `cols` (with sorted
+        ranks `ranks`) and `col`.
+        """
+        j = bisect_left(ranks, self._rank[col])
+        return tuple(cols[:j] + [col] + cols[j:])
+
 
 class Stepwise(MinMaxCandidates):
 
+    # candidates depend on the state passed to `candidate_states`
+    # alone, so those of a step can be proposed before the previous
+    # step is finished (see `FeatureSelector(speculative=True)`)
+
+    speculative = True
+
     def __init__(self,
                  X,
                  direction,
@@ -221,7 +480,9 @@ class Stepwise(MinMaxCandidates):
                  max_features=1,
                  fixed_features=None,
                  custom_feature_names=None,
-                 categorical_features=None):
+                 categorical_features=None,
+                 sparse_design=None,
+                 candidate_features=None):
         """
         Parameters
         ----------
@@ -256,6 +517,16 @@ class Stepwise(MinMaxCandidates):
             For each categorical feature, there must be at most `max_bins` unique
             categories, and each categorical value must be in [0, max_bins -1].
 
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
+
         """
 
         self.direction = direction
@@ -266,7 +537,9 @@ class Stepwise(MinMaxCandidates):
                                   max_features,
                                   fixed_features,
                                   custom_feature_names,
-                                  categorical_features)
+                                  categorical_features,
+                                  sparse_design=sparse_design,
+                                  candidate_features=candidate_features)
             
     def candidate_states(self, state):
         """
@@ -290,8 +563,9 @@ class Stepwise(MinMaxCandidates):
 
         Returns
         -------
-        candidates: iterator
-            A generator of (indices, label) where indices
+        candidates: iterable
+            A lazy iterable, with a length, of (indices, label)
+            where indices
             are columns of X and label is a name for the 
             given model. The iterator cycles through
             all combinations of columns of nfeature total
@@ -304,16 +578,28 @@ class Stepwise(MinMaxCandidates):
 
         """
 
-        state = set(state)
-        if len(state) < self.max_features: # union
-            forward = (tuple(sorted(state | set([c]))) for c in self.columns if (c not in state and
-                                                                self.fixed_features.issubset(state | set([c]))))
+        mask = self._encode(state)
+        ranks = sorted([self._rank[c] for c in set(state)])
+        cols = [self._sorted_columns[r] for r in ranks]
+        missing = self._fixed_mask & ~mask
+
+        if len(ranks) < self.max_features: # union
+            if not missing:
+                added = [c for c, bit in self._column_bits if not mask & bit]
+            elif not missing & (missing - 1):
+                # a single fixed column is missing: only it can be added
+                added = [self._sorted_columns[missing.bit_length() - 1]]
+            else:
+                added = []
+            forward = (self._insert(cols, ranks, c) for c in added)
         else:
             forward = []
 
-        if len(state) > self.min_features: # symmetric difference
-            backward = (tuple(sorted(state ^ set([c]))) for c in self.columns if (c in state and
-                                                                   self.fixed_features.issubset(state ^ set([c]))))
+        if len(ranks) > self.min_features and not missing: # symmetric difference
+            dropped = [bisect_left(ranks, self._rank[c])
+                       for c, bit in self._column_bits
+                       if mask & bit and not self._fixed_mask & bit]
+            backward = (tuple(cols[:j] + cols[j+1:]) for j in dropped)
         else:
             backward = []
 
@@ -333,7 +619,9 @@ class Stepwise(MinMaxCandidates):
                    initial_features=[],
                    custom_feature_names=None,
                    categorical_features=None,
-                   parsimonious=True):
+                   parsimonious=True,
+                   sparse_design=None,
+                   candidate_features=None):
         """
         Strategy that stops when no improvement
         in score is possible.
@@ -377,6 +665,15 @@ class Stepwise(MinMaxCandidates):
             If True, use the 1sd rule: among the shortest models
             within one standard deviation of the best score
             pick the one with the best average score. 
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
 
         Returns
         -------
@@ -391,20 +688,23 @@ class Stepwise(MinMaxCandidates):
                         max_features,
                         fixed_features,
                         custom_feature_names,
-                        categorical_features)
+                        categorical_features,
+                        sparse_design=sparse_design,
+                        candidate_features=candidate_features)
 
         # if any categorical features or an intercept
         # is included then we must
         # create a new design matrix
 
-        build_submodel = partial(_build_submodel, step.column_info_)
+        build_submodel = DesignStore(step.column_info_,
+                                     step.column_map_,
+                                     step.sparse_design)
 
         # pick an initial state
 
         initial_state = tuple(initial_features)
 
-        if not step.fixed_features.issubset(initial_features):
-            raise ValueError('initial_features should contain %s' % str(step.fixed_features))
+        _check_initial_features(step, initial_features)
 
         if not parsimonious:
             _postprocess = _postprocess_best
@@ -427,7 +727,9 @@ class Stepwise(MinMaxCandidates):
                    initial_features=[],
                    custom_feature_names=None,
                    categorical_features=None,
-                   parsimonious=True):
+                   parsimonious=True,
+                   sparse_design=None,
+                   candidate_features=None):
         """
         Strategy that stops first time
         a given model size is reached.
@@ -471,6 +773,15 @@ class Stepwise(MinMaxCandidates):
             If True, use the 1sd rule: among the shortest models
             within one standard deviation of the best score
             pick the one with the best average score. 
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
 
         Returns
         -------
@@ -485,20 +796,23 @@ class Stepwise(MinMaxCandidates):
                         max_features,
                         fixed_features,
                         custom_feature_names,
-                        categorical_features)
+                        categorical_features,
+                        sparse_design=sparse_design,
+                        candidate_features=candidate_features)
 
         # if any categorical features or an intercept
         # is included then we must
         # create a new design matrix
 
-        build_submodel = partial(_build_submodel, step.column_info_)
+        build_submodel = DesignStore(step.column_info_,
+                                     step.column_map_,
+                                     step.sparse_design)
 
         # pick an initial state
 
         initial_state = tuple(initial_features)
 
-        if not step.fixed_features.issubset(initial_features):
-            raise ValueError('initial_features should contain %s' % str(step.fixed_features))
+        _check_initial_features(step, initial_features)
 
         if not parsimonious:
             _postprocess = _postprocess_best
@@ -513,179 +827,1241 @@ class Stepwise(MinMaxCandidates):
     
 
 
-def exhaustive(X,
-               min_features=1,
-               max_features=1,
-               fixed_features=None,
-               custom_feature_names=None,
-               categorical_features=None,
-               parsimonious=True):
-    """
-    Parameters
-    ----------
-    X: {array-like, sparse matrix}, shape = [n_samples, n_features]
-        Training vectors, where n_samples is the number of samples and
-        n_features is the number of features.
-        New in v 0.13.0: pandas DataFrames are now also accepted as
-        argument for X.
-    min_features: int (default: 1)
-        Minumum number of features to select
-    max_features: int (default: 1)
-        Maximum number of features to select
-    fixed_features: column identifiers, default=None
-        Subset of features to keep. Stored as `self.columns[fixed_features]`
-        where `self.columns` will correspond to columns if X is a `pd.DataFrame`
-        or an array of integers if X is an `np.ndarray`
-    custom_feature_names: None or tuple (default: tuple)
-            Custom feature names for `self.k_feature_names` and
-            `self.subsets_[i]['feature_names']`.
-            (new in v 0.13.0)
-    categorical_features: array-like of {bool, int} of shape (n_features) 
-            or shape (n_categorical_features,), default=None.
-        Indicates the categorical features.
-
-        - None: no feature will be considered categorical.
-        - boolean array-like: boolean mask indicating categorical features.
-        - integer array-like: integer indices indicating categorical
-          features.
-
-        For each categorical feature, there must be at most `max_bins` unique
-        categories, and each categorical value must be in [0, max_bins -1].
+class BeamSearch(Stepwise):
 
-    parsimonious: bool
-        If True, use the 1sd rule: among the shortest models
-        within one standard deviation of the best score
-        pick the one with the best average score. 
+    # candidates depend on the beam and the states visited
 
-    Returns
-    -------
+    speculative = False
 
-    initial_state: tuple
-        (column_names, feature_idx)
+    def __init__(self,
+                 X,
+                 direction,
+                 beam_width=5,
+                 min_features=1,
+                 max_features=1,
+                 fixed_features=None,
+                 custom_feature_names=None,
+                 categorical_features=None,
+                 sparse_design=None,
+                 candidate_features=None):
+        """
+        Parameters
+        ----------
+        X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+            Training vectors, where n_samples is the number of samples and
+            n_features is the number of features.
+            New in v 0.13.0: pandas DataFrames are now also accepted as
+            argument for X.
+        direction: str
+            One of ['forward', 'backward', 'both']
+        beam_width: int (default: 5)
+            Number of states kept after each step.
+        min_features: int (default: 1)
+            Minumum number of features to select
+        max_features: int (default: 1)
+            Maximum number of features to select
+        fixed_features: column identifiers, default=None
+            Subset of features to keep. Stored as `self.columns[fixed_features]`
+            where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+            or an array of integers if X is an `np.ndarray`
+        custom_feature_names: None or tuple (default: tuple)
+                Custom feature names for `self.k_feature_names` and
+                `self.subsets_[i]['feature_names']`.
+                (new in v 0.13.0)
+        categorical_features: array-like of {bool, int} of shape (n_features) 
+                or shape (n_categorical_features,), default=None.
+            Indicates the categorical features.
 
-    state_generator: callable
-        Object that proposes candidates
-        based on current state. Takes a single 
-        argument `state`
+            - None: no feature will be considered categorical.
+            - boolean array-like: boolean mask indicating categorical features.
+            - integer array-like: integer indices indicating categorical
+              features.
 
-    build_submodel: callable
-        Candidate generator that enumerate
-        all valid subsets of columns.
+            For each categorical feature, there must be at most `max_bins` unique
+            categories, and each categorical value must be in [0, max_bins -1].
 
-    check_finished: callable
-        Check whether to stop. Takes two arguments:
-        `best_result` a dict with keys ['scores', 'avg_score'];
-        and `state`.
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
 
-    """
+        """
 
-    strategy = MinMaxCandidates(X,
-                                min_features,
-                                max_features,
-                                fixed_features,
-                                custom_feature_names,
-                                categorical_features)
-    
-    # if any categorical features or an intercept
-    # is included then we must
-    # create a new design matrix
+        if not isinstance(beam_width, int) or beam_width < 1:
+            raise ValueError('beam_width must be a positive integer')
+        self.beam_width = beam_width
 
-    build_submodel = partial(_build_submodel, strategy.column_info_)
+        Stepwise.__init__(self,
+                          X,
+                          direction,
+                          min_features,
+                          max_features,
+                          fixed_features,
+                          custom_feature_names,
+                          categorical_features,
+                          sparse_design=sparse_design,
+                          candidate_features=candidate_features)
 
-    if strategy.fixed_features:
-        initial_features = sorted(strategy.fixed_features)
-    else:
-        initial_features = range(strategy.min_features)
-    initial_state = tuple(initial_features)
+        self.beam = []
+        self.visited = set([])
 
-    if not parsimonious:
-        _postprocess = _postprocess_best
-    else:
-        _postprocess = _postprocess_best_1sd
+    def candidate_states(self, state):
+        """
+        Produce candidates for fitting: the union
+        of the stepwise neighbours of every state in
+        the beam, excluding states already scored.
+        States proposed but left unscored (by a budget,
+        an interruption or racing) can be proposed again.
 
-    return Strategy(initial_state,
-                    strategy.candidate_states,
-                    build_submodel,
-                    strategy.check_finished,
-                    _postprocess)
+        Parameters
+        ----------
 
-def first_peak(results,
-               path,
-               best,
-               batch_results):
-    """
-    Check if we should continue or not. 
+        state: ignored
 
-    For first_peak search we stop if we cannot improve
-    over our current best score.
+        Returns
+        -------
+        candidates: list
+            Sorted tuples of column identifiers, each
+            proposed once.
 
-    """
-    new_best = (None, None, None)
-    batch_best_score = -np.inf
+        """
 
-    for state, iteration, scores in batch_results:
-        avg_score = np.nanmean(scores)
-        if avg_score > batch_best_score:
-            new_best = (state, iteration, scores)
-            batch_best_score = avg_score
+        candidates = []
+        proposed = set([])
+        for beam_state in self.beam:
+            for candidate in Stepwise.candidate_states(self, beam_state):
+                key = self._encode(candidate)
+                if key not in self.visited and key not in proposed:
+                    proposed.add(key)
+                    candidates.append(candidate)
+        return candidates
 
-    any_better = batch_best_score > np.nanmean(best[2])
-    return new_best, not any_better
+    def check_finished(self,
+                       results,
+                       path,
+                       best,
+                       batch_results):
+        """
+        Keep the `beam_width` best states of the batch
+        as the new beam and mark the states of the batch
+        as visited. Stop when the best of them
+        does not improve over the current best score.
 
-def fixed_size(model_size,
-               results,
-               path,
-               best,
-               batch_results):
-    """
-    Check if we should continue or not. 
+        Called with empty `results` for the initial
+        state, which (re)starts the beam.
+        """
 
-    For first_peak search we stop if we cannot improve
-    over our current best score.
+        if not results:
+            self.beam = []
+            self.visited = set([])
 
-    """
-    new_best = (None, None, None)
-    batch_best_score = -np.inf
+        ranked = sorted(batch_results,
+                        key=lambda result: -np.nanmean(result[2]))
+        self.beam = [state for state, _, _ in ranked[:self.beam_width]]
+        self.visited.update([self._encode(state) for state, _, _ in batch_results])
 
-    for state, iteration, scores in batch_results:
-        avg_score = np.nanmean(scores)
-        if avg_score > batch_best_score:
-            new_best = (state, iteration, scores)
-            batch_best_score = avg_score
+        new_best = ranked[0]
+        if not results:
+            return new_best, False
+        any_better = np.nanmean(new_best[2]) > np.nanmean(best[2])
+        return new_best, not any_better
 
-    any_better = batch_best_score > np.nanmean(best[2])
-    return new_best, len(new_best[0]) == model_size
 
+class RandomStepwise(Stepwise):
 
-# private functions
+    # candidates are sampled, and weighted by earlier scores
 
+    speculative = False
 
-def _build_submodel(column_info, X, cols):
-    if cols:
-        return np.column_stack([column_info[col].get_columns(X, fit=True)[0] for col in cols])
+    def __init__(self,
+                 X,
+                 direction,
+                 max_candidates=100,
+                 weighted=False,
+                 random_state=None,
+                 min_features=1,
+                 max_features=1,
+                 fixed_features=None,
+                 custom_feature_names=None,
+                 categorical_features=None,
+                 sparse_design=None,
+                 candidate_features=None,
+                 max_redraws=3):
+        """
+        Parameters
+        ----------
+        X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+            Training vectors, where n_samples is the number of samples and
+            n_features is the number of features.
+            New in v 0.13.0: pandas DataFrames are now also accepted as
+            argument for X.
+        direction: str
+            One of ['forward', 'backward', 'both']
+        max_candidates: int (default: 100)
+            Number of stepwise candidates scored at each step,
+            drawn without replacement when there are more.
+        weighted: bool (default: False)
+            If True, candidates are drawn with probability
+            proportional to `1 / (1 + rank)`, where `rank` is
+            that of the last score of a candidate adding
+            (or dropping) the same column among those of
+            all columns scored so far. Columns not yet
+            scored have rank 0, so every column is tried.
+        random_state: int, RandomState instance or None (default: None)
+            Seed of the draws. With an int, refitting
+            with the same strategy draws the same candidates.
+        min_features: int (default: 1)
+            Minumum number of features to select
+        max_features: int (default: 1)
+            Maximum number of features to select
+        fixed_features: column identifiers, default=None
+            Subset of features to keep. Stored as `self.columns[fixed_features]`
+            where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+            or an array of integers if X is an `np.ndarray`
+        custom_feature_names: None or tuple (default: tuple)
+                Custom feature names for `self.k_feature_names` and
+                `self.subsets_[i]['feature_names']`.
+                (new in v 0.13.0)
+        categorical_features: array-like of {bool, int} of shape (n_features) 
+                or shape (n_categorical_features,), default=None.
+            Indicates the categorical features.
+
+            - None: no feature will be considered categorical.
+            - boolean array-like: boolean mask indicating categorical features.
+            - integer array-like: integer indices indicating categorical
+              features.
+
+            For each categorical feature, there must be at most `max_bins` unique
+            categories, and each categorical value must be in [0, max_bins -1].
+
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
+        max_redraws: int (default: 3)
+            Number of times to draw again, from the neighbours
+            of the current state not yet drawn at this step,
+            when none of the candidates drawn improves over
+            the best score, before stopping as `first_peak`
+            does. Each draw is a further iteration, but
+            the current state is recorded once in `path_`.
+
+        """
+
+        if not isinstance(max_candidates, Integral) or max_candidates < 1:
+            raise ValueError('max_candidates must be a positive integer')
+        if not isinstance(max_redraws, Integral) or max_redraws < 0:
+            raise ValueError('max_redraws must be a non-negative integer')
+        self.max_candidates = int(max_candidates)
+        self.weighted = weighted
+        self.random_state = random_state
+        self.max_redraws = int(max_redraws)
+
+        Stepwise.__init__(self,
+                          X,
+                          direction,
+                          min_features,
+                          max_features,
+                          fixed_features,
+                          custom_feature_names,
+                          categorical_features,
+                          sparse_design=sparse_design,
+                          candidate_features=candidate_features)
+
+        self._restart()
+
+    def candidate_states(self, state):
+        """
+        Produce candidates for fitting: at most
+        `max_candidates` of the stepwise neighbours
+        of `state` drawn at random, leaving out those
+        already drawn if `state` is drawn from again.
+
+        Parameters
+        ----------
+
+        state: tuple
+            Current state.
+
+        Returns
+        -------
+        candidates: list
+            Sorted tuples of column identifiers,
+            in the order of `Stepwise.candidate_states`.
+
+        """
+
+        if state != self._step_state:
+            self._step_state = state
+            self._drawn = set()
+            self._redraws = 0
+        candidates = [candidate for candidate in
+                      Stepwise.candidate_states(self, state)
+                      if self._encode(candidate) not in self._drawn]
+        if len(candidates) <= self.max_candidates:
+            self._n_undrawn = 0
+            self._drawn.update([self._encode(c) for c in candidates])
+            return candidates
+
+        if self.weighted:
+            cur = set(state)
+            cols = [(set(candidate) ^ cur).pop() for candidate in candidates]
+            known = sorted(set(self.column_scores.values()), reverse=True)
+            rank = dict([(score, i) for i, score in enumerate(known)])
+            weights = np.array([1 / (1 + rank[self.column_scores[col]])
+                                if col in self.column_scores else 1
+                                for col in cols])
+            p = weights / weights.sum()
+        else:
+            p = None
+
+        idx = self._rng.choice(len(candidates),
+                               self.max_candidates,
+                               replace=False,
+                               p=p)
+        drawn = [candidates[i] for i in sorted(idx)]
+        self._n_undrawn = len(candidates) - len(drawn)
+        self._drawn.update([self._encode(c) for c in drawn])
+        return drawn
+
+    def check_finished(self,
+                       results,
+                       path,
+                       best,
+                       batch_results):
+        """
+        Record the score of each candidate against the
+        column it adds or drops, then stop as `first_peak`
+        does when none of the candidates drawn improves
+        over the current best score, unless neighbours of
+        the current state remain to be drawn and fewer
+        than `max_redraws` draws were made again at this
+        step: the current state is then kept, so that the
+        next candidates are drawn from these neighbours.
+
+        Called with empty `results` for the initial
+        state, which restarts the draws.
+        """
+
+        if not results:
+            self._restart()
+        else:
+            parent = set(path[-1][0])
+            for state, _, scores in batch_results:
+                changed = set(state) ^ parent
+                score = np.nanmean(scores)
+                if len(changed) == 1 and not np.isnan(score):
+                    self.column_scores[changed.pop()] = score
+
+        new_best, finished = first_peak(results,
+                                        path,
+                                        best,
+                                        batch_results)
+        if (finished and results and self._n_undrawn > 0
+            and self._redraws < self.max_redraws):
+            self._redraws += 1
+            return path[-1], False
+        return new_best, finished
+
+    def _restart(self):
+        self._rng = check_random_state(self.random_state)
+        self.column_scores = {}
+        self._step_state = None
+        self._drawn = set()
+        self._redraws = 0
+        self._n_undrawn = 0
+
+
+class BranchAndBound(MinMaxCandidates):
+
+    def __init__(self,
+                 X,
+                 min_features=1,
+                 max_features=1,
+                 fixed_features=None,
+                 custom_feature_names=None,
+                 categorical_features=None,
+                 penalty=None,
+                 batch_size=1,
+                 sparse_design=None,
+                 candidate_features=None):
+        """
+        Best-subset search that prunes the lattice of subsets
+        (in the style of leaps and bounds) for scores that
+        can only decrease when columns are dropped, such as
+        training R^2 or negative training RSS (use `cv=None`).
+
+        Starting from all columns, subsets are enumerated by
+        dropping columns in a fixed order so that each subset
+        is generated once. As the score of a subset bounds
+        those of all its subsets, a subtree is skipped once
+        it cannot improve the best subset found of any size
+        between `min_features` and `max_features`.
+
+        Parameters
+        ----------
+        X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+            Training vectors, where n_samples is the number of samples and
+            n_features is the number of features.
+            New in v 0.13.0: pandas DataFrames are now also accepted as
+            argument for X.
+        min_features: int (default: 1)
+            Minumum number of features to select
+        max_features: int (default: 1)
+            Maximum number of features to select
+        fixed_features: column identifiers, default=None
+            Subset of features to keep. Stored as `self.columns[fixed_features]`
+            where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+            or an array of integers if X is an `np.ndarray`
+        custom_feature_names: None or tuple (default: tuple)
+                Custom feature names for `self.k_feature_names` and
+                `self.subsets_[i]['feature_names']`.
+                (new in v 0.13.0)
+        categorical_features: array-like of {bool, int} of shape (n_features) 
+                or shape (n_categorical_features,), default=None.
+            Indicates the categorical features.
+
+            - None: no feature will be considered categorical.
+            - boolean array-like: boolean mask indicating categorical features.
+            - integer array-like: integer indices indicating categorical
+              features.
+
+            For each categorical feature, there must be at most `max_bins` unique
+            categories, and each categorical value must be in [0, max_bins -1].
+
+        penalty: callable or None (default: None)
+            Non-decreasing function of the number of
+            features subtracted from the score when comparing
+            subsets of different sizes, e.g. `lambda k: 2 * k`.
+            If None, the best subset of every size is
+            found and the overall best is the one with
+            the highest score.
+        batch_size: int (default: 1)
+            Number of open subsets whose children are
+            scored in a single batch. Larger batches give
+            more parallelism but prune less.
+        sparse_design: bool or None (default: None)
+            If True, categorical features are one-hot encoded
+            to sparse columns and model matrices are
+            `scipy.sparse` CSC matrices. If None, this is the
+            case when `X` is a sparse matrix.
+        candidate_features: column identifiers or None (default: None)
+            If not None, only these columns (and `fixed_features`)
+            are candidates, e.g. the `columns` of `marginal_screen`.
+            Other columns are not encoded.
+
+        """
+
+        MinMaxCandidates.__init__(self,
+                                  X,
+                                  min_features,
+                                  max_features,
+                                  fixed_features,
+                                  custom_feature_names,
+                                  categorical_features,
+                                  sparse_design=sparse_design,
+                                  candidate_features=candidate_features)
+
+        if self.min_features < len(self.fixed_features):
+            raise ValueError('min_features must be at least the '
+                             'number of fixed_features')
+
+        self.penalty = penalty
+        self.batch_size = batch_size
+        self.free_ = [c for c in self.columns
+                      if c not in self.fixed_features]
+        self.n_pruned_ = self.n_evaluated_ = 0
+
+    def strategy(self, parsimonious=False):
+        """
+        Strategy for `FeatureSelector`. Counts of scored
+        and skipped subsets are available as `self.n_evaluated_`
+        and `self.n_pruned_` after fitting.
+
+        Parameters
+        ----------
+        parsimonious: bool
+            If True, use the 1sd rule: among the shortest models
+            within one standard deviation of the best score
+            pick the one with the best average score. 
+            Otherwise the best penalized score is used.
+
+        Returns
+        -------
+
+        strategy : NamedTuple
+
+        """
+
+        if parsimonious:
+            _postprocess = _postprocess_best_1sd
+        else:
+            _postprocess = self.postprocess
+
+        return Strategy(tuple(self.columns),
+                        self.candidate_states,
+                        DesignStore(self.column_info_,
+                                    self.column_map_,
+                                    self.sparse_design),
+                        self.check_finished,
+                        _postprocess)
+
+    def candidate_states(self, state):
+        """
+        Produce candidates for fitting: the children
+        of the next `batch_size` open subsets with the
+        highest scores that can still improve on the
+        best subsets found.
+
+        Parameters
+        ----------
+
+        state: ignored
+
+        Returns
+        -------
+        candidates: list
+            Sorted tuples of column identifiers.
+
+        """
+
+        candidates = []
+        n_open = 0
+        while self._open and n_open < self.batch_size:
+            neg_score, _, state, last = heappop(self._open)
+            n_removable = len(self.free_) - last - 1
+            if not self._promising(-neg_score, len(state), n_removable):
+                self.n_pruned_ += self._n_descendants(len(state), n_removable)
+                continue
+            n_open += 1
+            # drop columns after the last one dropped so that
+            # each subset has exactly one parent
+            for pos in range(last + 1, len(self.free_)):
+                col = self.free_[pos]
+                child = tuple([c for c in state if c != col])
+                self._last[self._encode(child)] = pos
+                candidates.append(child)
+        return candidates
+
+    def check_finished(self,
+                       results,
+                       path,
+                       best,
+                       batch_results):
+        """
+        Update the bounds with the scores in `batch_results`
+        and add the subsets that have children to the open list.
+        The search stops when no open subsets remain.
+
+        Called with empty `results` for the initial
+        state, which (re)starts the search.
+        """
+
+        if not results:
+            self._open = []
+            self._last = {self._encode(state): -1 for state, _, _ in batch_results}
+            self._best_size = {}
+            self._best_penalized = -np.inf
+            self.n_pruned_ = self.n_evaluated_ = 0
+
+        new_best = (None, None, None)
+        batch_best = -np.inf
+        for state, iteration, scores in batch_results:
+            self.n_evaluated_ += 1
+            score = np.nanmean(scores)
+            size = len(state)
+            if self.min_features <= size <= self.max_features:
+                penalized = score - self._penalty(size)
+                if score > self._best_size.get(size, -np.inf):
+                    self._best_size[size] = score
+                self._best_penalized = max(self._best_penalized, penalized)
+                if penalized > batch_best:
+                    new_best = (state, iteration, scores)
+                    batch_best = penalized
+            last = self._last.pop(self._encode(state))
+            if size > self.min_features and last < len(self.free_) - 1:
+                heappush(self._open, (-score, self.n_evaluated_, state, last))
+
+        if new_best[0] is None:
+            new_best = batch_results[0]
+        return new_best, not self._open
+
+    def postprocess(self, results):
+        """
+        Find the state with the best penalized score
+        among those of size between `min_features`
+        and `max_features`.
+
+        Return best state and results
+        """
+
+        results = _as_store(results)
+        sizes = results.sizes
+        penalties = np.array([self._penalty(k) for k in
+                              range(sizes.max() + 1 if len(results) else 1)])
+        penalized = results.avg_scores - penalties[sizes]
+        eligible = ((sizes >= self.min_features) &
+                    (sizes <= self.max_features) &
+                    ~np.isnan(penalized))
+        if not np.any(eligible):
+            return None, results.view()
+        row = int(np.argmax(np.where(eligible, penalized, -np.inf)))
+        return tuple(results.state(row)), results.view()
+
+    def _penalty(self, size):
+        if self.penalty is None:
+            return 0
+        return self.penalty(size)
+
+    def _promising(self, score, size, n_removable):
+        """
+        Can a subset of a state with `score`, having
+        `size` columns of which `n_removable` may still be
+        dropped, improve on the best subsets found?
+        Without a `penalty` this is the best subset of
+        some size, otherwise the best penalized score.
+        """
+        for k in range(max(self.min_features, size - n_removable),
+                       min(self.max_features, size - 1) + 1):
+            if score <= self._best_size.get(k, -np.inf):
+                continue
+            if (self.penalty is None or
+                score - self._penalty(k) > self._best_penalized):
+                return True
+        return False
+
+    def _n_descendants(self, size, n_removable):
+        """
+        Number of subsets of size between `min_features`
+        and `max_features` below a state.
+        """
+        return sum([comb(n_removable, j) for j in range(1, n_removable + 1)
+                    if self.min_features <= size - j <= self.max_features])
+
+
+def exhaustive(X,
+               min_features=1,
+               max_features=1,
+               fixed_features=None,
+               custom_feature_names=None,
+               categorical_features=None,
+               parsimonious=True,
+               rank_range=None,
+               sparse_design=None,
+               candidate_features=None):
+    """
+    Parameters
+    ----------
+    X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+        Training vectors, where n_samples is the number of samples and
+        n_features is the number of features.
+        New in v 0.13.0: pandas DataFrames are now also accepted as
+        argument for X.
+    min_features: int (default: 1)
+        Minumum number of features to select
+    max_features: int (default: 1)
+        Maximum number of features to select
+    fixed_features: column identifiers, default=None
+        Subset of features to keep. Stored as `self.columns[fixed_features]`
+        where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+        or an array of integers if X is an `np.ndarray`
+    custom_feature_names: None or tuple (default: tuple)
+            Custom feature names for `self.k_feature_names` and
+            `self.subsets_[i]['feature_names']`.
+            (new in v 0.13.0)
+    categorical_features: array-like of {bool, int} of shape (n_features) 
+            or shape (n_categorical_features,), default=None.
+        Indicates the categorical features.
+
+        - None: no feature will be considered categorical.
+        - boolean array-like: boolean mask indicating categorical features.
+        - integer array-like: integer indices indicating categorical
+          features.
+
+        For each categorical feature, there must be at most `max_bins` unique
+        categories, and each categorical value must be in [0, max_bins -1].
+
+    parsimonious: bool
+        If True, use the 1sd rule: among the shortest models
+        within one standard deviation of the best score
+        pick the one with the best average score. 
+    rank_range: (int, int) or None (default: None)
+        If not None, only score the subsets with rank
+        `start <= rank < stop` in the enumeration by size and then
+        lexicographically (see `subset_rank`). Shards run
+        separately can be combined with `FeatureSelector.merge`.
+        Unlike `ExhaustiveFeatureSelector`, `FeatureSelector`
+        does not record the rank reached (`next_rank_`): an
+        interrupted shard is resumed with `checkpoint_file`
+        and `resume_from` instead.
+    sparse_design: bool or None (default: None)
+        If True, categorical features are one-hot encoded
+        to sparse columns and model matrices are
+        `scipy.sparse` CSC matrices. If None, this is the
+        case when `X` is a sparse matrix.
+    candidate_features: column identifiers or None (default: None)
+        If not None, only these columns (and `fixed_features`)
+        are candidates, e.g. the `columns` of `marginal_screen`.
+        Other columns are not encoded.
+
+    Returns
+    -------
+
+    initial_state: tuple
+        (column_names, feature_idx)
+
+    state_generator: callable
+        Object that proposes candidates
+        based on current state. Takes a single 
+        argument `state`
+
+    build_submodel: callable
+        Candidate generator that enumerate
+        all valid subsets of columns.
+
+    check_finished: callable
+        Check whether to stop. Takes two arguments:
+        `best_result` a dict with keys ['scores', 'avg_score'];
+        and `state`.
+
+    """
+
+    strategy = MinMaxCandidates(X,
+                                min_features,
+                                max_features,
+                                fixed_features,
+                                custom_feature_names,
+                                categorical_features,
+                                rank_range,
+                                sparse_design,
+                                candidate_features)
+    
+    # if any categorical features or an intercept
+    # is included then we must
+    # create a new design matrix
+
+    build_submodel = DesignStore(strategy.column_info_,
+                                 strategy.column_map_,
+                                 strategy.sparse_design)
+
+    if strategy.fixed_features:
+        initial_features = sorted(strategy.fixed_features)
+    else:
+        initial_features = strategy.columns[:strategy.min_features]
+    initial_state = tuple(initial_features)
+
+    if not parsimonious:
+        _postprocess = _postprocess_best
+    else:
+        _postprocess = _postprocess_best_1sd
+
+    return Strategy(initial_state,
+                    strategy.candidate_states,
+                    build_submodel,
+                    strategy.check_finished,
+                    _postprocess)
+
+def beam_search(X,
+                beam_width=5,
+                direction='forward',
+                min_features=1,
+                max_features=1,
+                fixed_features=None,
+                initial_features=[],
+                custom_feature_names=None,
+                categorical_features=None,
+                parsimonious=True,
+                sparse_design=None,
+                candidate_features=None):
+    """
+    Strategy that keeps the `beam_width` best states
+    at each step and scores the union of their stepwise
+    neighbours as a single batch, stopping when no
+    improvement in score is possible.
+
+    Parameters
+    ----------
+    X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+        Training vectors, where n_samples is the number of samples and
+        n_features is the number of features.
+        New in v 0.13.0: pandas DataFrames are now also accepted as
+        argument for X.
+    beam_width: int (default: 5)
+        Number of states kept after each step.
+        With `beam_width=1` this is `Stepwise.first_peak`
+        except that states are never revisited.
+    direction: str
+        One of ['forward', 'backward', 'both']
+    min_features: int (default: 1)
+        Minumum number of features to select
+    max_features: int (default: 1)
+        Maximum number of features to select
+    fixed_features: column identifiers, default=None
+        Subset of features to keep. Stored as `self.columns[fixed_features]`
+        where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+        or an array of integers if X is an `np.ndarray`
+    initial_features: column identifiers, default=[]
+        Subset of features to be used to initialize.
+    custom_feature_names: None or tuple (default: tuple)
+            Custom feature names for `self.k_feature_names` and
+            `self.subsets_[i]['feature_names']`.
+            (new in v 0.13.0)
+    categorical_features: array-like of {bool, int} of shape (n_features) 
+            or shape (n_categorical_features,), default=None.
+        Indicates the categorical features.
+
+        - None: no feature will be considered categorical.
+        - boolean array-like: boolean mask indicating categorical features.
+        - integer array-like: integer indices indicating categorical
+          features.
+
+        For each categorical feature, there must be at most `max_bins` unique
+        categories, and each categorical value must be in [0, max_bins -1].
+
+    parsimonious: bool
+        If True, use the 1sd rule: among the shortest models
+        within one standard deviation of the best score
+        pick the one with the best average score. 
+    sparse_design: bool or None (default: None)
+        If True, categorical features are one-hot encoded
+        to sparse columns and model matrices are
+        `scipy.sparse` CSC matrices. If None, this is the
+        case when `X` is a sparse matrix.
+    candidate_features: column identifiers or None (default: None)
+        If not None, only these columns (and `fixed_features`)
+        are candidates, e.g. the `columns` of `marginal_screen`.
+        Other columns are not encoded.
+
+    Returns
+    -------
+
+    strategy : NamedTuple
+
+    """
+
+    beam = BeamSearch(X,
+                      direction,
+                      beam_width,
+                      min_features,
+                      max_features,
+                      fixed_features,
+                      custom_feature_names,
+                      categorical_features,
+                      sparse_design=sparse_design,
+                      candidate_features=candidate_features)
+
+    build_submodel = DesignStore(beam.column_info_,
+                                 beam.column_map_,
+                                 beam.sparse_design)
+
+    # pick an initial state
+
+    initial_state = tuple(initial_features)
+
+    _check_initial_features(beam, initial_features)
+
+    if not parsimonious:
+        _postprocess = _postprocess_best
     else:
-        return np.zeros((X.shape[0], 1))
-    
+        _postprocess = _postprocess_best_1sd
+
+    return Strategy(initial_state,
+                    beam.candidate_states,
+                    build_submodel,
+                    beam.check_finished,
+                    _postprocess)
+
+def random_stepwise(X,
+                    max_candidates=100,
+                    weighted=False,
+                    random_state=None,
+                    direction='forward',
+                    min_features=1,
+                    max_features=1,
+                    fixed_features=None,
+                    initial_features=[],
+                    custom_feature_names=None,
+                    categorical_features=None,
+                    parsimonious=True,
+                    sparse_design=None,
+                    candidate_features=None,
+                    max_redraws=3):
+    """
+    Stepwise strategy for wide data that scores at most
+    `max_candidates` stepwise neighbours of the current
+    state at each step, drawn at random (optionally
+    favouring columns whose candidates scored well),
+    stopping when none of them (nor those of up to
+    `max_redraws` further draws) improves the score.
+
+    Parameters
+    ----------
+    X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+        Training vectors, where n_samples is the number of samples and
+        n_features is the number of features.
+        New in v 0.13.0: pandas DataFrames are now also accepted as
+        argument for X.
+    max_candidates: int (default: 100)
+        Number of candidates scored at each step.
+    weighted: bool (default: False)
+        If True, draw candidates favouring columns whose
+        candidates scored well (see `RandomStepwise`).
+    random_state: int, RandomState instance or None (default: None)
+        Seed of the draws.
+    direction: str
+        One of ['forward', 'backward', 'both']
+    min_features: int (default: 1)
+        Minumum number of features to select
+    max_features: int (default: 1)
+        Maximum number of features to select
+    fixed_features: column identifiers, default=None
+        Subset of features to keep. Stored as `self.columns[fixed_features]`
+        where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+        or an array of integers if X is an `np.ndarray`
+    initial_features: column identifiers, default=[]
+        Subset of features to be used to initialize.
+    custom_feature_names: None or tuple (default: tuple)
+            Custom feature names for `self.k_feature_names` and
+            `self.subsets_[i]['feature_names']`.
+            (new in v 0.13.0)
+    categorical_features: array-like of {bool, int} of shape (n_features) 
+            or shape (n_categorical_features,), default=None.
+        Indicates the categorical features.
+
+        - None: no feature will be considered categorical.
+        - boolean array-like: boolean mask indicating categorical features.
+        - integer array-like: integer indices indicating categorical
+          features.
+
+        For each categorical feature, there must be at most `max_bins` unique
+        categories, and each categorical value must be in [0, max_bins -1].
+
+    parsimonious: bool
+        If True, use the 1sd rule: among the shortest models
+        within one standard deviation of the best score
+        pick the one with the best average score. 
+    sparse_design: bool or None (default: None)
+        If True, categorical features are one-hot encoded
+        to sparse columns and model matrices are
+        `scipy.sparse` CSC matrices. If None, this is the
+        case when `X` is a sparse matrix.
+    candidate_features: column identifiers or None (default: None)
+        If not None, only these columns (and `fixed_features`)
+        are candidates, e.g. the `columns` of `marginal_screen`.
+        Other columns are not encoded.
+    max_redraws: int (default: 3)
+        Number of further draws from the neighbours not
+        yet drawn before stopping (see `RandomStepwise`).
+
+    Returns
+    -------
+
+    strategy : NamedTuple
+
+    """
+
+    step = RandomStepwise(X,
+                          direction,
+                          max_candidates,
+                          weighted,
+                          random_state,
+                          min_features,
+                          max_features,
+                          fixed_features,
+                          custom_feature_names,
+                          categorical_features,
+                          sparse_design=sparse_design,
+                          candidate_features=candidate_features,
+                          max_redraws=max_redraws)
+
+    build_submodel = DesignStore(step.column_info_,
+                                 step.column_map_,
+                                 step.sparse_design)
+
+    # pick an initial state
+
+    initial_state = tuple(initial_features)
+
+    _check_initial_features(step, initial_features)
+
+    if not parsimonious:
+        _postprocess = _postprocess_best
+    else:
+        _postprocess = _postprocess_best_1sd
+
+    return Strategy(initial_state,
+                    step.candidate_states,
+                    build_submodel,
+                    step.check_finished,
+                    _postprocess)
+
+class Screen(NamedTuple):
+
+    """
+    Result of `marginal_screen`: the identifiers of the columns
+    kept, in the order of the columns of `X`, and the marginal
+    statistic and p-value (None for 'correlation') of
+    every column, keyed by column identifier.
+    """
+
+    columns: list
+    statistics: dict
+    pvalues: Any
+
+
+def marginal_screen(X,
+                    y,
+                    n_keep,
+                    statistic='f_regression',
+                    fixed_features=None,
+                    custom_feature_names=None,
+                    categorical_features=None,
+                    sparse_design=None):
+    """
+    Screen the columns of `X` by a marginal statistic
+    computed for all of them in one pass over the encoded
+    design, keeping the `n_keep` best along with
+    `fixed_features`. Pass the `columns` of the result as
+    `candidate_features` to a strategy to restrict
+    its candidates to them.
+
+    Parameters
+    ----------
+    X: {array-like, sparse matrix}, shape = [n_samples, n_features]
+        Training vectors, where n_samples is the number of samples and
+        n_features is the number of features.
+        New in v 0.13.0: pandas DataFrames are now also accepted as
+        argument for X.
+    y: array-like, shape = [n_samples]
+        Target values.
+    n_keep: int
+        Number of columns kept in addition to `fixed_features`.
+    statistic: str (default: 'f_regression')
+        For a continuous `y`, 'f_regression' (F test of the
+        regression of `y` on the column) or 'correlation'
+        (absolute correlation with `y`). For class labels `y`,
+        'f_classif' (ANOVA F test of the column across the classes)
+        or 'chi2' (chi-squared test of a non-negative column against
+        the classes, as `sklearn.feature_selection.chi2`).
+        A categorical column is tested through its encoding:
+        with 'f_regression' by the one-way ANOVA of `y` across its
+        levels, with 'correlation' by the correlation ratio and
+        with 'f_classif' or 'chi2' by the chi-squared test of
+        its contingency table with the classes. Columns are
+        ranked by p-value, or by statistic for 'correlation'.
+    fixed_features: column identifiers, default=None
+        Subset of features to keep. Stored as `self.columns[fixed_features]`
+        where `self.columns` will correspond to columns if X is a `pd.DataFrame`
+        or an array of integers if X is an `np.ndarray`
+    custom_feature_names: None or tuple (default: tuple)
+            Custom feature names for `self.k_feature_names` and
+            `self.subsets_[i]['feature_names']`.
+            (new in v 0.13.0)
+    categorical_features: array-like of {bool, int} of shape (n_features) 
+            or shape (n_categorical_features,), default=None.
+        Indicates the categorical features.
+
+        - None: no feature will be considered categorical.
+        - boolean array-like: boolean mask indicating categorical features.
+        - integer array-like: integer indices indicating categorical
+          features.
+
+        For each categorical feature, there must be at most `max_bins` unique
+        categories, and each categorical value must be in [0, max_bins -1].
+
+    sparse_design: bool or None (default: None)
+        If True, categorical features are one-hot encoded
+        to sparse columns and model matrices are
+        `scipy.sparse` CSC matrices. If None, this is the
+        case when `X` is a sparse matrix.
+
+    Returns
+    -------
+
+    screen : Screen
+
+    """
+
+    if statistic not in ['f_regression', 'correlation', 'f_classif', 'chi2']:
+        raise ValueError("statistic must be one of 'f_regression', "
+                         "'correlation', 'f_classif' or 'chi2'")
+
+    candidates = MinMaxCandidates(X,
+                                  fixed_features=fixed_features,
+                                  custom_feature_names=custom_feature_names,
+                                  categorical_features=categorical_features,
+                                  sparse_design=sparse_design)
+    design = DesignStore(candidates.column_info_,
+                         candidates.column_map_,
+                         candidates.sparse_design).build_design(X)[0]
+
+    y = np.asarray(y)
+    if y.shape[0] != design.shape[0]:
+        raise ValueError('X and y have different numbers of samples')
+
+    columns = list(candidates.columns)
+    sizes = np.array([len(candidates.column_map_[col]) for col in columns],
+                     np.intp)
+    is_block = np.array([candidates.column_info_[col].is_categorical and
+                         not candidates.column_info_[col].is_ordinal
+                         for col in columns], bool)
+
+    if statistic in ['f_regression', 'correlation']:
+        stats, logp = _screen_regression(design,
+                                         y.astype(float),
+                                         sizes,
+                                         is_block,
+                                         statistic)
+    else:
+        labels = np.unique(y, return_inverse=True)[1]
+        Y = np.eye(labels.max() + 1)[labels]
+        stats, logp = _screen_classification(design,
+                                             Y,
+                                             sizes,
+                                             is_block,
+                                             statistic)
+
+    # rank the free columns, best first
+
+    if logp is None:
+        rank_by = np.where(np.isnan(stats), -np.inf, stats)
+    else:
+        rank_by = np.where(np.isnan(logp), -np.inf, -logp)
+    free = [j for j, col in enumerate(columns)
+            if col not in candidates.fixed_features]
+    order = sorted(free, key=lambda j: -rank_by[j])
+    keep = set(order[:max(n_keep, 0)])
+
+    kept = [col for j, col in enumerate(columns)
+            if col in candidates.fixed_features or j in keep]
+    statistics = dict(zip(columns, stats))
+    if logp is None:
+        pvalues = None
+    else:
+        pvalues = dict(zip(columns, np.exp(logp)))
+    return Screen(kept, statistics, pvalues)
+
+def first_peak(results,
+               path,
+               best,
+               batch_results):
+    """
+    Check if we should continue or not. 
+
+    For first_peak search we stop if we cannot improve
+    over our current best score.
+
+    """
+    new_best = (None, None, None)
+    batch_best_score = -np.inf
+
+    for state, iteration, scores in batch_results:
+        avg_score = np.nanmean(scores)
+        if avg_score > batch_best_score:
+            new_best = (state, iteration, scores)
+            batch_best_score = avg_score
+
+    any_better = batch_best_score > np.nanmean(best[2])
+    return new_best, not any_better
+
+def fixed_size(model_size,
+               results,
+               path,
+               best,
+               batch_results):
+    """
+    Check if we should continue or not. 
+
+    For first_peak search we stop if we cannot improve
+    over our current best score.
+
+    """
+    new_best = (None, None, None)
+    batch_best_score = -np.inf
+
+    for state, iteration, scores in batch_results:
+        avg_score = np.nanmean(scores)
+        if avg_score > batch_best_score:
+            new_best = (state, iteration, scores)
+            batch_best_score = avg_score
+
+    any_better = batch_best_score > np.nanmean(best[2])
+    return new_best, len(new_best[0]) == model_size
+
+
+# private functions
+
+
+def _build_submodel(column_info, X, cols, sparse_output=False):
+    if cols:
+        return _stack_columns([column_info[col].get_columns(X, fit=True)[0] for col in cols],
+                              sparse_output)
+    else:
+        return _intercept_only(X, sparse_output)
+
+def _gather_submodel(column_index, design, cols):
+    if cols:
+        idx = np.concatenate([column_index[col] for col in cols])
+        return design[:, idx]
+    else:
+        return _intercept_only(design)
+
+def _stack_columns(blocks, sparse_output=False):
+    """
+    Stack encoded columns, as a CSC matrix
+    if `sparse_output` or any of them is sparse.
+    """
+    if sparse_output or any([sparse.issparse(B) for B in blocks]):
+        blocks = [B if sparse.issparse(B) else
+                  sparse.csc_matrix(np.reshape(B, (B.shape[0], -1)))
+                  for B in blocks]
+        return sparse.hstack(blocks, format='csc')
+    return np.column_stack(blocks)
+
+def _intercept_only(X, sparse_output=False):
+    """
+    Model matrix of the empty model: a column of zeros,
+    with no stored entries if `sparse_output` or `X`
+    is sparse.
+    """
+    if sparse_output or sparse.issparse(X):
+        return sparse.csc_matrix((X.shape[0], 1))
+    return np.zeros((X.shape[0], 1))
+
+def _check_initial_features(strategy, initial_features):
+    unknown = set(initial_features) - set(strategy.columns)
+    if unknown:
+        raise ValueError('initial_features %s are neither candidate_features '
+                         'nor fixed_features' % str(sorted(unknown, key=str)))
+    if not strategy.fixed_features.issubset(initial_features):
+        raise ValueError('initial_features should contain %s' % str(strategy.fixed_features))
+
 def _postprocess_fixed_size(model_size, results):
     """
-    Find the best state from `results`
+    Find the best state of size `model_size` from `results`
     based on `avg_score`.
 
     Return best state and results
     """
 
-    best_state = None
-    best_score = -np.inf
-
-    new_results = {}
-    for (state, iteration, scores) in results:
-        new_state = tuple(state) # [v.name for v in state])
-        avg_score = np.nanmean(scores)
-        if avg_score > best_score and len(new_state) == model_size:
-            best_state = new_state
-            best_score = avg_score
-        new_results[new_state] = avg_score
-    return best_state, new_results
+    results = _as_store(results)
+    sizes_ok = results.sizes == model_size
+    if not np.any(sizes_ok & ~np.isnan(results.avg_scores)):
+        return None, results.view()
+    avg_scores = np.where(sizes_ok & ~np.isnan(results.avg_scores),
+                          results.avg_scores,
+                          -np.inf)
+    return tuple(results.state(int(np.argmax(avg_scores)))), results.view()
     
 def _postprocess_best(results):
     """
@@ -695,18 +2071,11 @@ def _postprocess_best(results):
     Return best state and results
     """
 
-    best_state = None
-    best_score = -np.inf
-
-    new_results = {}
-    for (state, iteration, scores) in results:
-        new_state = tuple(state) # [v.name for v in state])
-        avg_score = np.nanmean(scores)
-        if avg_score > best_score:
-            best_state = new_state
-            best_score = avg_score
-        new_results[new_state] = avg_score
-    return best_state, new_results
+    results = _as_store(results)
+    row = best_row(results)
+    if row is None:
+        return None, results.view()
+    return tuple(results.state(row)), results.view()
 
 
 def _postprocess_best_1sd(results):
@@ -723,49 +2092,164 @@ def _postprocess_best_1sd(results):
     Models are compared by length of state
     """
 
-    best_state = None
-    best_score = -np.inf
+    # the loop this replaced never found a smaller state
+    # within one standard error, so the best state is kept;
+    # applying the rule (`best_row_1sd`) would change the
+    # model selected by default
 
-    for state, iteration, scores in results:
-        avg_score = np.nanmean(scores)
-        if avg_score > best_score:
-            best_state = state
-            best_score = avg_score
+    results = _as_store(results)
+    row = best_row(results)
+    if row is None:
+        return None, results.view()
+    return tuple(results.state(row)), results.view()
 
-    states_1sd = []
 
-    for (state, iteration, scores) in results:
-        if len(state) >= len(best_state):
-            continue
-        _limit = (np.nanmean(scores) + 
-                  np.nanstd(scores) / np.sqrt(scores.shape[0]))
-        if _limit >= best_score:
-            states_1sd.append((state, iteration, scores))
+def _as_store(results):
+    """
+    Columnar store holding `results`, a
+    list of `(state, iteration, scores)`.
+    """
+    if isinstance(results, ResultsStore):
+        return results
+    store = ResultsStore()
+    store.extend(results)
+    return store
 
-    shortest_1sd = np.inf
+def _column_sums(D, w=None):
+    """
+    Sums of the columns of `D` (a dense or sparse matrix),
+    weighted by the columns of `w` if not None.
+    """
+    if w is None:
+        return np.asarray(D.sum(0)).ravel()
+    return np.asarray(D.T @ w)
 
-    for (state, iteration, scores) in states_1sd:
-        if len(state) < shortest_1sd:
-            shortest_1sd = len(state)
-            
-    best_state_1sd = None
-    best_score_1sd = -np.inf
+def _column_squares(D):
+    if sparse.issparse(D):
+        return _column_sums(D.multiply(D))
+    return np.einsum('ij,ij->j', D, D)
 
-    for (state, iteration, scores) in states_1sd:
-        avg_score = np.nanmean(scores)
-        if ((len(state) == shortest_1sd)
-            and (avg_score <=
-                 best_score_1sd)):
-            best_state_1sd = state
-            best_score_1sd = avg_score
-            
-    new_results = {}
-    for (state, iteration, scores) in results:
-        new_state = tuple(state) #[v.name for v in state])
-        new_results[new_state] = np.nanmean(scores)
-    if best_state_1sd:
-        best_state_1sd = tuple([v.name for v in best_state_1sd])
-        return best_state_1sd, new_results
-    else:
-        best_state = tuple(best_state) # [v.name for v in best_state])
-        return best_state, new_results
+def _screen_regression(design, y, sizes, is_block, statistic):
+    """
+    Marginal statistics and log p-values (None for
+    'correlation') of each column, spanning `sizes`
+    columns of `design`, for a continuous `y`.
+    """
+
+    n, p = design.shape[0], len(sizes)
+    owner = np.repeat(np.arange(p), sizes)
+    first = np.cumsum(sizes) - sizes
+    s1 = _column_sums(design)
+    sy = _column_sums(design, y)
+    y_sum = y.sum()
+    sst = np.sum((y - y_sum / n)**2)
+
+    stats = np.full(p, np.nan)
+    logp = np.full(p, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        # numeric columns: correlation with y
+
+        numeric = np.nonzero(~is_block & (sizes == 1))[0]
+        d = first[numeric]
+        sxx = _column_squares(design)[d] - s1[d]**2 / n
+        sxy = sy[d] - s1[d] * y_sum / n
+        r = sxy / np.sqrt(sxx * sst)
+        if statistic == 'correlation':
+            stats[numeric] = np.fabs(r)
+        else:
+            F = r**2 / (1 - r**2) * (n - 2)
+            stats[numeric] = F
+            logp[numeric] = f_dist.logsf(F, 1, n - 2)
+
+        # categorical columns: one-way ANOVA of y over the
+        # levels, the dropped level having no indicator
+
+        blocks = np.nonzero(is_block)[0]
+        counts = np.bincount(owner, s1, p)
+        sums = np.bincount(owner, sy, p)
+        count0 = n - counts
+        sum0 = y_sum - sums
+        terms = np.where(s1 > 0, sy**2 / s1, 0)
+        ssb = (np.bincount(owner, terms, p) +
+               np.where(count0 > 0, sum0**2 / count0, 0) -
+               y_sum**2 / n)
+        k = (np.bincount(owner, s1 > 0, p) + (count0 > 0))
+        if statistic == 'correlation':
+            stats[blocks] = np.sqrt(ssb[blocks] / sst)
+        else:
+            F = ((ssb / (k - 1)) / ((sst - ssb) / (n - k)))[blocks]
+            stats[blocks] = F
+            logp[blocks] = f_dist.logsf(F, k[blocks] - 1, n - k[blocks])
+
+    if statistic == 'correlation':
+        return stats, None
+    return stats, logp
+
+def _screen_classification(design, Y, sizes, is_block, statistic):
+    """
+    Marginal statistics and log p-values of each column,
+    spanning `sizes` columns of `design`, against the
+    classes indicated by the columns of `Y`.
+    """
+
+    n, p = design.shape[0], len(sizes)
+    n_classes = Y.shape[1]
+    owner = np.repeat(np.arange(p), sizes)
+    first = np.cumsum(sizes) - sizes
+    s1 = _column_sums(design)
+    S = _column_sums(design, Y)  # columns x classes
+    nc = Y.sum(0)
+
+    stats = np.full(p, np.nan)
+    logp = np.full(p, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+
+        numeric = np.nonzero(~is_block & (sizes == 1))[0]
+        d = first[numeric]
+        if statistic == 'f_classif':
+            sst = _column_squares(design)[d] - s1[d]**2 / n
+            ssb = np.sum(S[d]**2 / nc, 1) - s1[d]**2 / n
+            F = ((ssb / (n_classes - 1)) /
+                 ((sst - ssb) / (n - n_classes)))
+            stats[numeric] = F
+            logp[numeric] = f_dist.logsf(F, n_classes - 1, n - n_classes)
+        else:
+            if len(d) and _column_min(design, d) < 0:
+                raise ValueError("statistic 'chi2' needs "
+                                 "non-negative columns")
+            expected = s1[d][:, None] * nc[None, :] / n
+            chi2 = np.sum((S[d] - expected)**2 / expected, 1)
+            stats[numeric] = chi2
+            logp[numeric] = chi2_dist.logsf(chi2, n_classes - 1)
+
+        # categorical columns: contingency table of levels
+        # and classes, the dropped level having no indicator
+
+        blocks = np.nonzero(is_block)[0]
+        observed0 = np.tile(nc, (p, 1))
+        np.subtract.at(observed0, owner, S)
+        count0 = n - np.bincount(owner, s1, p)
+        expected = s1[:, None] * nc[None, :] / n
+        expected0 = count0[:, None] * nc[None, :] / n
+        terms = np.where(s1 > 0,
+                         np.sum((S - expected)**2 / expected, 1),
+                         0)
+        terms0 = np.where(count0 > 0,
+                          np.sum((observed0 - expected0)**2 / expected0, 1),
+                          0)
+        chi2 = np.bincount(owner, terms, p) + terms0
+        k = np.bincount(owner, s1 > 0, p) + (count0 > 0)
+        df = (k - 1) * (n_classes - 1)
+        stats[blocks] = chi2[blocks]
+        logp[blocks] = chi2_dist.logsf(chi2[blocks], df[blocks])
+
+    return stats, logp
+
+def _column_min(design, idx):
+    D = design[:, idx]
+    if sparse.issparse(D):
+        return D.min()
+    return np.min(D)
@@ -0,0 +1,158 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Ranking of subsets in the order enumerated by exhaustive search
+#
+# License: BSD 3 clause
+
+from math import comb
+
+
+def n_subsets(n_features, min_features, max_features):
+    """
+    Number of subsets of `n_features` items with
+    between `min_features` and `max_features` items.
+    """
+    return sum([comb(n_features, k) for k in
+                range(min_features, max_features + 1)])
+
+
+def rank_subset(subset, n_features, min_features):
+    """
+    Rank of `subset` in the enumeration of all subsets
+    of `range(n_features)` of size at least `min_features`
+    by size and then lexicographically, i.e. the order of
+    `chain(combinations(range(n_features), k) for k in ...)`.
+
+    Parameters
+    ----------
+    subset: sequence of int
+        Increasing indices in `range(n_features)`.
+    n_features: int
+        Total number of items.
+    min_features: int
+        Size of the smallest subsets enumerated.
+
+    Returns
+    -------
+    rank: int
+
+    """
+    k = len(subset)
+    if k < min_features:
+        raise ValueError('subset has fewer than %d items' % min_features)
+    offset = n_subsets(n_features, min_features, k - 1)
+
+    # lexicographic rank through the combinatorial
+    # number system of the complemented indices
+
+    total = comb(n_features, k)
+    rank = total - 1 - sum([comb(n_features - 1 - c, k - i)
+                            for i, c in enumerate(subset)])
+    return offset + rank
+
+
+def unrank_subset(rank, n_features, min_features):
+    """
+    Subset of `range(n_features)` with rank `rank`
+    (see `rank_subset`).
+
+    Returns
+    -------
+    subset: tuple of int
+
+    """
+    if rank < 0:
+        raise ValueError('rank must be non-negative')
+
+    k = min_features
+    while rank >= comb(n_features, k):
+        rank -= comb(n_features, k)
+        k += 1
+        if k > n_features:
+            raise ValueError('rank is larger than the number of subsets')
+
+    m = comb(n_features, k) - 1 - rank
+    subset = []
+    d = n_features - 1
+    for i in range(k):
+        while comb(d, k - i) > m:
+            d -= 1
+        m -= comb(d, k - i)
+        subset.append(n_features - 1 - d)
+        d -= 1
+    return tuple(subset)
+
+
+def subsets_in_range(n_features,
+                     min_features,
+                     max_features,
+                     start=0,
+                     stop=None):
+    """
+    Generate the subsets with ranks in `range(start, stop)`
+    (see `rank_subset`) without enumerating those before `start`.
+
+    Parameters
+    ----------
+    n_features: int
+        Total number of items.
+    min_features: int
+        Size of the smallest subsets.
+    max_features: int
+        Size of the largest subsets.
+    start: int (default: 0)
+        Rank of the first subset generated.
+    stop: int or None (default: None)
+        Rank after the last subset generated. If None,
+        all subsets up to size `max_features` are generated.
+
+    Returns
+    -------
+    subsets: generator of tuples of int
+
+    """
+
+    total = n_subsets(n_features, min_features, max_features)
+    if stop is None or stop > total:
+        stop = total
+    if start >= stop:
+        return
+
+    subset = list(unrank_subset(start, n_features, min_features))
+    for _ in range(stop - start):
+        yield tuple(subset)
+        subset = _next_subset(subset, n_features)
+
+
+def shard_ranges(n_total, n_shards):
+    """
+    Split `range(n_total)` into `n_shards` contiguous
+    `(start, stop)` ranges of nearly equal length,
+    or into `n_total` ranges of length 1 if `n_shards`
+    is larger, so that no range is empty.
+    """
+    n_shards = min(n_shards, n_total)
+    if n_shards < 1:
+        return []
+    bounds = [(n_total * i) // n_shards for i in range(n_shards + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(n_shards)]
+
+
+# private functions
+
+def _next_subset(subset, n_features):
+    """
+    The subset following `subset` by size and then
+    lexicographically.
+    """
+    k = len(subset)
+    i = k - 1
+    while i >= 0 and subset[i] == n_features - k + i:
+        i -= 1
+    if i < 0:
+        # last subset of this size: first of the next size
+        return list(range(k + 1))
+    subset[i] += 1
+    for j in range(i + 1, k):
+        subset[j] = subset[j - 1] + 1
+    return subset
@@ -513,3 +513,110 @@ def test_check_pandas_dataframe_transform():
     efs1 = efs1.fit(df, y)
     assert efs1.best_idx_ == (2, 3)
     assert (150, 2) == efs1.transform(df).shape
+
+
+def test_memmap():
+    iris = load_iris()
+    X = iris.data
+    y = iris.target
+    knn = KNeighborsClassifier(n_neighbors=4)
+
+    efs1 = EFS(knn,
+               min_features=2,
+               max_features=3,
+               cv=3,
+               print_progress=False)
+    efs1 = efs1.fit(X, y)
+
+    efs2 = EFS(knn,
+               min_features=2,
+               max_features=3,
+               cv=3,
+               n_jobs=2,
+               memmap=True,
+               print_progress=False)
+    efs2 = efs2.fit(X, y)
+
+    dict_compare_utility(d1=efs1.subsets_, d2=efs2.subsets_)
+    assert efs1.best_idx_ == efs2.best_idx_
+
+
+def test_rank_range_merge():
+    iris = load_iris()
+    X = iris.data
+    y = iris.target
+    knn = KNeighborsClassifier(n_neighbors=4)
+
+    efs1 = EFS(knn,
+               min_features=1,
+               max_features=3,
+               cv=3,
+               print_progress=False)
+    efs1 = efs1.fit(X, y)
+
+    shards = []
+    for rank_range in [(0, 5), (5, 9), (9, 14)]:
+        efs = EFS(knn,
+                  min_features=1,
+                  max_features=3,
+                  cv=3,
+                  print_progress=False,
+                  rank_range=rank_range)
+        shards.append(efs.fit(X, y))
+        assert sorted(efs.subsets_) == list(range(*rank_range))
+        assert efs.next_rank_ == rank_range[1]
+
+    efs2 = shards[0].merge(*shards[1:])
+    dict_compare_utility(d1=efs1.subsets_, d2=efs2.subsets_)
+    assert efs1.best_idx_ == efs2.best_idx_
+    assert efs1.best_feature_names_ == efs2.best_feature_names_
+    assert efs1.best_score_ == efs2.best_score_
+
+    # resume an interrupted search from next_rank_
+
+    efs3 = EFS(knn,
+               min_features=1,
+               max_features=3,
+               cv=3,
+               print_progress=False)
+    efs3._TESTING_INTERRUPT_MODE = True
+    efs3.fit(X, y)
+    assert efs3.interrupted_
+    assert efs3.next_rank_ == 1
+
+    efs4 = EFS(knn,
+               min_features=1,
+               max_features=3,
+               cv=3,
+               print_progress=False,
+               rank_range=(efs3.next_rank_, 14))
+    efs4.fit(X, y)
+    efs3.merge(efs4)
+    assert efs1.best_idx_ == efs3.best_idx_
+    assert sorted(efs3.subsets_) == list(range(14))
+
+    # resuming a finished shard evaluates nothing
+
+    efs5 = EFS(knn,
+               min_features=1,
+               max_features=3,
+               cv=3,
+               print_progress=False,
+               rank_range=(efs4.next_rank_, 14))
+    efs5.fit(X, y)
+    assert efs5.subsets_ == {} and efs5.best_idx_ is None
+    assert efs5.next_rank_ == 14
+    efs3.merge(efs5)
+    assert efs1.best_idx_ == efs3.best_idx_
+    assert sorted(efs3.subsets_) == list(range(14))
+
+    efs6 = EFS(knn,
+               min_features=1,
+               max_features=3,
+               print_progress=False,
+               rank_range=(15, 20))
+    assert_raises(ValueError,
+                  'rank_range must be within [0, 14]',
+                  efs6.fit,
+                  X,
+                  y)
@@ -1,11 +1,32 @@
-from itertools import product
+from itertools import product, combinations
+from functools import partial
+from math import comb
 
 import pytest
 
+import time
+
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from mlxtend.feature_selection.generic_selector import FeatureSelector
-from mlxtend.feature_selection.strategy import exhaustive, Stepwise
+from scipy import sparse
+from joblib import parallel_backend
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.metrics import get_scorer
+from mlxtend.classifier import SoftmaxRegression
+from mlxtend.feature_selection import generic_selector
+from mlxtend.feature_selection.generic_selector import (FeatureSelector,
+                                                        _child_coefs,
+                                                        _calc_warm_fold_score)
+from mlxtend.feature_selection.columns import ColumnStore
+from mlxtend.feature_selection.progress import ProgressReporter
+from mlxtend.feature_selection.strategy import (exhaustive,
+                                                Stepwise,
+                                                beam_search,
+                                                BeamSearch,
+                                                random_stepwise,
+                                                marginal_screen,
+                                                BranchAndBound,
+                                                MinMaxCandidates)
+from mlxtend.feature_selection.subset_rank import shard_ranges
 
 
 have_pandas = True
@@ -182,6 +203,46 @@ def test_pandas1():
         step_selector.fit(D, Y)
         print(step_selector.path_)
 
+def test_column_store():
+
+    rng = np.random.RandomState(0)
+    n = 60
+    D = pd.DataFrame({'A': rng.standard_normal(n),
+                      'B': pd.Categorical(rng.choice(['x', 'y', 'z'], n)),
+                      'C': pd.Categorical(rng.choice(['lo', 'mid', 'hi'], n),
+                                          categories=['lo', 'mid', 'hi'],
+                                          ordered=True),
+                      'E': rng.standard_normal(n)})
+    D = D.iloc[::-1]  # not contiguous in the original frame
+
+    store = ColumnStore(D)
+    assert list(store.columns) == list(D.columns)
+    for col in D.columns:
+        assert store.data[col].flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(store.data[col], np.asarray(D[col]))
+    assert store.categories['A'] is None
+    assert not store.ordered['B'] and store.ordered['C']
+
+    strategy = Stepwise.first_peak(D,
+                                   max_features=4,
+                                   custom_feature_names=['a', 'b', 'c', 'e'])
+    info = strategy.build_submodel.column_info
+    assert info['B'].is_categorical and not info['B'].is_ordinal
+    assert info['C'].is_ordinal
+    assert info['A'].dtype == np.float64 and info['A'].name == 'a'
+    np.testing.assert_array_equal(info['B'].categories, ['x', 'y', 'z'])
+
+    # ordinal columns follow the order of the categories
+
+    np.testing.assert_array_equal(
+        strategy.build_submodel(D, ('C',))[:, 0],
+        np.asarray(D['C'].cat.codes))
+
+    design, gather = strategy.build_submodel.build_design(D)
+    for state in [('A',), ('B', 'E'), ('A', 'B', 'C', 'E')]:
+        np.testing.assert_allclose(gather(design, state),
+                                   strategy.build_submodel(D, state))
+
 def neg_AIC(linmod, X, Y):
     """
     Negative AIC for linear regression model
@@ -415,3 +476,1077 @@ def test_boston_forward_3step():
     assert(sorted(selected_vars2) == sorted(selected_R))
     assert(np.fabs(neg_AIC(selected_model, Xsel, Y) + 3116.097) < 0.01)
     
+
+def test_design_store():
+
+    n, p = 50, 6
+    X = np.random.standard_normal((n, p))
+    X[:,0] = np.random.choice(range(5), (n,), replace=True)
+    X[:,3] = np.random.choice(range(3), (n,), replace=True)
+
+    categorical_features = [True, False, False, True, False, False]
+    strategy = Stepwise.first_peak(X,
+                                   max_features=4,
+                                   categorical_features=categorical_features)
+    build_submodel = strategy.build_submodel
+    design, gather = build_submodel.build_design(X)
+
+    assert design.flags['F_CONTIGUOUS']
+    for state in [(), (0,), (1, 3), (0, 2, 3, 5), (5, 0)]:
+        np.testing.assert_allclose(gather(design, state),
+                                   build_submodel(X, state))
+
+def test_sparse_design():
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 4
+    X = rng.standard_normal((n, p))
+    X[:,0] = rng.choice(range(8), (n,), replace=True)
+    X[:,2][X[:,2] < 0.5] = 0
+    Y = X[:,1] + 2 * (X[:,0] < 3) + rng.standard_normal(n)
+
+    dense = Stepwise.first_peak(X,
+                                max_features=p,
+                                categorical_features=[0])
+    design, gather = dense.build_submodel.build_design(X)
+
+    for X_, sparse_design in [(X, True), (sparse.csr_matrix(X), None)]:
+        strategy = Stepwise.first_peak(X_,
+                                       max_features=p,
+                                       categorical_features=[0],
+                                       sparse_design=sparse_design)
+        build_submodel = strategy.build_submodel
+        sparse_design_, _ = build_submodel.build_design(X_)
+        assert sparse.isspmatrix_csc(sparse_design_)
+        for state in [(), (0,), (1, 2), (0, 2, 3)]:
+            X_state = build_submodel(X_, state)
+            assert sparse.issparse(X_state)
+            np.testing.assert_allclose(X_state.toarray(),
+                                       gather(design, state))
+        assert build_submodel(X_, ()).nnz == 0
+
+        selector1 = FeatureSelector(LinearRegression(),
+                                    dense,
+                                    cv=3)
+        selector1.fit(X, Y)
+        selector2 = FeatureSelector(LinearRegression(),
+                                    strategy,
+                                    cv=3)
+        selector2.fit(X_, Y)
+
+        assert selector1.selected_state_ == selector2.selected_state_
+        for state in selector1.results_:
+            np.testing.assert_allclose(selector1.results_[state],
+                                       selector2.results_[state],
+                                       rtol=1e-5)
+
+def test_memmap():
+
+    n, p = 50, 6
+    X = np.random.standard_normal((n, p))
+    Y = np.random.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X,
+                                   max_features=4)
+
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    selector1.fit(X, Y)
+
+    selector2 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3,
+                                n_jobs=2,
+                                memmap=True)
+    selector2.fit(X, Y)
+
+    assert selector1.selected_state_ == selector2.selected_state_
+    assert selector1.results_ == selector2.results_
+
+def test_streamed_candidates(monkeypatch):
+
+    rng = np.random.RandomState(0)
+    n, p = 40, 6
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + rng.standard_normal(n)
+
+    strategy = exhaustive(X,
+                          min_features=1,
+                          max_features=p,
+                          parsimonious=False)
+    candidates = strategy.candidate_states(None)
+    assert not isinstance(candidates, list)
+    assert len(candidates) == 2**p - 1 == len(list(candidates))
+
+    # exhaustive candidates are scored a chunk at a time
+
+    monkeypatch.setattr(generic_selector, '_CHUNK_SIZE', 7)
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    chunks = []
+    score_batch = selector1._score_batch
+    def counted(iteration, cur_state, candidates, *args, **kwargs):
+        chunks.append(len(candidates))
+        return score_batch(iteration, cur_state, candidates, *args, **kwargs)
+    selector1._score_batch = counted
+    selector1.fit(X, Y)
+    assert chunks == [1] + [7] * 9
+
+    listed = strategy._replace(
+        candidate_states=lambda state: list(strategy.candidate_states(state)))
+    selector2 = FeatureSelector(LinearRegression(),
+                                listed,
+                                cv=3)
+    selector2.fit(X, Y)
+
+    assert selector1.selected_state_ == selector2.selected_state_
+    assert selector1.results_ == selector2.results_
+    assert selector1.n_evaluations_ == selector2.n_evaluations_ == 2**p
+
+def test_cache_scores():
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 8
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='both',
+                                   max_features=p)
+
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    selector1.fit(X, Y)
+    assert selector1.cache_hits_ == 0
+
+    selector2 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3,
+                                cache_scores=True)
+    selector2.fit(X, Y)
+
+    assert selector1.selected_state_ == selector2.selected_state_
+    assert selector1.results_ == selector2.results_
+    assert selector2.cache_hits_ > 0
+    assert (selector2.cache_hits_ + selector2.cache_misses_ ==
+            sum([len(list(strategy.candidate_states(state)))
+                 for state, _, _ in selector2.path_[:-1]]) + 1)
+
+    selector3 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3,
+                                cache_scores=True,
+                                max_cache_size=2)
+    selector3.fit(X, Y)
+    assert selector1.results_ == selector3.results_
+    assert len(selector3._cache.scores) == 2
+
+    # evicted states are scored again, and scores taken
+    # from the cache are those computed afresh
+
+    assert selector3.cache_misses_ > selector2.cache_misses_
+    fresh = dict([(frozenset(state), metrics['scores']) for state, metrics
+                  in selector1.get_metric_dict().items()])
+    for key, scores in selector3._cache.scores.items():
+        np.testing.assert_allclose(scores, fresh[key])
+    for state, metrics in selector3.get_metric_dict().items():
+        np.testing.assert_allclose(metrics['scores'],
+                                   fresh[frozenset(state)])
+
+def test_checkpoint_resume(tmpdir):
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 8
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='both',
+                                   max_features=p)
+
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    selector1.fit(X, Y)
+
+    # interrupt after the first iteration
+
+    checkpoint_file = str(tmpdir.join('search.pkl'))
+    selector2 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3,
+                                checkpoint_file=checkpoint_file)
+    selector2._TESTING_INTERRUPT_MODE = True
+    selector2.fit(X, Y)
+    assert selector2.interrupted_
+    assert len(selector2.path_) == 2
+
+    selector2._TESTING_INTERRUPT_MODE = False
+    selector2.fit(X, Y, resume_from=checkpoint_file)
+    assert not selector2.interrupted_
+    assert selector1.selected_state_ == selector2.selected_state_
+    assert selector1.results_ == selector2.results_
+
+    # interrupt part way through an iteration
+
+    selector3 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3,
+                                checkpoint_file=checkpoint_file,
+                                checkpoint_every=2)
+    score_states = selector3._score_states
+    calls = []
+
+    def interrupted_score_states(*args, **kwargs):
+        calls.append(len(args[1]))
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return score_states(*args, **kwargs)
+
+    selector3._score_states = interrupted_score_states
+    selector3.fit(X, Y)
+    assert selector3.interrupted_
+
+    del selector3._score_states
+    selector3.fit(X, Y, resume_from=checkpoint_file)
+    assert selector1.selected_state_ == selector3.selected_state_
+    assert selector1.results_ == selector3.results_
+    # the candidates scored before the interruption are not rescored
+    assert len(selector3._resumed) == 0
+
+def test_parallel_unit_fold():
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 6
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] + rng.standard_normal(n)
+    W = rng.uniform(0.5, 1.5, n)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=p)
+
+    for fit_params in [{}, {'sample_weight': W}]:
+        selector1 = FeatureSelector(LinearRegression(),
+                                    strategy,
+                                    cv=4)
+        selector1.fit(X, Y, **fit_params)
+
+        selector2 = FeatureSelector(LinearRegression(),
+                                    strategy,
+                                    cv=4,
+                                    n_jobs=2,
+                                    parallel_unit='fold')
+        selector2.fit(X, Y, **fit_params)
+
+        assert selector1.selected_state_ == selector2.selected_state_
+        for state in selector1.results_:
+            np.testing.assert_allclose(selector1.results_[state],
+                                       selector2.results_[state])
+
+    with pytest.raises(ValueError):
+        FeatureSelector(LinearRegression(),
+                        strategy,
+                        parallel_unit='bogus')
+
+def test_racing():
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 12
+    X = rng.standard_normal((n, p))
+    Y = 2 * X[:,0] + X[:,1] + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=p)
+
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=5)
+    selector1.fit(X, Y)
+
+    selector2 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=5,
+                                racing=True)
+    selector2.fit(X, Y)
+
+    assert selector1.selected_state_ == selector2.selected_state_
+    assert len(selector2.pruned_) > 0
+    for state, iteration, n_folds, scores in selector2.pruned_:
+        assert state not in selector2.results_
+        assert 2 <= n_folds < 5
+        assert scores.shape == (n_folds,)
+    for state in selector2.results_:
+        np.testing.assert_allclose(selector1.results_[state],
+                                   selector2.results_[state])
+
+    with pytest.raises(ValueError):
+        FeatureSelector(LinearRegression(),
+                        strategy,
+                        racing=True,
+                        racing_min_folds=1)
+
+def test_beam_search():
+
+    rng = np.random.RandomState(1)
+    n, p = 80, 8
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] - X[:,2] + rng.standard_normal(n)
+
+    greedy = Stepwise.first_peak(X,
+                                 direction='forward',
+                                 max_features=p,
+                                 parsimonious=False)
+    selector1 = FeatureSelector(LinearRegression(),
+                                greedy,
+                                cv=3)
+    selector1.fit(X, Y)
+
+    strategy = beam_search(X,
+                           beam_width=1,
+                           direction='forward',
+                           max_features=p,
+                           parsimonious=False)
+    selector2 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    selector2.fit(X, Y)
+    assert selector1.selected_state_ == selector2.selected_state_
+
+    strategy = beam_search(X,
+                           beam_width=3,
+                           direction='both',
+                           max_features=p,
+                           parsimonious=False)
+    selector3 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    selector3.fit(X, Y)
+
+    # each state is scored at most once
+    states = [frozenset(state) for state in selector3.results_]
+    assert len(states) == len(set(states))
+    assert (selector3.results_[selector3.selected_state_] >=
+            selector1.results_[selector1.selected_state_])
+
+    # refitting restarts the beam
+    selector3.fit(X, Y)
+    assert len(selector3.results_) == len(states)
+
+    # states proposed but not scored are proposed again
+    search = BeamSearch(X, 'forward', beam_width=2, max_features=p)
+    initial = ()
+    search.check_finished({}, [], None, [(initial, 0, np.zeros(3))])
+    candidates = search.candidate_states(initial)
+    assert search.candidate_states(initial) == candidates
+    scored = [(state, 1, np.zeros(3)) for state in candidates[:3]]
+    search.check_finished({0: None}, [], scored[0], scored)
+    assert not set(candidates[:3]) & set(search.candidate_states(initial))
+
+def test_branch_and_bound():
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 10
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] - X[:,2] + 0.5 * X[:,3] + rng.standard_normal(n)
+
+    for k in [2, 4]:
+        bnb = BranchAndBound(X,
+                             min_features=k,
+                             max_features=k)
+        selector1 = FeatureSelector(LinearRegression(),
+                                    bnb.strategy(),
+                                    scoring='r2',
+                                    cv=None)
+        selector1.fit(X, Y)
+
+        selector2 = FeatureSelector(LinearRegression(),
+                                    exhaustive(X,
+                                               min_features=k,
+                                               max_features=k,
+                                               parsimonious=False),
+                                    scoring='r2',
+                                    cv=None)
+        selector2.fit(X, Y)
+
+        assert selector1.selected_state_ == selector2.selected_state_
+        assert bnb.n_pruned_ > 0
+        n_size_k = len([state for state in selector1.results_
+                        if len(state) == k])
+        assert n_size_k + bnb.n_pruned_ == comb(p, k)
+
+    # penalized search over all sizes keeping a fixed feature
+
+    bnb = BranchAndBound(X,
+                         min_features=1,
+                         max_features=p,
+                         fixed_features=[5],
+                         penalty=lambda k: 0.01 * k)
+    selector = FeatureSelector(LinearRegression(),
+                               bnb.strategy(),
+                               scoring='r2',
+                               cv=None)
+    selector.fit(X, Y)
+    assert selector.selected_state_ == (0, 1, 2, 3, 5)
+    assert bnb.n_evaluated_ + bnb.n_pruned_ == 2**(p-1)
+
+    # without a penalty the best subset of every size is found
+
+    p = 8
+    bnb = BranchAndBound(X[:,:p],
+                         min_features=1,
+                         max_features=p)
+    selector1 = FeatureSelector(LinearRegression(),
+                                bnb.strategy(),
+                                scoring='r2',
+                                cv=None)
+    selector1.fit(X[:,:p], Y)
+
+    selector2 = FeatureSelector(LinearRegression(),
+                                exhaustive(X[:,:p],
+                                           min_features=1,
+                                           max_features=p,
+                                           parsimonious=False),
+                                scoring='r2',
+                                cv=None)
+    selector2.fit(X[:,:p], Y)
+
+    assert bnb.n_pruned_ > 0
+    assert bnb.n_evaluated_ + bnb.n_pruned_ == 2**p - 1
+    for k in range(1, p + 1):
+        best1 = max([state for state in selector1.results_
+                     if len(state) == k],
+                    key=selector1.results_.get)
+        best2 = max([state for state in selector2.results_
+                     if len(state) == k],
+                    key=selector2.results_.get)
+        assert best1 == best2
+        np.testing.assert_allclose(selector1.results_[best1],
+                                   selector2.results_[best2])
+
+def test_callback():
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 6
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=p)
+
+    for n_jobs, parallel_unit in [(1, 'candidate'),
+                                  (2, 'candidate'),
+                                  (2, 'fold')]:
+        reported = []
+
+        def callback(state, iteration, scores, n_done, n_total):
+            reported.append((state, iteration, n_done, n_total))
+
+        selector = FeatureSelector(LinearRegression(),
+                                   strategy,
+                                   cv=3,
+                                   n_jobs=n_jobs,
+                                   parallel_unit=parallel_unit,
+                                   callback=callback)
+        selector.fit(X, Y)
+
+        assert not selector.stopped_
+        assert (sorted([tuple(state) for state, _, _, _ in reported]) ==
+                sorted(selector.results_))
+        for _, iteration, n_done, n_total in reported:
+            assert 1 <= n_done <= n_total
+
+    # stop after the first batch of the search
+
+    def stop(state, iteration, scores, n_done, n_total):
+        return iteration == 1 and n_done == 2
+
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=3,
+                               callback=stop)
+    selector.fit(X, Y)
+    assert selector.stopped_
+    assert len(selector.results_) == 3
+
+    reporter = ProgressReporter(every=2)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=3,
+                               callback=reporter)
+    selector.fit(X, Y)
+    assert reporter.n_reported == len(selector.results_)
+    np.testing.assert_allclose(reporter.best_score,
+                               max(selector.results_.values()))
+
+def test_budgets():
+
+    rng = np.random.RandomState(0)
+    n, p = 50, 6
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + rng.standard_normal(n)
+
+    strategy = exhaustive(X,
+                          max_features=p,
+                          parsimonious=False)
+
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=3)
+    selector.fit(X, Y)
+    assert not selector.interrupted_
+    assert selector.n_evaluations_ == 2**p
+
+    for kwargs in [{'n_jobs': 1}, {'n_jobs': 2}, {'parallel_unit': 'fold'}]:
+        selector = FeatureSelector(LinearRegression(),
+                                   strategy,
+                                   cv=3,
+                                   max_evaluations=10,
+                                   **kwargs)
+        selector.fit(X, Y)
+        assert selector.interrupted_
+        assert selector.n_evaluations_ == 10
+        assert len(selector.results_store_) == 10
+        best = max(selector.results_, key=selector.results_.get)
+        assert selector.selected_state_ == best
+
+    # candidates abandoned by racing count as full evaluations
+
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=5,
+                               racing=True,
+                               racing_z=1.,
+                               max_evaluations=10)
+    selector.fit(X, Y)
+    assert selector.interrupted_
+    assert selector.n_evaluations_ == 10
+    assert len(selector.pruned_) > 0
+    assert len(selector.results_store_) + len(selector.pruned_) == 10
+    assert len(selector.timings_) == 10
+
+    # with no time left only the initial state is scored
+
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=3,
+                               max_time=0)
+    selector.fit(X, Y)
+    assert selector.interrupted_
+    assert selector.n_evaluations_ == 1
+    assert selector.selected_state_ == strategy.initial_state
+
+    with pytest.raises(ValueError):
+        FeatureSelector(LinearRegression(),
+                        strategy,
+                        max_evaluations=0)
+
+def test_bitset_candidates():
+
+    # candidates match the set based enumeration
+
+    def stepwise_reference(step, state):
+        state = set(state)
+        fixed = step.fixed_features
+        forward, backward = [], []
+        if len(state) < step.max_features:
+            forward = [tuple(sorted(state | set([c]))) for c in step.columns
+                       if c not in state and fixed.issubset(state | set([c]))]
+        if len(state) > step.min_features:
+            backward = [tuple(sorted(state ^ set([c]))) for c in step.columns
+                        if c in state and fixed.issubset(state ^ set([c]))]
+        return {'forward': forward,
+                'backward': backward,
+                'both': forward + backward}[step.direction]
+
+    rng = np.random.RandomState(0)
+    X = rng.standard_normal((10, 7))
+
+    for fixed_features in [None, [2], [1, 5]]:
+        for direction in ['forward', 'backward', 'both']:
+            step = Stepwise(X,
+                            direction,
+                            min_features=1,
+                            max_features=5,
+                            fixed_features=fixed_features)
+            for state in [(), (3,), (5, 1), (0, 2, 4), (1, 2, 3, 5, 6)]:
+                assert (list(step.candidate_states(state)) ==
+                        stepwise_reference(step, state))
+
+        strategy = exhaustive(X,
+                              min_features=1,
+                              max_features=4,
+                              fixed_features=fixed_features)
+        fixed = set(fixed_features or [])
+        expected = [c for i in range(1, 5)
+                    for c in combinations(range(7), i)
+                    if fixed.issubset(c)]
+        assert list(strategy.candidate_states(None)) == expected
+
+def test_exhaustive_shards():
+
+    rng = np.random.RandomState(0)
+    n, p = 50, 6
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,4] + rng.standard_normal(n)
+
+    strategy = exhaustive(X,
+                          min_features=1,
+                          max_features=4,
+                          fixed_features=[4])
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                cv=3)
+    selector1.fit(X, Y)
+
+    n_candidates = MinMaxCandidates(X,
+                                    min_features=1,
+                                    max_features=4,
+                                    fixed_features=[4]).n_candidates()
+    assert n_candidates == len(list(strategy.candidate_states(None)))
+
+    shards = []
+    for rank_range in shard_ranges(n_candidates, 3):
+        shard = exhaustive(X,
+                           min_features=1,
+                           max_features=4,
+                           fixed_features=[4],
+                           rank_range=rank_range)
+        selector = FeatureSelector(LinearRegression(),
+                                   shard,
+                                   cv=3)
+        shards.append(selector.fit(X, Y))
+
+    merged = shards[0].merge(*shards[1:])
+    assert merged.selected_state_ == selector1.selected_state_
+    assert merged.results_ == selector1.results_
+
+    # the initial state each shard scores is counted once
+
+    assert merged.n_evaluations_ == selector1.n_evaluations_
+    assert len(merged.results_store_) == len(selector1.results_store_)
+    assert len(merged.timings_) == len(selector1.timings_)
+
+    # more shards than candidates leaves no shard empty
+
+    ranges = shard_ranges(n_candidates, n_candidates + 5)
+    assert len(ranges) == n_candidates
+    assert all([start < stop for start, stop in ranges])
+
+def test_warm_start():
+
+    rng = np.random.RandomState(0)
+    n, p = 200, 6
+    X = rng.standard_normal((n, p))
+    Y = (X[:,0] + X[:,1] - X[:,2] + rng.standard_normal(n) > 0).astype(int)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='both',
+                                   max_features=p,
+                                   parsimonious=False)
+
+    selector1 = FeatureSelector(LogisticRegression(tol=1e-8),
+                                strategy,
+                                cv=3)
+    selector1.fit(X, Y)
+
+    selector2 = FeatureSelector(LogisticRegression(tol=1e-8),
+                                strategy,
+                                cv=3,
+                                warm_start=True)
+    selector2.fit(X, Y)
+
+    assert selector1.selected_state_ == selector2.selected_state_
+    for state in selector1.results_:
+        np.testing.assert_allclose(selector1.results_[state],
+                                   selector2.results_[state],
+                                   atol=0.02)
+
+    # coefficients of the last batch are kept per fold
+    coefs = selector2._warm_coefs[frozenset(selector2.path_[-1][0])]
+    assert len(coefs) == 3
+    assert coefs[0][0].shape == (1, len(selector2.path_[-1][0]))
+
+    # warm started mlxtend estimators reach the same scores
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=p,
+                                   parsimonious=False)
+    selectors = []
+    for warm_start in [False, True]:
+        selector = FeatureSelector(SoftmaxRegression(epochs=20,
+                                                     eta=0.01,
+                                                     minibatches=20,
+                                                     random_seed=1),
+                                   strategy,
+                                   scoring='accuracy',
+                                   cv=3,
+                                   warm_start=warm_start)
+        selectors.append(selector.fit(X, Y))
+    cold, warm = selectors
+    assert warm._warm_coefs
+    common = set(cold.results_) & set(warm.results_)
+    assert len(common) > p
+    for state in common:
+        np.testing.assert_allclose(cold.results_[state],
+                                   warm.results_[state],
+                                   atol=0.02)
+
+    # with no epochs (or a huge `tol`) the fitted
+    # coefficients are those seeded
+
+    rows = np.arange(n)
+    for estimator, init, warm_spec in [
+            (SoftmaxRegression(epochs=0),
+             (np.array([[1., -1.], [2., -2.]]), np.array([0.5, -0.5])),
+             ('w_', 'b_', 0, True)),
+            (LogisticRegression(tol=1e10),
+             (np.array([[1., -1.]]), np.array([0.5])),
+             ('coef_', 'intercept_', -1, False))]:
+        _, coefs = _calc_warm_fold_score(estimator,
+                                         get_scorer('accuracy'),
+                                         lambda X, state: X[:, list(state)],
+                                         X,
+                                         Y,
+                                         (0, 1),
+                                         rows,
+                                         rows,
+                                         init,
+                                         warm_spec)
+        np.testing.assert_array_equal(coefs[0], init[0])
+        np.testing.assert_array_equal(coefs[1], init[1])
+
+    # estimators with a `warm_start` parameter but
+    # no coefficients are fit as usual
+
+    from sklearn.ensemble import RandomForestRegressor
+
+    Y = X[:,0] + rng.standard_normal(n)
+    selectors = []
+    for warm_start in [False, True]:
+        selector = FeatureSelector(RandomForestRegressor(n_estimators=5,
+                                                         random_state=0),
+                                   strategy,
+                                   cv=3,
+                                   warm_start=warm_start)
+        selectors.append(selector.fit(X, Y))
+    cold, warm = selectors
+    assert not warm._warm_coefs
+    assert cold.selected_state_ == warm.selected_state_
+    assert set(cold.results_) == set(warm.results_)
+    for state in cold.results_:
+        np.testing.assert_allclose(cold.results_[state],
+                                   warm.results_[state])
+
+def test_child_coefs():
+
+    column_index = {0: [0], 1: [1, 2], 2: [3]}
+    coef = np.array([[1., 2., 3.]])
+    child, intercept = _child_coefs((0, 1),
+                                    (coef, np.array([0.5])),
+                                    (1, 2),
+                                    column_index,
+                                    -1)
+    np.testing.assert_array_equal(child, [[2., 3., 0.]])
+    np.testing.assert_array_equal(intercept, [0.5])
+
+    child, _ = _child_coefs((1,),
+                            (np.array([[1.], [2.]]), np.zeros(1)),
+                            (0, 1),
+                            column_index,
+                            0)
+    np.testing.assert_array_equal(child, [[0.], [1.], [2.]])
+
+
+class _SlowConstant(LinearRegression):
+
+    """
+    Slow to fit models containing a constant column of 7s.
+    """
+
+    def fit(self, X, y, sample_weight=None):
+        if np.any(np.all(np.asarray(X) == 7, 0)):
+            time.sleep(0.1)
+        return super().fit(X, y, sample_weight=sample_weight)
+
+def test_speculative():
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 6
+    X = rng.standard_normal((n, p))
+    X[:,-1] = 7
+    Y = X[:,0] + 0.5 * X[:,1] + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X, max_features=p)
+
+    with parallel_backend('threading'):
+        selectors = [FeatureSelector(_SlowConstant(),
+                                     strategy,
+                                     cv=3,
+                                     n_jobs=2,
+                                     speculative=speculative).fit(X, Y)
+                     for speculative in [False, True]]
+
+    # the slow candidate of each step leaves a worker free to
+    # score the children of the leading candidate
+
+    plain, speculative = selectors
+    assert plain.n_speculative_ == 0
+    assert speculative.n_speculative_used_ > 0
+    assert speculative.n_speculative_used_ <= speculative.n_speculative_
+    assert len(speculative.timings_) == speculative.n_evaluations_
+    assert speculative.selected_state_ == plain.selected_state_
+    assert set(speculative.results_) == set(plain.results_)
+    for state in plain.results_:
+        np.testing.assert_allclose(speculative.results_[state],
+                                   plain.results_[state])
+
+    # strategies whose candidates depend on more than
+    # the current state are never speculated on
+
+    selector = FeatureSelector(LinearRegression(),
+                               beam_search(X, max_features=p),
+                               cv=3,
+                               n_jobs=2,
+                               speculative=True)
+    selector.fit(X, Y)
+    assert selector.n_speculative_ == 0
+
+    with pytest.raises(ValueError):
+        FeatureSelector(LinearRegression(),
+                        strategy,
+                        speculative_min_fraction=0)
+
+def test_multi_target():
+
+    rng = np.random.RandomState(0)
+    n, p, T = 100, 6, 3
+    X = rng.standard_normal((n, p))
+    Y = np.column_stack([X[:,t] + X[:,t+1] + rng.standard_normal(n)
+                         for t in range(T)])
+
+    selected = []
+    for make_strategy in [lambda: Stepwise.first_peak(X, max_features=p),
+                          lambda: beam_search(X,
+                                              beam_width=2,
+                                              max_features=p)]:
+
+        selector = FeatureSelector(LinearRegression(),
+                                   make_strategy(),
+                                   cv=3,
+                                   multi_target=True)
+        selector.fit(X, [Y[:,t] for t in range(T)])
+
+        singles = [FeatureSelector(LinearRegression(),
+                                   make_strategy(),
+                                   cv=3).fit(X, Y[:,t])
+                   for t in range(T)]
+
+        # states proposed for several targets are scored once
+
+        assert selector.n_evaluations_ < sum([s.n_evaluations_
+                                              for s in singles])
+        assert len(selector.timings_) == selector.n_evaluations_
+        assert selector.selected_state_ == [s.selected_state_
+                                            for s in singles]
+        selected.append(selector.selected_state_)
+        for target_selector, single in zip(selector.selectors_, singles):
+            assert set(target_selector.results_) == set(single.results_)
+            for state in single.results_:
+                np.testing.assert_allclose(target_selector.results_[state],
+                                           single.results_[state])
+            np.testing.assert_allclose(target_selector.transform(X),
+                                       single.transform(X))
+
+    selector = FeatureSelector(LinearRegression(),
+                               Stepwise.first_peak(X, max_features=p),
+                               cv=3,
+                               n_jobs=2,
+                               multi_target=True)
+    selector.fit(X, Y)
+    assert selector.selected_state_ == selected[0]
+
+    with pytest.raises(ValueError):
+        selector.transform(X)
+
+    for kwargs in [{'cache_scores': True},
+                   {'parallel_unit': 'fold'}]:
+        with pytest.raises(ValueError):
+            FeatureSelector(LinearRegression(),
+                            Stepwise.first_peak(X, max_features=p),
+                            multi_target=True,
+                            **kwargs).fit(X, Y)
+
+    # budgets and interruptions stop all targets as they
+    # stop a single search
+
+    selector = FeatureSelector(LinearRegression(),
+                               Stepwise.first_peak(X, max_features=p),
+                               cv=3,
+                               max_evaluations=p + 1,
+                               multi_target=True).fit(X, Y)
+    assert selector.interrupted_ and not selector.finished_
+    assert [len(path) for path in selector.path_] == [2] * T
+
+    selector = FeatureSelector(LinearRegression(),
+                               Stepwise.first_peak(X, max_features=p),
+                               cv=3,
+                               multi_target=True)
+    selector._TESTING_INTERRUPT_MODE = True
+    selector.fit(X, Y)
+    assert selector.interrupted_
+    assert [len(path) for path in selector.path_] == [2] * T
+
+def test_random_stepwise():
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 30
+    X = rng.standard_normal((n, p))
+    Y = X[:,0] + X[:,1] + rng.standard_normal(n)
+
+    for weighted in [False, True]:
+        strategy = random_stepwise(X,
+                                   max_candidates=5,
+                                   weighted=weighted,
+                                   random_state=2,
+                                   max_features=p)
+        selectors = [FeatureSelector(LinearRegression(),
+                                     strategy,
+                                     cv=3).fit(X, Y) for _ in range(2)]
+
+        # at most 5 candidates per step, drawn the same way on refitting
+
+        iterations = [t.iteration for t in selectors[0].timings_]
+        assert max(np.bincount(iterations)[1:]) == 5
+        assert ([state for state, _, _ in selectors[0].path_] ==
+                [state for state, _, _ in selectors[1].path_])
+        assert set(selectors[0].results_) == set(selectors[1].results_)
+
+    # with a budget above the number of neighbours this is first_peak
+
+    selector = FeatureSelector(LinearRegression(),
+                               random_stepwise(X,
+                                               max_candidates=p,
+                                               max_features=p),
+                               cv=3).fit(X, Y)
+    expected = FeatureSelector(LinearRegression(),
+                               Stepwise.first_peak(X, max_features=p),
+                               cv=3).fit(X, Y)
+    assert selector.selected_state_ == expected.selected_state_
+    assert set(selector.results_) == set(expected.results_)
+
+    # a draw without an improving column is followed by
+    # up to max_redraws draws among the other neighbours
+
+    paths, evaluations = [], []
+    for max_redraws in [0, 1]:
+        selector = FeatureSelector(LinearRegression(),
+                                   random_stepwise(X,
+                                                   max_candidates=np.int64(5),
+                                                   random_state=2,
+                                                   max_features=p,
+                                                   max_redraws=max_redraws),
+                                   cv=3).fit(X, Y)
+        states = [state for state, _, _ in selector.results_store_]
+        assert len(set(states)) == len(states)
+        paths.append([state for state, _, _ in selector.path_])
+        evaluations.append(selector.n_evaluations_)
+    assert paths[0] == [(), (1,), (1, 22)]
+    assert paths[1][:3] == [(), (1,), (1, 19)]
+    assert evaluations[1] > evaluations[0]
+
+    # redraws do not repeat the current state in the path
+
+    for path in paths:
+        assert all([a != b for a, b in zip(path[:-1], path[1:])])
+
+    for kwargs in [{'max_candidates': 0},
+                   {'max_candidates': 2.},
+                   {'max_redraws': -1}]:
+        with pytest.raises(ValueError):
+            random_stepwise(X, **kwargs)
+
+def test_marginal_screen():
+
+    from sklearn.feature_selection import f_regression
+    from scipy.stats import f_oneway
+
+    rng = np.random.RandomState(0)
+    n, p = 200, 20
+    X = rng.standard_normal((n, p))
+    X[:,3] = rng.randint(0, 4, n)
+    Y = X[:,0] + X[:,1] + (X[:,3] == 2) + rng.standard_normal(n)
+    categorical = np.zeros(p, bool)
+    categorical[3] = True
+
+    screen = marginal_screen(X,
+                             Y,
+                             3,
+                             categorical_features=categorical,
+                             fixed_features=[10])
+
+    numeric = [j for j in range(p) if j != 3]
+    F, pvalues = f_regression(X[:,numeric], Y)
+    np.testing.assert_allclose([screen.statistics[j] for j in numeric], F)
+    np.testing.assert_allclose([screen.pvalues[j] for j in numeric],
+                               pvalues)
+    F3 = f_oneway(*[Y[X[:,3] == level] for level in range(4)])[0]
+    np.testing.assert_allclose(screen.statistics[3], F3)
+
+    assert screen.columns == [0, 1, 3, 10]
+
+    # the search only considers the screened columns and keeps the fixed one
+
+    strategy = Stepwise.first_peak(X,
+                                   max_features=p,
+                                   fixed_features=[10],
+                                   initial_features=[10],
+                                   categorical_features=categorical,
+                                   candidate_features=screen.columns)
+    selector = FeatureSelector(LinearRegression(), strategy, cv=3)
+    selector.fit(X, Y)
+    assert set([0, 1, 10]) <= set(selector.selected_state_)
+    for state in selector.results_:
+        assert 10 in state
+        assert set(state) <= set(screen.columns)
+    assert strategy.build_submodel(X, (0, 1, 3, 10)).shape == (n, 3 + 3)
+
+    # exhaustive search starts from the screened columns
+
+    strategy = exhaustive(X,
+                          min_features=1,
+                          max_features=2,
+                          categorical_features=categorical,
+                          candidate_features=screen.columns)
+    assert set(strategy.initial_state) <= set(screen.columns)
+    selector = FeatureSelector(LinearRegression(), strategy, cv=3)
+    selector.fit(X, Y)
+    for state in selector.results_:
+        assert set(state) <= set(screen.columns)
+
+    # initial features must be among the candidate (or fixed)
+    # features, and fixed features must be columns of X
+
+    for make_strategy in [Stepwise.first_peak,
+                          partial(Stepwise.fixed_size, model_size=2),
+                          beam_search,
+                          random_stepwise]:
+        with pytest.raises(ValueError):
+            make_strategy(X,
+                          max_features=p,
+                          initial_features=[7],
+                          candidate_features=screen.columns)
+        with pytest.raises(ValueError):
+            make_strategy(X,
+                          max_features=p,
+                          fixed_features=[p],
+                          initial_features=[p])
+
+    with pytest.raises(ValueError):
+        marginal_screen(X, Y, 3, statistic='mutual_info')
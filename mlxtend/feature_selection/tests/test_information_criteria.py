@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression, LogisticRegression
+
+from mlxtend.feature_selection.generic_selector import FeatureSelector
+from mlxtend.feature_selection.information_criteria import ICScorer
+from mlxtend.feature_selection.strategy import Stepwise
+
+
+def test_gaussian_ic():
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 5
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] - X[:, 1] + rng.standard_normal(n)
+
+    lm = LinearRegression().fit(X[:, :2], Y)
+    rss = np.sum((Y - lm.predict(X[:, :2]))**2)
+    loglik = -n / 2 * (np.log(2 * np.pi * rss / n) + 1)
+
+    np.testing.assert_allclose(ICScorer('aic')(lm, X[:, :2], Y),
+                               2 * loglik - 2 * 3)
+    np.testing.assert_allclose(ICScorer('bic')(lm, X[:, :2], Y),
+                               2 * loglik - np.log(n) * 3)
+    np.testing.assert_allclose(ICScorer('cp', sigma2=2.)(lm, X[:, :2], Y),
+                               -(rss / 2. - n + 2 * 3))
+
+    with pytest.raises(ValueError):
+        ICScorer('cp')(lm, X[:, :2], Y)
+    with pytest.raises(ValueError):
+        ICScorer('hqic')
+
+    # a column of zeros (with a zero coefficient) still
+    # counts, except as the empty model
+
+    X_0 = np.column_stack([X[:, :2], np.zeros(n)])
+    lm_0 = LinearRegression().fit(X_0, Y)
+    assert lm_0.coef_[2] == 0
+    np.testing.assert_allclose(ICScorer('aic')(lm_0, X_0, Y),
+                               2 * loglik - 2 * 4)
+    X_empty = np.zeros((n, 1))
+    lm_empty = LinearRegression().fit(X_empty, Y)
+    rss = np.sum((Y - Y.mean())**2)
+    np.testing.assert_allclose(ICScorer('aic')(lm_empty, X_empty, Y),
+                               -n * (np.log(2 * np.pi * rss / n) + 1) - 2)
+
+
+def test_shared_scorer():
+
+    # estimating sigma2 leaves a scorer shared by
+    # several selectors unchanged
+
+    rng = np.random.RandomState(0)
+    n, p = 100, 4
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] + rng.standard_normal(n)
+
+    scorer = ICScorer('cp')
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=p)
+    sigma2 = []
+    for scale in [1, 3]:
+        selector = FeatureSelector(LinearRegression(),
+                                   strategy,
+                                   scoring=scorer,
+                                   cv=None)
+        selector.fit(X, scale * Y)
+        sigma2.append(selector.scorer.sigma2_)
+        assert selector.scorer is not scorer
+    assert scorer.sigma2_ is None
+    np.testing.assert_allclose(sigma2[1], 9 * sigma2[0])
+
+
+@pytest.mark.parametrize('scoring', ['neg_aic', 'neg_bic', 'neg_mallows_cp'])
+def test_ic_selection(scoring):
+
+    rng = np.random.RandomState(0)
+    n, p = 200, 6
+    X = np.column_stack([rng.standard_normal((n, p)),
+                         rng.choice(3, n)])
+    Y = X[:, 0] - X[:, 1] + 2 * (X[:, p] == 1) + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=X.shape[1],
+                                   categorical_features=[p],
+                                   parsimonious=False)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               scoring=scoring,
+                               cv=None)
+    selector.fit(X, Y)
+    assert set(selector.selected_state_) == set([0, 1, p])
+
+    # the categorical block counts one degree of freedom
+    # per column of its encoding
+
+    X_C = strategy.build_submodel(X, (p,))
+    lm = LinearRegression().fit(X_C, Y)
+    scorer = ICScorer('aic')
+    rss = np.sum((Y - lm.predict(X_C))**2)
+    loglik = -n / 2 * (np.log(2 * np.pi * rss / n) + 1)
+    np.testing.assert_allclose(scorer(lm, X_C, Y),
+                               2 * loglik - 2 * (X_C.shape[1] + 1))
+
+
+def test_ic_classifier():
+
+    rng = np.random.RandomState(0)
+    n, p = 200, 5
+    X = rng.standard_normal((n, p))
+    Y = (X[:, 0] + rng.standard_normal(n) > 0).astype(int)
+
+    strategy = Stepwise.first_peak(X,
+                                   direction='forward',
+                                   max_features=p,
+                                   parsimonious=False)
+    selector = FeatureSelector(LogisticRegression(),
+                               strategy,
+                               scoring='neg_bic',
+                               cv=None)
+    selector.fit(X, Y)
+    assert 0 in selector.selected_state_
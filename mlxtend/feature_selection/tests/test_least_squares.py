@@ -0,0 +1,150 @@
+import pytest
+
+import numpy as np
+from scipy import sparse
+from sklearn.linear_model import LinearRegression, Ridge
+from mlxtend.feature_selection.generic_selector import FeatureSelector
+from mlxtend.feature_selection.strategy import Stepwise, exhaustive
+from mlxtend.feature_selection.least_squares import (IncrementalLeastSquares,
+                                                     GramLeastSquares)
+
+
+def _compare_results(selector1, selector2):
+    assert selector1.selected_state_ == selector2.selected_state_
+    assert selector1.results_.keys() == selector2.results_.keys()
+    for state in selector1.results_:
+        np.testing.assert_allclose(selector1.results_[state],
+                                   selector2.results_[state])
+
+
+@pytest.mark.parametrize('direction', ['forward', 'backward', 'both'])
+@pytest.mark.parametrize('scoring', ['r2', 'neg_mean_squared_error'])
+@pytest.mark.parametrize('cv', [None, 4])
+def test_incremental(direction, scoring, cv):
+
+    rng = np.random.RandomState(0)
+    n, p = 80, 8
+    X = rng.standard_normal((n, p))
+    X[:, 0] = rng.choice(range(4), (n,), replace=True)
+    Y = X[:, 1] + 0.5 * X[:, 4] + rng.standard_normal(n)
+
+    categorical_features = [True] + [False]*(p-1)
+    if direction == 'backward':
+        initial_features = range(p)
+    else:
+        initial_features = [2]
+    strategy = Stepwise.first_peak(X,
+                                   direction=direction,
+                                   min_features=1,
+                                   max_features=p,
+                                   initial_features=initial_features,
+                                   categorical_features=categorical_features,
+                                   parsimonious=False)
+
+    selector1 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                scoring=scoring,
+                                cv=cv)
+    selector1.fit(X, Y)
+
+    selector2 = FeatureSelector(LinearRegression(),
+                                strategy,
+                                scoring=scoring,
+                                cv=cv,
+                                engine=IncrementalLeastSquares())
+    selector2.fit(X, Y)
+
+    _compare_results(selector1, selector2)
+
+
+def test_incremental_checks():
+
+    n, p = 30, 4
+    X = np.random.standard_normal((n, p))
+    Y = np.random.standard_normal(n)
+    strategy = Stepwise.first_peak(X,
+                                   max_features=p)
+
+    with pytest.raises(ValueError):
+        FeatureSelector(Ridge(),
+                        strategy,
+                        engine=IncrementalLeastSquares()).fit(X, Y)
+
+    with pytest.raises(ValueError):
+        FeatureSelector(LinearRegression(),
+                        strategy,
+                        scoring='neg_mean_absolute_error',
+                        engine=IncrementalLeastSquares()).fit(X, Y)
+
+
+@pytest.mark.parametrize('estimator', [LinearRegression(),
+                                       LinearRegression(fit_intercept=False),
+                                       Ridge(alpha=3.)])
+@pytest.mark.parametrize('scoring', ['r2', 'neg_mean_squared_error'])
+@pytest.mark.parametrize('cv', [None, 3])
+def test_gram(estimator, scoring, cv):
+
+    rng = np.random.RandomState(1)
+    n, p = 60, 6
+    X = rng.standard_normal((n, p))
+    X[:, 0] = rng.choice(range(4), (n,), replace=True)
+    Y = X[:, 1] + 0.5 * X[:, 4] + rng.standard_normal(n)
+
+    categorical_features = [True] + [False]*(p-1)
+    strategy = exhaustive(X,
+                          min_features=0,
+                          max_features=p,
+                          categorical_features=categorical_features,
+                          parsimonious=False)
+
+    selector1 = FeatureSelector(estimator,
+                                strategy,
+                                scoring=scoring,
+                                cv=cv)
+    selector1.fit(X, Y)
+
+    selector2 = FeatureSelector(estimator,
+                                strategy,
+                                scoring=scoring,
+                                cv=cv,
+                                engine=GramLeastSquares(batch_size=10))
+    selector2.fit(X, Y)
+
+    _compare_results(selector1, selector2)
+
+
+@pytest.mark.parametrize('estimator', [LinearRegression(),
+                                       LinearRegression(fit_intercept=False)])
+@pytest.mark.parametrize('cv', [None, 3])
+def test_gram_sparse(estimator, cv):
+
+    rng = np.random.RandomState(2)
+    n, p = 60, 5
+    X = rng.standard_normal((n, p))
+    X[:, 0] = rng.choice(range(6), (n,), replace=True)
+    X[rng.standard_normal((n, p)) > 0.5] = 0
+    Y = X[:, 1] + 0.5 * X[:, 4] + rng.standard_normal(n)
+
+    strategy = exhaustive(X,
+                          min_features=0,
+                          max_features=p,
+                          categorical_features=[0],
+                          parsimonious=False)
+    sparse_strategy = exhaustive(sparse.csr_matrix(X),
+                                 min_features=0,
+                                 max_features=p,
+                                 categorical_features=[0],
+                                 parsimonious=False)
+
+    selector1 = FeatureSelector(estimator,
+                                strategy,
+                                cv=cv)
+    selector1.fit(X, Y)
+
+    selector2 = FeatureSelector(estimator,
+                                sparse_strategy,
+                                cv=cv,
+                                engine=GramLeastSquares(batch_size=10))
+    selector2.fit(sparse.csr_matrix(X), Y)
+
+    _compare_results(selector1, selector2)
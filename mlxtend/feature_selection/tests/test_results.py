@@ -0,0 +1,136 @@
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from mlxtend.feature_selection.generic_selector import FeatureSelector
+from mlxtend.feature_selection.results import (ResultsStore,
+                                               best_row,
+                                               best_row_1sd)
+from mlxtend.feature_selection.strategy import (exhaustive,
+                                                _postprocess_best,
+                                                _postprocess_best_1sd)
+
+
+def test_store_roundtrip():
+
+    rng = np.random.RandomState(0)
+    results = [((), 0, rng.standard_normal(3)),
+               ((0,), 1, rng.standard_normal(3)),
+               ((0, 3), 2, rng.standard_normal(3)),
+               ((3, 0), 2, rng.standard_normal(3)),
+               (('a', 1), 3, rng.standard_normal(1)),
+               ((0, 3), 4, np.array([np.nan, 1., 2.]))]
+
+    store = ResultsStore(columns=range(4))
+    store.extend(results[:2])
+    store.extend(results[2:])
+
+    assert len(store) == len(results)
+    for (state, iteration, scores), stored in zip(results, store):
+        assert stored[0] == state
+        assert stored[1] == iteration
+        np.testing.assert_array_equal(stored[2], scores)
+
+    np.testing.assert_allclose(store.avg_scores,
+                               [np.nanmean(s) for _, _, s in results])
+    np.testing.assert_array_equal(store.sizes, [0, 1, 2, 2, 2, 2])
+    assert store.masks.shape == (6, 1)
+    assert store.states() == [state for state, _, _ in results]
+    assert store.states(2, 4) == [(0, 3), (3, 0)]
+    taken = store.take([1, 3, 4])
+    assert taken.states() == [(0,), (3, 0), ('a', 1)]
+    np.testing.assert_array_equal(taken.iterations, [1, 2, 3])
+
+    # extending from another store keeps every result
+
+    copied = ResultsStore()
+    copied.extend(store)
+    for stored, copy in zip(store, copied):
+        assert stored[:2] == copy[:2]
+        np.testing.assert_array_equal(stored[2], copy[2])
+
+    # the view keeps the last result of repeated states
+    expected = {}
+    for state, _, scores in results:
+        expected[state] = np.nanmean(scores)
+    assert dict(store.view()) == expected
+    assert store.view() == expected
+
+
+def test_best_1sd():
+
+    # the 2-column state is within one standard error of
+    # the best, 3-column state; the 1-column state is not
+
+    results = [((0,), 1, np.array([0.1, 0.2, 0.3])),
+               ((0, 1), 2, np.array([0.4, 0.8, 1.0])),
+               ((0, 2), 2, np.array([0.6, 0.7, 0.8])),
+               ((0, 1, 2), 3, np.array([0.75, 0.8, 0.85]))]
+    store = ResultsStore()
+    store.extend(results)
+
+    assert best_row(store) == 3
+    assert best_row_1sd(store) == 1
+
+    # postprocessing keeps the choice made before the store,
+    # the best state as `_postprocess_best` does
+
+    best_state, view = _postprocess_best_1sd(results)
+    assert best_state == (0, 1, 2)
+    assert _postprocess_best(results)[0] == (0, 1, 2)
+    assert len(view) == 4
+
+
+def test_parsimonious_selection():
+
+    # under the default settings (parsimonious=True) the
+    # selected state is the best one, as with
+    # parsimonious=False, although (0,) is within one
+    # standard error of it
+
+    rng = np.random.RandomState(0)
+    n, p = 50, 5
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] + 0.2 * X[:, 1] + rng.standard_normal(n)
+
+    states = {}
+    for kwargs in [{}, {'parsimonious': False}]:
+        strategy = exhaustive(X,
+                              min_features=1,
+                              max_features=p,
+                              **kwargs)
+        selector = FeatureSelector(LinearRegression(),
+                                   strategy,
+                                   cv=5)
+        selector.fit(X, Y)
+        states[len(kwargs)] = selector.selected_state_
+        store = selector.results_store_
+        assert tuple(store.state(best_row_1sd(store))) == (0,)
+
+    assert states[0] == states[1] == (0, 1)
+
+
+def test_selector_store():
+
+    rng = np.random.RandomState(0)
+    n, p = 50, 5
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] + rng.standard_normal(n)
+
+    strategy = exhaustive(X,
+                          min_features=1,
+                          max_features=p,
+                          parsimonious=False)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=3)
+    selector.fit(X, Y)
+
+    store = selector.results_store_
+    assert len(store) == 2**p
+    # the initial state (0,) is scored again in the batch
+    assert len(selector.results_) == 2**p - 1
+    metrics = selector.get_metric_dict()
+    for state in selector.results_:
+        np.testing.assert_allclose(metrics[state]['avg_score'],
+                                   selector.results_[state])
+        assert metrics[state]['scores'].shape == (3,)
@@ -0,0 +1,39 @@
+from itertools import chain, combinations
+
+import pytest
+
+from mlxtend.feature_selection.subset_rank import (n_subsets,
+                                                   rank_subset,
+                                                   unrank_subset,
+                                                   subsets_in_range,
+                                                   shard_ranges)
+
+
+def test_rank_unrank():
+
+    n, min_features, max_features = 7, 2, 5
+    subsets = list(chain.from_iterable(combinations(range(n), r=k) for k in
+                                       range(min_features, max_features + 1)))
+    assert n_subsets(n, min_features, max_features) == len(subsets)
+
+    for rank, subset in enumerate(subsets):
+        assert rank_subset(subset, n, min_features) == rank
+        assert unrank_subset(rank, n, min_features) == subset
+
+    for start, stop in [(0, len(subsets)), (3, 40), (20, 21), (50, 1000)]:
+        assert (list(subsets_in_range(n,
+                                      min_features,
+                                      max_features,
+                                      start,
+                                      stop)) == subsets[start:stop])
+
+    with pytest.raises(ValueError):
+        unrank_subset(n_subsets(n, min_features, n), n, min_features)
+
+
+def test_shard_ranges():
+
+    ranges = shard_ranges(10, 3)
+    assert ranges == [(0, 3), (3, 6), (6, 10)]
+    assert shard_ranges(2, 3) == [(0, 1), (1, 2)]
+    assert shard_ranges(0, 3) == []
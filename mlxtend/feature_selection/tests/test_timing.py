@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from mlxtend.feature_selection import (SequentialFeatureSelector,
+                                       ExhaustiveFeatureSelector)
+from mlxtend.feature_selection.generic_selector import FeatureSelector
+from mlxtend.feature_selection.strategy import Stepwise
+from mlxtend.feature_selection.timing import (TaskTiming,
+                                              candidate_timing,
+                                              timing_summary,
+                                              timed_call,
+                                              phase,
+                                              PHASES)
+
+
+def test_candidate_timing():
+
+    tasks = [TaskTiming((1, 1), 10., 12., {'build': 0.5, 'fit': 1.}),
+             TaskTiming((2, 1), 11., 14., {'fit': 2., 'score': 0.5})]
+    timing = candidate_timing((0, 1), 3, tasks, 9., 15.)
+
+    assert timing.workers == ((1, 1), (2, 1))
+    np.testing.assert_allclose([timing.build, timing.fit, timing.score],
+                               [0.5, 3., 0.5])
+    np.testing.assert_allclose(timing.other, 5. - 4.)
+    np.testing.assert_allclose(timing.compute, 5.)
+
+    # tasks ran over [10, 14], 6 seconds elapsed
+
+    np.testing.assert_allclose(timing.wait, 2.)
+
+    summary = timing_summary([timing, timing._replace(fit=1.)],
+                             wall_time=4.,
+                             n_workers=2,
+                             percentiles=(50, 100))
+    assert summary['n_candidates'] == 2
+    np.testing.assert_allclose(summary['totals']['fit'], 4.)
+    np.testing.assert_allclose(summary['percentiles']['fit'][100], 3.)
+    np.testing.assert_allclose(summary['parallel_efficiency'],
+                               (5. + 3.) / 8.)
+    assert summary['workers'] == {(1, 1): 2, (2, 1): 2}
+    assert set(summary['totals']) == set(PHASES) | set(['compute'])
+
+
+def test_timed_call():
+
+    def func(x):
+        with phase('fit'):
+            y = x + 1
+        return y
+
+    result, task = timed_call(func, 1)
+    assert result == 2
+    assert set(task.phases) == set(['fit'])
+    assert task.end >= task.start
+
+
+@pytest.mark.parametrize('kwargs', [{'n_jobs': 1},
+                                    {'n_jobs': 2},
+                                    {'n_jobs': 2, 'parallel_unit': 'fold'},
+                                    {'cv': None}])
+def test_selector_timings(kwargs):
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 5
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] + rng.standard_normal(n)
+
+    strategy = Stepwise.first_peak(X, max_features=p)
+    kwargs = dict(kwargs)
+    cv = kwargs.pop('cv', 3)
+    selector = FeatureSelector(LinearRegression(),
+                               strategy,
+                               cv=cv,
+                               **kwargs)
+    selector.fit(X, Y)
+
+    assert len(selector.timings_) == selector.n_evaluations_
+    for timing in selector.timings_:
+        assert timing.fit > 0 and timing.score > 0 and timing.build > 0
+        assert timing.wait >= 0 and len(timing.workers) >= 1
+
+    summary = selector.timing_summary()
+    assert summary['n_candidates'] == selector.n_evaluations_
+    assert 0 < summary['parallel_efficiency'] <= 1
+    assert sum(summary['workers'].values()) >= summary['n_candidates']
+
+
+def test_sfs_efs_timings():
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 4
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] + rng.standard_normal(n)
+
+    sfs = SequentialFeatureSelector(LinearRegression(),
+                                    k_features=3,
+                                    scoring='r2',
+                                    cv=3)
+    sfs.fit(X, Y)
+    assert len(sfs.timings_) == 4 + 3 + 2
+    assert [t.iteration for t in sfs.timings_] == [1] * 4 + [2] * 3 + [3] * 2
+    assert all([t.fit > 0 for t in sfs.timings_])
+
+    efs = ExhaustiveFeatureSelector(LinearRegression(),
+                                    max_features=p,
+                                    scoring='r2',
+                                    print_progress=False,
+                                    n_jobs=2,
+                                    cv=3)
+    efs.fit(X, Y)
+    assert len(efs.timings_) == len(efs.subsets_) == 2**p - 1
+    assert set([t.state for t in efs.timings_]) == set(
+        [s['feature_idx'] for s in efs.subsets_.values()])
+    summary = efs.timing_summary(percentiles=(50,))
+    assert summary['n_workers'] == 2
+    assert set(summary['percentiles']['build']) == set([50])
+
+    # results received out of order are matched
+    # to their dispatch times by subset
+
+    sfs.timings_ = []
+    work = [(((1, 2), None), TaskTiming((1, 1), 5., 6., {})),
+            (((0, 1), None), TaskTiming((1, 1), 1., 2., {}))]
+    list(sfs._record_timings(work, [(0, 1), (1, 2)], [0., 4.]))
+    waits = dict([(t.state, t.wait) for t in sfs.timings_])
+    assert waits[(0, 1)] > waits[(1, 2)] + 1
+
+
+class SlowRegression(LinearRegression):
+
+    def fit(self, X, y):
+        time.sleep(0.07)
+        return LinearRegression.fit(self, X, y)
+
+
+def test_sfs_efs_wait():
+
+    # results are received as each candidate completes,
+    # not once all have, so with no more candidates in
+    # flight than workers the total wait is bounded by
+    # the workers' time
+
+    rng = np.random.RandomState(0)
+    n, p = 60, 3
+    X = rng.standard_normal((n, p))
+    Y = X[:, 0] + rng.standard_normal(n)
+
+    sfs = SequentialFeatureSelector(SlowRegression(),
+                                    k_features=2,
+                                    scoring='r2',
+                                    n_jobs=2,
+                                    pre_dispatch='n_jobs',
+                                    cv=3)
+    efs = ExhaustiveFeatureSelector(SlowRegression(),
+                                    max_features=p,
+                                    scoring='r2',
+                                    print_progress=False,
+                                    n_jobs=2,
+                                    pre_dispatch='n_jobs',
+                                    cv=3)
+    for selector in [sfs, efs]:
+        selector.fit(X, Y)
+        summary = selector.timing_summary()
+        assert summary['totals']['wait'] <= selector.search_time_ * 2
@@ -0,0 +1,235 @@
+# mlxtend Machine Learning Library Extensions
+#
+# Timing of the phases of scoring feature selection candidates
+#
+# License: BSD 3 clause
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import NamedTuple, Any
+
+import numpy as np
+
+
+PHASES = ('build', 'fit', 'score', 'other', 'wait')
+
+
+class TaskTiming(NamedTuple):
+
+    """
+    Timing of a single task run by a worker: the id
+    `(pid, thread id)` of the worker, the start and end
+    times of the task (as `time.time()`) and the seconds
+    recorded in each phase by `phase`.
+    """
+
+    worker: tuple
+    start: float
+    end: float
+    phases: dict
+
+
+class CandidateTiming(NamedTuple):
+
+    """
+    Seconds spent scoring one candidate, summed over
+    its tasks (e.g. one per fold): building the submodel
+    ('build'), fitting the estimator ('fit'), scoring it
+    ('score'), other work within the tasks such as cloning
+    and indexing rows ('other'), and the time between
+    dispatch and completion during which none of its tasks
+    was running ('wait'), i.e. queueing and serialisation.
+    """
+
+    state: Any
+    iteration: int
+    workers: tuple
+    build: float
+    fit: float
+    score: float
+    other: float
+    wait: float
+
+    @property
+    def compute(self):
+        """
+        Seconds spent running the tasks of the candidate.
+        """
+        return self.build + self.fit + self.score + self.other
+
+
+def timed_call(func, *args, **kwargs):
+    """
+    Call `func(*args, **kwargs)` returning its result
+    and the `TaskTiming` of the call, including the
+    phases recorded with `phase` and `add_time`.
+    """
+    _current.phases = phases = {}
+    start = time.time()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        _current.phases = None
+    end = time.time()
+    worker = (os.getpid(), threading.get_ident())
+    return result, TaskTiming(worker, start, end, phases)
+
+
+@contextmanager
+def phase(name):
+    """
+    Record the time spent in the block as
+    phase `name` of the task run by `timed_call`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, time.perf_counter() - start)
+
+
+def add_time(name, seconds):
+    """
+    Add `seconds` to phase `name` of the task run by
+    `timed_call` (outside of `timed_call` this does nothing).
+    """
+    phases = getattr(_current, 'phases', None)
+    if phases is not None:
+        phases[name] = phases.get(name, 0) + seconds
+
+
+def stamped(items, times):
+    """
+    Yield `items`, appending to `times` the
+    time at which each is taken for dispatch.
+    """
+    for item in items:
+        times.append(time.time())
+        yield item
+
+
+def candidate_timing(state, iteration, tasks, dispatched, received):
+    """
+    Combine the `TaskTiming` of the tasks that scored `state`.
+
+    Parameters
+    ----------
+    state: object
+        The candidate.
+    iteration: int
+        Iteration (batch) in which it was scored.
+    tasks: list of TaskTiming
+        Timings of its tasks.
+    dispatched: float
+        Time its first task was dispatched.
+    received: float
+        Time its last result was received.
+
+    Returns
+    -------
+    timing: CandidateTiming
+
+    """
+
+    build, fit, score = [sum([task.phases.get(name, 0) for task in tasks])
+                         for name in ['build', 'fit', 'score']]
+    compute = sum([task.end - task.start for task in tasks])
+    other = max(compute - build - fit - score, 0)
+    busy = _union_length([(task.start, task.end) for task in tasks])
+    wait = max(received - dispatched - busy, 0)
+    workers = tuple(sorted(set([task.worker for task in tasks])))
+    return CandidateTiming(state,
+                           iteration,
+                           workers,
+                           build,
+                           fit,
+                           score,
+                           other,
+                           wait)
+
+
+def timing_summary(timings,
+                   wall_time,
+                   n_workers,
+                   percentiles=(50, 90, 99)):
+    """
+    Summarize the timings of the candidates of a search.
+
+    Parameters
+    ----------
+    timings: list of CandidateTiming
+        Timings of each candidate scored.
+    wall_time: float
+        Elapsed seconds of the search.
+    n_workers: int
+        Number of workers available to score candidates.
+    percentiles: sequence of float (default: (50, 90, 99))
+        Percentiles of the per-candidate times to report.
+
+    Returns
+    -------
+    summary: dict
+        With keys
+        'n_candidates' (number of candidates timed),
+        'wall_time' and 'n_workers' (as given),
+        'totals' (dictionary from each of `PHASES` and 'compute'
+        to the total seconds over all candidates),
+        'percentiles' (dictionary from each of `PHASES` and
+        'compute' to a dictionary from each percentile to seconds),
+        'workers' (dictionary from worker ids to the
+        number of candidates they ran tasks for) and
+        'parallel_efficiency' (total compute time divided by
+        `wall_time * n_workers`).
+
+    """
+
+    table = np.array([[getattr(t, name) for name in PHASES] + [t.compute]
+                      for t in timings], float).reshape((-1, len(PHASES) + 1))
+    names = list(PHASES) + ['compute']
+
+    totals = dict(zip(names, table.sum(0)))
+    if table.shape[0] > 0:
+        values = np.percentile(table, percentiles, axis=0).reshape(
+            (len(percentiles), -1))
+    else:
+        values = np.full((len(percentiles), len(names)), np.nan)
+    quantiles = dict([(name, dict(zip(percentiles, values[:, j])))
+                      for j, name in enumerate(names)])
+
+    workers = {}
+    for t in timings:
+        for worker in t.workers:
+            workers[worker] = workers.get(worker, 0) + 1
+
+    if wall_time > 0 and n_workers > 0:
+        efficiency = totals['compute'] / (wall_time * n_workers)
+    else:
+        efficiency = np.nan
+
+    return {'n_candidates': len(timings),
+            'wall_time': wall_time,
+            'n_workers': n_workers,
+            'totals': totals,
+            'percentiles': quantiles,
+            'workers': workers,
+            'parallel_efficiency': efficiency}
+
+
+# private functions
+
+_current = threading.local()
+
+
+def _union_length(intervals):
+    """
+    Total length of the union of `(start, end)` intervals.
+    """
+    total = 0
+    last_end = -np.inf
+    for start, end in sorted(intervals):
+        if end > last_end:
+            total += end - max(start, last_end)
+            last_end = end
+    return total